@@ -0,0 +1,289 @@
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import NamedTuple, Union
+import numpy as np
+from Mastermind.mastermind import FeedbackTable, Variant, MastermindError
+from Mastermind.solver import Solver, SOLVERS, KnuthSolver
+
+try:
+  import resource
+except ImportError: # Not on Windows, where peak memory isn't reported
+  resource = None
+
+TREE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "trees") # Next to the package, wherever it's run from
+TREE_VERSION = 1
+ROOT = 0
+NO_CHILD = -1 # Feedback that can't happen at a node, or that ends the game
+VARIANT_SPEC = re.compile(r"^(\d+)x(\d+)([ub]*)$") # e.g. 4x6, 4x10u for no repeats, 4x6b for blanks
+
+class BulkResult(NamedTuple):
+  """How a strategy does over every secret of a variant"""
+  variant: Variant
+  solver: str
+  secrets: int
+  total_guesses: int # Summed over every secret, counting the final, winning guess
+  worst: int # Most guesses any secret needed
+  nodes: int # Distinct positions in the decision tree, shared subtrees counted once
+  seconds: float
+  peak_bytes: int # Peak resident memory of the main process or any worker so far, 0 where it can't be measured
+
+  @property
+  def average(self) -> float:
+    return self.total_guesses / self.secrets
+
+  def __str__(self) -> str:
+    return (f"{self.solver} on {self.variant}: {self.average:.4f} guesses on average, {self.worst} at worst, "
+      f"{self.secrets:,} secrets, {self.nodes:,} nodes, {self.seconds:.2f}s, {self.peak_bytes / 2 ** 20:.1f} MiB peak")
+
+class DecisionTree:
+  """A whole strategy for one variant: the guess to make at each node, and the node each feedback leads to.
+
+  Stored as two flat arrays, so saving and loading is a single .npz file read with no
+  rebuilding. Nodes reached from identical candidate sets are shared, so it is really a DAG.
+  """
+  variant: Variant
+  solver: str
+  guesses: np.ndarray # int32 (nodes,), index of the code guessed at each node
+  children: np.ndarray # int32 (nodes, outcomes), next node for each encoded feedback, NO_CHILD if there is none
+
+  def __init__(self, variant: Variant, solver: str, guesses: np.ndarray, children: np.ndarray):
+    self.variant = variant
+    self.solver = solver
+    self.guesses = guesses
+    self.children = children
+
+  def __len__(self) -> int:
+    return len(self.guesses)
+
+  def save(self, path: str) -> None:
+    """Writes the tree to a .npz file
+
+    :param str path: File to write
+    """
+    directory = os.path.dirname(path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+      np.savez(f, version=np.array(TREE_VERSION), variant=np.array(self.variant, dtype=np.int64),
+        solver=np.array(self.solver), guesses=self.guesses, children=self.children)
+
+  @classmethod
+  def load(cls, path: str) -> "DecisionTree":
+    """Reads a tree written by save
+
+    :param str path: File to read
+    :raises MastermindError: If the file isn't a tree this version can read
+    :return DecisionTree: The tree
+    """
+    with np.load(path) as data:
+      if "version" not in data or int(data["version"]) != TREE_VERSION:
+        raise MastermindError(f"{path} is not a version {TREE_VERSION} decision tree.")
+      length, symbols, repeats, blanks = (int(value) for value in data["variant"])
+      return cls(Variant(length, symbols, bool(repeats), bool(blanks)), str(data["solver"]), data["guesses"], data["children"])
+
+def tree_path(variant: Variant, solver: str, directory: str=TREE_DIRECTORY) -> str:
+  """Returns the default file name of the tree for a variant and strategy
+
+  :param Variant variant: The rules
+  :param str solver: Name of the strategy
+  :param str directory: Folder the trees are kept in
+  :return str: Path of the tree
+  """
+  return os.path.join(directory, f"{solver}_{format_variant(variant)}.npz")
+
+def format_variant(variant: Variant) -> str:
+  return f"{variant.length}x{variant.symbols}{'' if variant.repeats else 'u'}{'b' if variant.blanks else ''}"
+
+def parse_variant(spec: str) -> Variant:
+  """Reads a variant written as positions x symbols, followed by u for no repeats and b for blanks, e.g. 4x10u
+
+  :param str spec: The written variant
+  :raises ValueError: If it isn't in that form or has no codes
+  :return Variant: The rules
+  """
+  match = VARIANT_SPEC.match(spec)
+  if match is None:
+    raise ValueError(f"Invalid variant: {spec}. Expected positions x symbols, e.g. 4x6, 4x10u or 4x6b")
+  variant = Variant(int(match.group(1)), int(match.group(2)), "u" not in match.group(3), "b" in match.group(3))
+  variant.validate()
+  return variant
+
+class _TreeBuilder:
+  """Grows a decision tree depth first, reusing the subtree of any candidate set seen before"""
+
+  def __init__(self, solver: Solver):
+    self.solver = solver
+    self.table = solver.table
+    self.guesses: list[int] = []
+    self.children: list[np.ndarray] = []
+    self._memo: dict[bytes, tuple[int, int, int]] = {} # candidate set -> (node, total guesses, worst)
+
+  def build(self, candidates: np.ndarray) -> tuple[int, int, int]:
+    """Adds the subtree that finds any of the candidates
+
+    :param np.ndarray candidates: Indices of the codes that could be the secret
+    :return tuple[int, int, int]: Node of the subtree, guesses summed over the candidates, and the most any needs
+    """
+    key = candidates.tobytes()
+    if key in self._memo:
+      return self._memo[key]
+    self.solver.candidates = candidates
+    guess = self.solver.next_guess()
+    node = len(self.guesses)
+    self.guesses.append(guess)
+    row = np.full(self.table.outcomes, NO_CHILD, dtype=np.int32)
+    self.children.append(row)
+    total, worst = len(candidates), 1
+    feedback = self.table.row(guess, candidates)
+    for value in np.unique(feedback):
+      if value == self.table.solved:
+        continue
+      child, child_total, child_worst = self.build(candidates[feedback == value])
+      row[value] = child
+      total += child_total
+      worst = max(worst, child_worst + 1)
+    self._memo[key] = (node, total, worst)
+    return self._memo[key]
+
+  def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+    return np.array(self.guesses, dtype=np.int32), np.array(self.children, dtype=np.int32).reshape(-1, self.table.outcomes)
+
+def _build_subtree(variant: Variant, solver_name: str, seed: Union[int, None],
+    candidates: np.ndarray) -> tuple[np.ndarray, np.ndarray, int, int]:
+  """Builds one subtree in a worker process
+
+  :return tuple: Guesses and children of the subtree's nodes (its root first), guesses summed over the
+    candidates, and the most any needs
+  """
+  builder = _TreeBuilder(SOLVERS[solver_name](FeedbackTable.get(variant), seed=seed))
+  _, total, worst = builder.build(candidates)
+  guesses, children = builder.arrays()
+  return guesses, children, total, worst
+
+def _peak_memory() -> int:
+  """Returns the peak resident memory of this process or any of its finished worker processes
+
+  :return int: Bytes, 0 where the platform can't report it
+  """
+  if resource is None:
+    return 0
+  scale = 1 if sys.platform == "darwin" else 1024 # ru_maxrss is in bytes on macOS, KiB elsewhere
+  return scale * max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+def solve_all(variant: Variant, solver_name: str=KnuthSolver.name, workers: int=1,
+    seed: Union[int, None]=0) -> tuple[DecisionTree, BulkResult]:
+  """Builds a strategy's decision tree over every secret of a variant.
+
+  The secrets are solved together: each node scores its guess against all of its candidates
+  in one vectorized row and splits them by feedback. With several workers, the subtrees below
+  the first guess are built in separate processes, largest first. Their candidates never overlap,
+  so there is nothing to share between workers and the tree is the one a single process builds,
+  except for strategies that sample guesses, whose random choices differ.
+
+  The time covers the build alone. The peak memory is the operating system's peak for the
+  processes, so it includes anything they held before the build.
+
+  :param Variant variant: The rules
+  :param str solver_name: Strategy, a key of SOLVERS
+  :param int workers: Processes to build subtrees in, 0 for one per CPU
+  :param Union[int, None] seed: Seed for sampling guesses in large variants
+  :return tuple[DecisionTree, BulkResult]: The tree and how it does
+  """
+  workers = workers if workers > 0 else os.cpu_count() or 1
+  start = perf_counter()
+  table = FeedbackTable.get(variant)
+  builder = _TreeBuilder(SOLVERS[solver_name](table, seed=seed))
+  everything = np.arange(len(table))
+  if workers == 1:
+    _, total, worst = builder.build(everything)
+    guesses, children = builder.arrays()
+  else:
+    guess = builder.solver.next_guess()
+    feedback = table.row(guess, everything)
+    values = sorted((value for value in np.unique(feedback) if value != table.solved),
+      key=lambda value: -np.count_nonzero(feedback == value))
+    guesses, children = [np.array([guess], dtype=np.int32)], [np.full((1, table.outcomes), NO_CHILD, dtype=np.int32)]
+    nodes, total, worst = 1, len(everything), 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+      subtrees = executor.map(_build_subtree, [variant] * len(values), [solver_name] * len(values),
+        [seed] * len(values), [everything[feedback == value] for value in values])
+      for value, (sub_guesses, sub_children, sub_total, sub_worst) in zip(values, subtrees):
+        children[0][0, value] = nodes
+        guesses.append(sub_guesses)
+        children.append(np.where(sub_children == NO_CHILD, NO_CHILD, sub_children + nodes))
+        nodes += len(sub_guesses)
+        total += sub_total
+        worst = max(worst, sub_worst + 1)
+    guesses, children = np.concatenate(guesses), np.concatenate(children)
+  seconds = perf_counter() - start
+  tree = DecisionTree(variant, solver_name, guesses, children)
+  return tree, BulkResult(variant, solver_name, len(table), total, worst, len(tree), seconds, _peak_memory())
+
+class TreeSolver(Solver):
+  """Plays from a saved decision tree, so every guess is a single lookup"""
+  name = "tree"
+
+  tree: DecisionTree
+  node: int # Where the game is in the tree
+
+  def __init__(self, tree: DecisionTree):
+    self.tree = tree
+    super().__init__(FeedbackTable.get(tree.variant))
+
+  def reset(self) -> None:
+    self.node = ROOT
+
+  def next_guess(self) -> int:
+    return int(self.tree.guesses[self.node])
+
+  def update(self, guess: int, feedback: int) -> None:
+    """Follows the feedback down the tree
+
+    :param int guess: Index of the guessed code, which must be the tree's guess
+    :param int feedback: Encoded feedback it got
+    :raises MastermindError: If the guess isn't the tree's or no code gives that feedback
+    """
+    if guess != self.tree.guesses[self.node]:
+      raise MastermindError(f"The tree can only follow its own guess, {self.table.code(self.tree.guesses[self.node])}.")
+    child = self.tree.children[self.node, feedback]
+    if child == NO_CHILD:
+      raise MastermindError("No code matches all of the feedback given.")
+    self.node = int(child)
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+  """Parses the command line arguments for the bulk solver
+
+  :param list[str] argv: Arguments, not including the script name
+  :return argparse.Namespace: The parsed arguments
+  """
+  parser = argparse.ArgumentParser(description="Solve every secret of Mastermind variants and save each strategy as a decision tree.")
+  parser.add_argument("variants", nargs="*", default=["4x6"],
+    help="Variants as positions x symbols, followed by u for no repeats and b for blanks, e.g. 4x6 4x10u 4x6b")
+  parser.add_argument("--solvers", nargs="+", choices=sorted(SOLVERS), default=[KnuthSolver.name], help="Strategies to compare")
+  parser.add_argument("--workers", type=int, default=1, help="Processes to build subtrees in, 0 for one per CPU")
+  parser.add_argument("--seed", type=int, default=0, help="Seed for sampling guesses in large variants")
+  parser.add_argument("--output-dir", default=TREE_DIRECTORY, help="Folder to save the decision trees in")
+  parser.add_argument("--no-save", action="store_true", help="Only report, don't save the trees")
+  return parser.parse_args(argv)
+
+def main(argv: Union[list[str], None]=None) -> None:
+  args = parse_args(sys.argv[1:] if argv is None else argv)
+  try:
+    variants = [parse_variant(spec) for spec in args.variants]
+  except (ValueError, MastermindError) as error:
+    raise SystemExit(str(error))
+  for variant in variants:
+    for solver_name in args.solvers:
+      tree, result = solve_all(variant, solver_name, args.workers, args.seed)
+      print(result)
+      if not args.no_save:
+        path = tree_path(variant, solver_name, args.output_dir)
+        tree.save(path)
+        print(f"  saved {path}")
+
+if __name__ == "__main__":
+  main()
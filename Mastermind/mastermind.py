@@ -0,0 +1,350 @@
+import os
+import random
+from typing import NamedTuple, Union
+import numpy as np
+
+LENGTH = 4 # Positions in a code
+MAX_LENGTH = 15 # Longest code whose encoded feedback, bulls * (length + 1) + cows, still fits in one byte
+SYMBOLS = 6 # Different symbols each position can hold, not counting the blank
+MAX_GUESSES = 10
+SYMBOL_CHARACTERS = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ" # How symbols are written, the first `symbols` are used
+BLANK_CHARACTER = "_" # How an empty position is written, in variants that allow them
+TABLE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables") # Next to the package, wherever it's run from
+MAX_TABLE_CODES = 6000 # Larger variants score guesses as needed instead of keeping a (codes x codes) table
+CHUNK_CELLS = 1 << 21 # Guess/secret pairs scored at once, to bound memory
+
+class MastermindError(ValueError):
+  """Invalid input to a game, such as a code of the wrong length or a guess after the game is over"""
+
+class Variant(NamedTuple):
+  """The rules that decide which codes exist"""
+  length: int = LENGTH # Positions in a code
+  symbols: int = SYMBOLS # Different symbols, written 1-9 then A-Z
+  repeats: bool = True # Whether a symbol may appear more than once in a code
+  blanks: bool = False # Whether a position may be left empty. A blank scores like one more symbol.
+
+  def __str__(self) -> str:
+    rules = [f"{self.length} positions", f"{self.symbols} symbols"]
+    if not self.repeats:
+      rules.append("no repeats")
+    if self.blanks:
+      rules.append("blanks")
+    return ", ".join(rules)
+
+  @property
+  def alphabet(self) -> int:
+    """Symbols a position can hold, including the blank
+    """
+    return self.symbols + self.blanks
+
+  @property
+  def characters(self) -> str:
+    """How each symbol is written, indexed by symbol
+    """
+    return SYMBOL_CHARACTERS[:self.symbols] + (BLANK_CHARACTER if self.blanks else "")
+
+  def validate(self) -> None:
+    """Checks the variant describes at least one code, and codes short enough to score
+
+    :raises MastermindError: If it doesn't
+    """
+    if not 1 <= self.length <= MAX_LENGTH:
+      raise MastermindError(f"Codes need between 1 and {MAX_LENGTH} positions.")
+    if not 1 < self.symbols <= len(SYMBOL_CHARACTERS):
+      raise MastermindError(f"The number of symbols must be between 2 and {len(SYMBOL_CHARACTERS)}.")
+    if not self.repeats and self.alphabet < self.length:
+      raise MastermindError("Without repeats, a code can't be longer than the number of symbols.")
+
+DEFAULT_VARIANT = Variant()
+
+class Feedback(NamedTuple):
+  """The result of a guess"""
+  bulls: int # Right symbol in the right position
+  cows: int # Right symbol in the wrong position
+
+  def __str__(self) -> str:
+    return f"{self.bulls} bulls, {self.cows} cows"
+
+def score(guess: str, secret: str) -> Feedback:
+  """Scores a guess against a secret the slow, obvious way
+
+  :param str guess: Guessed code
+  :param str secret: Secret code of the same length
+  :return Feedback: Bulls and cows
+  """
+  bulls = sum(g == s for g, s in zip(guess, secret))
+  matches = sum(min(guess.count(symbol), secret.count(symbol)) for symbol in set(guess))
+  return Feedback(bulls, matches - bulls)
+
+def all_codes(variant: Variant=DEFAULT_VARIANT) -> np.ndarray:
+  """Lists every code of a variant in lexicographic order
+
+  :param Variant variant: The rules
+  :return np.ndarray: uint8 array of shape (codes, length), one code per row
+  """
+  digits = np.indices((variant.alphabet,) * variant.length, dtype=np.uint8)
+  codes = digits.reshape(variant.length, -1).T
+  if not variant.repeats:
+    ordered = np.sort(codes, axis=1)
+    codes = codes[(ordered[:, 1:] != ordered[:, :-1]).all(axis=1)]
+  return np.ascontiguousarray(codes)
+
+def opening_guesses(variant: Variant=DEFAULT_VARIANT) -> np.ndarray:
+  """Lists one code for each essentially different first guess.
+
+  Before any feedback, renaming symbols or reordering positions can't make a guess better
+  or worse, so only how often each symbol repeats matters: 1122 is as good as 3553.
+
+  :param Variant variant: The rules
+  :return np.ndarray: uint8 array (guesses, length), in lexicographic order
+  """
+  codes = all_codes(variant)
+  # Symbols in order of first use and never decreasing, e.g. 0011 but not 0101 or 1100
+  ascending = (codes[:, 1:] >= codes[:, :-1]).all(axis=1) & (codes[:, 0] == 0)
+  steps = np.diff(codes.astype(np.int16), axis=1)
+  contiguous = (steps <= 1).all(axis=1)
+  counts = np.stack([(codes == symbol).sum(axis=1) for symbol in range(variant.alphabet)], axis=1)
+  # Longer runs first, so each multiset of repeat counts appears once
+  runs_descending = (np.diff(counts, axis=1) <= 0).all(axis=1)
+  return codes[ascending & contiguous & runs_descending]
+
+def _symbol_counts(codes: np.ndarray, alphabet: int) -> np.ndarray:
+  return np.stack([(codes == symbol).sum(axis=1, dtype=np.uint8) for symbol in range(alphabet)], axis=1)
+
+def _feedback_matrix(guesses: np.ndarray, secrets: np.ndarray, guess_counts: np.ndarray,
+    secret_counts: np.ndarray) -> np.ndarray:
+  """Scores every guess against every secret, encoded as bulls * (length + 1) + cows
+
+  :param np.ndarray guesses: uint8 array (guesses, length)
+  :param np.ndarray secrets: uint8 array (secrets, length)
+  :param np.ndarray guess_counts: uint8 array (guesses, alphabet), how often each symbol appears in each guess
+  :param np.ndarray secret_counts: uint8 array (secrets, alphabet), the same for the secrets
+  :return np.ndarray: uint8 array (guesses, secrets)
+  """
+  length = guesses.shape[1]
+  bulls = np.zeros((len(guesses), len(secrets)), dtype=np.uint8)
+  for position in range(length): # one position or symbol at a time keeps the temporaries to (guesses, secrets)
+    bulls += guesses[:, position, None] == secrets[None, :, position]
+  matches = np.zeros_like(bulls)
+  for symbol in range(guess_counts.shape[1]):
+    matches += np.minimum(guess_counts[:, symbol, None], secret_counts[None, :, symbol])
+  return bulls * (length + 1) + (matches - bulls)
+
+class FeedbackTable:
+  """Every code of a variant and the feedback between any two of them.
+
+  Feedback is one byte, bulls * (length + 1) + cows, so whole rows can be compared or
+  counted with NumPy. For variants of up to MAX_TABLE_CODES codes the feedback of every
+  pair is precomputed as a uint8 matrix, saved to a .npy file the first time it is built
+  and memory-mapped from there afterwards. Larger variants (6 positions and 10 symbols is
+  a million codes) score just the pairs asked for.
+  """
+  _cache: dict[Variant, "FeedbackTable"] = {}
+
+  variant: Variant
+  codes: np.ndarray # uint8 (codes, length), row i is the code with index i
+  table: Union[np.ndarray, None] # uint8 (codes, codes), table[guess, secret] is the encoded feedback, None for large variants
+
+  def __init__(self, variant: Variant=DEFAULT_VARIANT, directory: Union[str, None]=TABLE_DIRECTORY,
+      max_table_codes: int=MAX_TABLE_CODES):
+    """Lists the codes of a variant and loads, builds or skips its full feedback table
+
+    :param Variant variant: The rules
+    :param Union[str, None] directory: Where the table is cached on disk, None to always build it in memory
+    :param int max_table_codes: Largest variant that gets a full table
+    :raises MastermindError: If the variant has no codes
+    """
+    variant.validate()
+    self.variant = variant
+    self.codes = all_codes(variant)
+    self._counts = _symbol_counts(self.codes, variant.alphabet)
+    self._values = self.codes @ (variant.alphabet ** np.arange(variant.length - 1, -1, -1, dtype=np.int64))
+    self.table = None
+    if len(self.codes) <= max_table_codes:
+      name = f"feedback_{variant.length}x{variant.alphabet}{'' if variant.repeats else 'u'}.npy"
+      path = None if directory is None else os.path.join(directory, name)
+      self.table = self._load(path) if path is not None and os.path.exists(path) else None
+      if self.table is None:
+        self.table = self._build()
+        if path is not None:
+          os.makedirs(directory, exist_ok=True)
+          np.save(path, self.table)
+
+  @classmethod
+  def get(cls, variant: Variant=DEFAULT_VARIANT) -> "FeedbackTable":
+    """Returns the table for a variant, building or loading it only once per process
+
+    :param Variant variant: The rules
+    :return FeedbackTable: The shared table
+    """
+    table = cls._cache.get(variant)
+    if table is None:
+      table = cls._cache[variant] = cls(variant)
+    return table
+
+  def _load(self, path: str) -> Union[np.ndarray, None]:
+    try:
+      table = np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+      return None
+    count = len(self.codes)
+    if table.shape != (count, count) or table.dtype != np.uint8:
+      return None # left over from a different layout, so build it again
+    return table
+
+  def _build(self) -> np.ndarray:
+    everything = np.arange(len(self.codes))
+    table = np.empty((len(self.codes), len(self.codes)), dtype=np.uint8)
+    step = max(1, CHUNK_CELLS // len(self.codes))
+    for start in range(0, len(self.codes), step):
+      table[start:start + step] = self._compute(everything[start:start + step], everything)
+    return table
+
+  def _compute(self, guesses: np.ndarray, secrets: np.ndarray) -> np.ndarray:
+    return _feedback_matrix(self.codes[guesses], self.codes[secrets], self._counts[guesses], self._counts[secrets])
+
+  def __len__(self) -> int:
+    return len(self.codes)
+
+  @property
+  def length(self) -> int:
+    return self.variant.length
+
+  @property
+  def outcomes(self) -> int:
+    """Number of distinct encoded feedback values, for sizing counts of them
+    """
+    return (self.length + 1) ** 2
+
+  @property
+  def solved(self) -> int:
+    """Encoded feedback of a guess that matches the secret
+    """
+    return self.encode(Feedback(self.length, 0))
+
+  def encode(self, feedback: Feedback) -> int:
+    return feedback.bulls * (self.length + 1) + feedback.cows
+
+  def decode(self, value: int) -> Feedback:
+    return Feedback(*divmod(int(value), self.length + 1))
+
+  def scores(self, guesses: np.ndarray, secrets: np.ndarray) -> np.ndarray:
+    """Encoded feedback of every guess against every secret
+
+    :param np.ndarray guesses: Indices of the guessed codes
+    :param np.ndarray secrets: Indices of the secret codes
+    :return np.ndarray: uint8 array (guesses, secrets)
+    """
+    if self.table is not None:
+      return self.table[np.ix_(guesses, secrets)]
+    return self._compute(guesses, secrets)
+
+  def row(self, guess: int, secrets: np.ndarray) -> np.ndarray:
+    """Encoded feedback of one guess against many secrets
+
+    :param int guess: Index of the guessed code
+    :param np.ndarray secrets: Indices of the secret codes
+    :return np.ndarray: uint8 array (secrets,)
+    """
+    if self.table is not None:
+      return self.table[guess, secrets]
+    result = np.empty(len(secrets), dtype=np.uint8)
+    step = max(1, CHUNK_CELLS // self.variant.alphabet)
+    for start in range(0, len(secrets), step):
+      result[start:start + step] = self._compute(np.array([guess]), secrets[start:start + step])[0]
+    return result
+
+  def index(self, code: str) -> int:
+    """Returns the index of a written code, e.g. "1122"
+
+    :param str code: One symbol character per position
+    :raises MastermindError: If the code has the wrong length, an unknown symbol or breaks the variant's rules
+    :return int: Row of the code in codes and table
+    """
+    if len(code) != self.length:
+      raise MastermindError(f"Codes have {self.length} positions: {code}")
+    characters = self.variant.characters
+    value = 0
+    for character in code.upper():
+      digit = characters.find(character)
+      if digit < 0:
+        raise MastermindError(f"Invalid symbol {character}. Must be one of {characters}")
+      value = value * self.variant.alphabet + digit
+    index = int(np.searchsorted(self._values, value))
+    if index == len(self._values) or self._values[index] != value:
+      raise MastermindError(f"Symbols can't repeat: {code}")
+    return index
+
+  def indices(self, codes: np.ndarray) -> np.ndarray:
+    """Returns the indices of many codes at once
+
+    :param np.ndarray codes: Array (codes, length) of valid codes, as symbol numbers
+    :return np.ndarray: Row of each code
+    """
+    values = codes.astype(np.int64) @ (self.variant.alphabet ** np.arange(self.length - 1, -1, -1, dtype=np.int64))
+    return np.searchsorted(self._values, values)
+
+  def code(self, index: int) -> str:
+    """Writes out the code with an index
+
+    :param int index: Row of the code
+    :return str: One symbol character per position
+    """
+    characters = self.variant.characters
+    return "".join(characters[digit] for digit in self.codes[index])
+
+  def feedback(self, guess: int, secret: int) -> Feedback:
+    """Looks up the feedback of a guess
+
+    :param int guess: Index of the guessed code
+    :param int secret: Index of the secret code
+    :return Feedback: Bulls and cows
+    """
+    return self.decode(self.row(guess, np.array([secret]))[0])
+
+class Mastermind:
+  """One game: a hidden code and the guesses made against it"""
+  table: FeedbackTable
+  max_guesses: int
+  guesses: list[tuple[str, Feedback]] # Every guess so far with its feedback
+
+  def __init__(self, secret: Union[str, None]=None, variant: Variant=DEFAULT_VARIANT,
+      max_guesses: int=MAX_GUESSES, seed: Union[int, None]=None):
+    """Starts a game with no guesses made
+
+    :param Union[str, None] secret: The code to break, None for a random one
+    :param Variant variant: The rules
+    :param int max_guesses: Guesses allowed before the game is lost
+    :param Union[int, None] seed: Seed for the random secret
+    """
+    self.table = FeedbackTable.get(variant)
+    self.max_guesses = max_guesses
+    self.guesses = []
+    self._secret = random.Random(seed).randrange(len(self.table)) if secret is None else self.table.index(secret)
+
+  @property
+  def solved(self) -> bool:
+    return bool(self.guesses) and self.guesses[-1][1].bulls == self.table.length
+
+  @property
+  def over(self) -> bool:
+    return self.solved or len(self.guesses) >= self.max_guesses
+
+  @property
+  def secret(self) -> Union[str, None]:
+    """The secret code, only revealed once the game is over
+    """
+    return self.table.code(self._secret) if self.over else None
+
+  def guess(self, code: str) -> Feedback:
+    """Scores a guess against the secret
+
+    :param str code: The guessed code, e.g. "1122"
+    :raises MastermindError: If the game is over or the code is invalid
+    :return Feedback: Bulls and cows
+    """
+    if self.over:
+      raise MastermindError("The game is over.")
+    feedback = self.table.feedback(self.table.index(code), self._secret)
+    self.guesses.append((code.upper(), feedback))
+    return feedback
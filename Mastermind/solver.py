@@ -0,0 +1,223 @@
+import argparse
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import NamedTuple, Union
+import numpy as np
+from Mastermind.mastermind import FeedbackTable, Variant, MastermindError, opening_guesses, LENGTH, SYMBOLS
+
+CHUNK_CELLS = 1 << 21 # Guess/candidate pairs counted at once while scoring guesses
+FULL_POOL_CELLS = 1 << 25 # Every code is considered as a guess while codes x candidates stays under this
+MAX_POOL = 500 # Otherwise guesses are drawn from at most this many candidates
+PARALLEL_CELLS = 1 << 24 # Scoring is split across worker processes past this many guess/candidate pairs
+
+class SolveResult(NamedTuple):
+  """A finished game played by a solver"""
+  guesses: list[str] # Every guess, the last one is the secret
+  seconds: float
+
+  def __str__(self) -> str:
+    return f"{' '.join(self.guesses)} ({len(self.guesses)} guesses, {self.seconds * 1000:.1f} ms)"
+
+def partition_counts(table: FeedbackTable, guesses: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+  """Counts how a guess would split the candidates by feedback, for many guesses at once
+
+  :param FeedbackTable table: Codes of the variant
+  :param np.ndarray guesses: Indices of the guesses to score
+  :param np.ndarray candidates: Indices of the codes that could still be the secret
+  :return np.ndarray: int array (guesses, table.outcomes), the candidates giving each feedback
+  """
+  outcomes = table.outcomes
+  counts = np.empty((len(guesses), outcomes), dtype=np.int64)
+  step = max(1, CHUNK_CELLS // max(1, len(candidates)))
+  for start in range(0, len(guesses), step):
+    chunk = guesses[start:start + step]
+    feedback = table.scores(chunk, candidates).astype(np.int64)
+    # Give each guess its own run of bins so one bincount counts every row
+    feedback += (np.arange(len(chunk)) * outcomes)[:, None]
+    counts[start:start + len(chunk)] = np.bincount(feedback.ravel(), minlength=len(chunk) * outcomes).reshape(-1, outcomes)
+  return counts
+
+def _partition_counts_in_worker(variant: Variant, guesses: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+  return partition_counts(FeedbackTable.get(variant), guesses, candidates)
+
+class Solver:
+  """Base for strategies that pick each guess by how it splits the remaining candidates.
+
+  Candidates are kept as an index array into the variant's codes and pruned with one
+  vectorized comparison per guess. Subclasses only say how to rate a split with _rate; the
+  default rates a guess by its largest group, which is Knuth's minimax rule.
+
+  Guesses are drawn from every code while that stays cheap, from the candidates when there
+  are too many codes, and from a sample of MAX_POOL candidates when even that is too many.
+  The first guess only depends on the variant, so it is chosen among opening_guesses and remembered.
+  """
+  name = ""
+  _openings: dict[tuple[str, Variant], int] = {}
+
+  table: FeedbackTable
+  candidates: np.ndarray # Indices of the codes consistent with every feedback so far
+  workers: int
+
+  def __init__(self, table: Union[FeedbackTable, None]=None, workers: int=1, seed: Union[int, None]=None):
+    """Creates a solver ready for a game with every code still possible
+
+    :param Union[FeedbackTable, None] table: Codes of the variant to play, the standard game if None
+    :param int workers: Processes to score guesses with when there are many candidates, 0 for one per CPU
+    :param Union[int, None] seed: Seed for sampling guesses in large variants
+    """
+    self.table = FeedbackTable.get() if table is None else table
+    self.workers = workers if workers > 0 else os.cpu_count() or 1
+    self._random = random.Random(seed)
+    self._executor: Union[ProcessPoolExecutor, None] = None
+    self.reset()
+
+  def seed(self, seed: Union[int, None]) -> None:
+    self._random.seed(seed)
+
+  def reset(self) -> None:
+    """Forgets every guess, ready for a new game
+    """
+    self.candidates = np.arange(len(self.table))
+
+  def _rate(self, counts: np.ndarray) -> np.ndarray:
+    """Rates guesses by how they split the candidates, lower is better
+
+    :param np.ndarray counts: int array (guesses, outcomes) from partition_counts
+    :return np.ndarray: One rating per guess, here the most candidates any feedback could leave
+    """
+    return counts.max(axis=1)
+
+  def _guess_pool(self) -> np.ndarray:
+    if len(self.candidates) == len(self.table):
+      return self.table.indices(opening_guesses(self.table.variant))
+    if len(self.table) * len(self.candidates) <= FULL_POOL_CELLS:
+      return np.arange(len(self.table))
+    if len(self.candidates) <= MAX_POOL:
+      return self.candidates
+    return self.candidates[np.array(sorted(self._random.sample(range(len(self.candidates)), MAX_POOL)))]
+
+  def _partition(self, guesses: np.ndarray) -> np.ndarray:
+    if self.workers == 1 or len(guesses) * len(self.candidates) < PARALLEL_CELLS:
+      return partition_counts(self.table, guesses, self.candidates)
+    if self._executor is None:
+      self._executor = ProcessPoolExecutor(max_workers=self.workers)
+    chunks = np.array_split(guesses, self.workers)
+    results = self._executor.map(_partition_counts_in_worker, [self.table.variant] * len(chunks), chunks,
+      [self.candidates] * len(chunks))
+    return np.concatenate(list(results))
+
+  def next_guess(self) -> int:
+    """Picks the next guess. Among equally rated guesses, one that could be the secret wins, then the lowest code.
+
+    :return int: Index of the code to guess
+    """
+    if len(self.candidates) <= 2:
+      return int(self.candidates[0])
+    opening = len(self.candidates) == len(self.table)
+    key = (self.name, self.table.variant)
+    if opening and key in self._openings:
+      return self._openings[key]
+    guesses = self._guess_pool()
+    ratings = self._rate(self._partition(guesses))
+    best = guesses[np.flatnonzero(ratings == ratings.min())]
+    preferred = best[np.isin(best, self.candidates)]
+    guess = int(preferred[0] if len(preferred) else best[0])
+    if opening:
+      self._openings[key] = guess
+    return guess
+
+  def update(self, guess: int, feedback: int) -> None:
+    """Keeps only the candidates that would have given the same feedback
+
+    :param int guess: Index of the guessed code
+    :param int feedback: Encoded feedback it got, see FeedbackTable.encode
+    :raises MastermindError: If no code is consistent with every feedback given
+    """
+    self.candidates = self.candidates[self.table.row(guess, self.candidates) == feedback]
+    if len(self.candidates) == 0:
+      raise MastermindError("No code matches all of the feedback given.")
+
+  def solve(self, secret: str) -> SolveResult:
+    """Plays a whole game against a known secret
+
+    :param str secret: The code to find
+    :return SolveResult: The guesses made
+    """
+    start = perf_counter()
+    secret_index = self.table.index(secret)
+    self.reset()
+    guesses = []
+    while True:
+      guess = self.next_guess()
+      guesses.append(self.table.code(guess))
+      feedback = self.table.row(guess, np.array([secret_index]))[0]
+      if feedback == self.table.solved:
+        return SolveResult(guesses, perf_counter() - start)
+      self.update(guess, feedback)
+
+  def close(self) -> None:
+    if self._executor is not None:
+      self._executor.shutdown()
+      self._executor = None
+
+class KnuthSolver(Solver):
+  """Knuth's minimax strategy: every guess is the code whose largest group of remaining
+  candidates, split by the feedback it could get, is smallest.
+
+  On the standard game (4 positions, 6 symbols) it opens with 1122 and never needs more than five guesses.
+  """
+  name = "knuth" # Rates guesses with the default, minimax _rate
+
+class EntropySolver(Solver):
+  """Picks the guess whose feedback tells the most on average: the one maximizing the
+  entropy of the split, -sum(p * log2(p)) over the feedback groups.
+  """
+  name = "entropy"
+
+  def _rate(self, counts: np.ndarray) -> np.ndarray:
+    # With a fixed total, maximizing entropy is minimizing sum(n * log2(n))
+    nonzero = np.maximum(counts, 1)
+    return np.round((counts * np.log2(nonzero)).sum(axis=1), 9)
+
+SOLVERS = {
+  KnuthSolver.name: KnuthSolver,
+  EntropySolver.name: EntropySolver,
+}
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+  """Parses the command line arguments for the solver
+
+  :param list[str] argv: Arguments, not including the script name
+  :return argparse.Namespace: The parsed arguments
+  """
+  parser = argparse.ArgumentParser(description="Break Mastermind codes with a guessing strategy.")
+  parser.add_argument("secrets", nargs="+", help="Codes to break, e.g. 3456")
+  parser.add_argument("--solver", choices=sorted(SOLVERS), default=KnuthSolver.name, help="Guessing strategy")
+  parser.add_argument("--length", type=int, default=LENGTH, help="Positions in a code")
+  parser.add_argument("--symbols", type=int, default=SYMBOLS, help="Different symbols")
+  parser.add_argument("--no-repeats", action="store_true", help="Don't allow a symbol twice in one code")
+  parser.add_argument("--blanks", action="store_true", help="Allow empty positions, written _")
+  parser.add_argument("--workers", type=int, default=1, help="Processes to score guesses with, 0 for one per CPU")
+  parser.add_argument("--seed", type=int, default=None, help="Seed for sampling guesses in large variants")
+  return parser.parse_args(argv)
+
+def main(argv: Union[list[str], None]=None) -> None:
+  args = parse_args(sys.argv[1:] if argv is None else argv)
+  try:
+    variant = Variant(args.length, args.symbols, not args.no_repeats, args.blanks)
+    solver = SOLVERS[args.solver](FeedbackTable.get(variant), args.workers, args.seed)
+  except MastermindError as error:
+    raise SystemExit(str(error))
+  try:
+    for secret in args.secrets:
+      print(f"{secret}: {solver.solve(secret)}")
+  except MastermindError as error:
+    raise SystemExit(str(error))
+  finally:
+    solver.close()
+
+if __name__ == "__main__":
+  main()
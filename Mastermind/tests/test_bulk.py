@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from Mastermind.mastermind import Variant, FeedbackTable, MastermindError
+from Mastermind.bulk import DecisionTree, TreeSolver, solve_all, parse_variant, format_variant, tree_path, main
+
+def test_knuth_over_every_secret():
+  tree, result = solve_all(Variant(), "knuth")
+  assert result.secrets == 1296
+  assert result.total_guesses == 5801 # Knuth's published total
+  assert result.worst == 5
+  assert result.nodes == len(tree)
+  assert result.peak_bytes > 0
+  assert "4.4761" in str(result)
+
+def test_tree_plays_every_secret(tmp_path):
+  variant = Variant(3, 4, blanks=True)
+  tree, result = solve_all(variant, "entropy")
+  path = str(tmp_path / "tree.npz")
+  tree.save(path)
+  loaded = DecisionTree.load(path)
+  assert loaded.variant == variant
+  assert loaded.solver == "entropy"
+  assert np.array_equal(loaded.children, tree.children)
+  solver = TreeSolver(loaded)
+  table = FeedbackTable.get(variant)
+  lengths = [len(solver.solve(table.code(index)).guesses) for index in range(len(table))]
+  assert sum(lengths) == result.total_guesses
+  assert max(lengths) == result.worst
+
+def test_parallel_build_matches(tmp_path):
+  variant = Variant(3, 5)
+  _, sequential = solve_all(variant, "knuth")
+  tree, parallel = solve_all(variant, "knuth", workers=2)
+  assert (parallel.total_guesses, parallel.worst, parallel.nodes) == (sequential.total_guesses, sequential.worst, sequential.nodes)
+  solver = TreeSolver(tree)
+  table = FeedbackTable.get(variant)
+  assert sum(len(solver.solve(table.code(index)).guesses) for index in range(len(table))) == parallel.total_guesses
+
+def test_tree_solver_rejects_other_guesses():
+  tree, _ = solve_all(Variant(3, 4), "knuth")
+  solver = TreeSolver(tree)
+  with pytest.raises(MastermindError):
+    solver.update(int(tree.guesses[0]) + 1, 0)
+
+def test_load_rejects_other_files(tmp_path):
+  path = str(tmp_path / "other.npz")
+  np.savez(path, guesses=np.zeros(1))
+  with pytest.raises(MastermindError):
+    DecisionTree.load(path)
+
+def test_parse_variant():
+  assert parse_variant("4x6") == Variant(4, 6)
+  assert parse_variant("4x10u") == Variant(4, 10, repeats=False)
+  assert parse_variant("5x8ub") == Variant(5, 8, False, True)
+  assert format_variant(Variant(5, 8, False, True)) == "5x8ub"
+  assert tree_path(Variant(), "knuth", "trees").endswith("knuth_4x6.npz")
+  for spec in ["4", "4x", "x6", "4x6z", "5x3u"]:
+    with pytest.raises(ValueError):
+      parse_variant(spec)
+
+def test_main(tmp_path, capsys):
+  main(["3x4", "--solvers", "knuth", "entropy", "--output-dir", str(tmp_path)])
+  output = capsys.readouterr().out
+  assert "knuth on 3 positions, 4 symbols" in output
+  assert (tmp_path / "entropy_3x4.npz").exists()
@@ -0,0 +1,99 @@
+import itertools
+import numpy as np
+import pytest
+from Mastermind.mastermind import Mastermind, MastermindError, Feedback, FeedbackTable, Variant, MAX_LENGTH, score, all_codes, opening_guesses
+
+def test_score():
+  assert score('1234', '1234') == Feedback(4, 0)
+  assert score('1234', '4321') == Feedback(0, 4)
+  assert score('1122', '1213') == Feedback(1, 2)
+  assert score('1111', '2345') == Feedback(0, 0)
+  assert str(Feedback(1, 2)) == "1 bulls, 2 cows"
+
+def test_all_codes_are_in_order():
+  codes = all_codes(Variant(3, 4))
+  assert codes.shape == (64, 3)
+  assert codes[0].tolist() == [0, 0, 0]
+  assert codes[1].tolist() == [0, 0, 1]
+  assert codes[-1].tolist() == [3, 3, 3]
+
+def test_table_matches_score(tmp_path):
+  table = FeedbackTable(Variant(3, 4), directory=str(tmp_path))
+  for guess, secret in itertools.product(itertools.product('1234', repeat=3), repeat=2):
+    guess, secret = ''.join(guess), ''.join(secret)
+    assert table.feedback(table.index(guess), table.index(secret)) == score(guess, secret)
+
+def test_table_is_cached_on_disk(tmp_path):
+  built = FeedbackTable(Variant(3, 5), directory=str(tmp_path))
+  assert (tmp_path / "feedback_3x5.npy").exists()
+  loaded = FeedbackTable(Variant(3, 5), directory=str(tmp_path))
+  assert isinstance(loaded.table, np.memmap)
+  assert np.array_equal(built.table, loaded.table)
+
+def test_codes_and_indices():
+  table = FeedbackTable.get()
+  assert len(table) == 6 ** 4
+  assert table.index('1111') == 0
+  assert table.code(table.index('3456')) == '3456'
+  assert table.decode(table.encode(Feedback(2, 1))) == Feedback(2, 1)
+  assert table.decode(table.solved) == Feedback(4, 0)
+  for code in ['123', '12345', '1237']:
+    with pytest.raises(MastermindError):
+      table.index(code)
+
+def test_game():
+  game = Mastermind('1234', max_guesses=3)
+  assert game.secret is None
+  assert game.guess('4321') == Feedback(0, 4)
+  assert not game.over
+  assert game.guess('1234') == Feedback(4, 0)
+  assert game.solved and game.over
+  assert game.secret == '1234'
+  with pytest.raises(MastermindError):
+    game.guess('1234')
+
+def test_game_runs_out_of_guesses():
+  game = Mastermind('1234', max_guesses=1)
+  game.guess('1111')
+  assert game.over and not game.solved
+  assert game.secret == '1234'
+
+@pytest.mark.parametrize("variant", [Variant(3, 4, repeats=False), Variant(3, 3, blanks=True), Variant(2, 5, False, True)])
+def test_variant_tables_match_score(variant):
+  table = FeedbackTable(variant, directory=None)
+  written = [table.code(index) for index in range(len(table))]
+  assert len(set(written)) == len(written)
+  if not variant.repeats:
+    assert all(len(set(code)) == len(code) for code in written)
+  for guess in written[::3]:
+    for secret in written[::2]:
+      assert table.feedback(table.index(guess), table.index(secret)) == score(guess, secret)
+
+def test_variant_codes():
+  assert len(all_codes(Variant(4, 10, repeats=False))) == 5040
+  assert len(all_codes(Variant(4, 6, blanks=True))) == 7 ** 4
+  table = FeedbackTable(Variant(4, 6, repeats=False, blanks=True), directory=None)
+  assert table.code(table.index('12_4')) == '12_4'
+  with pytest.raises(MastermindError):
+    table.index('1124')
+  with pytest.raises(MastermindError):
+    Variant(5, 3, repeats=False).validate()
+  Variant(MAX_LENGTH, 2).validate()
+  for length in (0, MAX_LENGTH + 1):
+    with pytest.raises(MastermindError):
+      Variant(length, 2).validate()
+  assert str(Variant(4, 6, False, True)) == "4 positions, 6 symbols, no repeats, blanks"
+
+def test_large_variants_score_on_demand():
+  table = FeedbackTable(Variant(6, 10), directory=None)
+  assert len(table) == 10 ** 6
+  assert table.table is None
+  guess, secret = table.index('112345'), table.index('A51123')
+  assert table.feedback(guess, secret) == score('112345', 'A51123')
+  row = table.row(guess, np.arange(0, len(table), 997))
+  assert row[0] == table.encode(score('112345', '111111'))
+
+def test_opening_guesses():
+  assert opening_guesses(Variant()).tolist() == [[0, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 1], [0, 0, 1, 2], [0, 1, 2, 3]]
+  assert len(opening_guesses(Variant(4, 10, repeats=False))) == 1
+  assert len(opening_guesses(Variant(6, 10))) == 11 # the partitions of 6
@@ -0,0 +1,67 @@
+import random
+import numpy as np
+import pytest
+from Mastermind import solver as solver_module
+from Mastermind.mastermind import FeedbackTable, MastermindError, Feedback, Variant
+from Mastermind.solver import KnuthSolver, EntropySolver, Solver, partition_counts, main
+
+def test_opening_is_1122():
+  solver = KnuthSolver()
+  assert solver.table.code(solver.next_guess()) == '1122'
+
+def test_base_solver_rates_by_worst_case():
+  solver = Solver()
+  assert solver.table.code(solver.next_guess()) == '1122'
+  assert solver.solve('3456').guesses == KnuthSolver().solve('3456').guesses
+
+def test_partition_counts():
+  table = FeedbackTable.get()
+  candidates = np.arange(len(table))
+  counts = partition_counts(table, np.array([table.index('1122')]), candidates)
+  assert counts.sum() == len(table)
+  assert counts.max() == 256 # Knuth's worst case for the opening guess
+
+def test_solves_within_five_guesses():
+  solver = KnuthSolver()
+  codes = [solver.table.code(index) for index in range(len(solver.table))]
+  for secret in random.Random(0).sample(codes, 100) + ['1111', '6666', '3456']:
+    result = solver.solve(secret)
+    assert result.guesses[-1] == secret
+    assert len(result.guesses) <= 5
+
+def test_update_prunes_candidates():
+  solver = KnuthSolver()
+  table = solver.table
+  solver.update(table.index('1122'), table.encode(Feedback(0, 0)))
+  assert all('1' not in table.code(i) and '2' not in table.code(i) for i in solver.candidates)
+  assert len(solver.candidates) == 4 ** 4
+  with pytest.raises(MastermindError):
+    solver.update(table.index('1122'), table.encode(Feedback(4, 0)))
+
+def test_main(capsys):
+  main(['3456'])
+  assert capsys.readouterr().out.startswith('3456: 1122')
+
+@pytest.mark.parametrize("variant,limit", [(Variant(4, 6), 6), (Variant(4, 10, repeats=False), 7), (Variant(3, 5, blanks=True), 6)])
+@pytest.mark.parametrize("solver_class", [KnuthSolver, EntropySolver])
+def test_solvers_on_variants(solver_class, variant, limit):
+  table = FeedbackTable(variant, directory=None)
+  solver = solver_class(table, seed=0)
+  for index in random.Random(1).sample(range(len(table)), 20):
+    result = solver.solve(table.code(index))
+    assert result.guesses[-1] == table.code(index)
+    assert len(result.guesses) <= limit
+
+def test_entropy_opening():
+  assert EntropySolver().table.code(EntropySolver().next_guess()) == '1234'
+
+def test_parallel_scoring_matches(monkeypatch):
+  monkeypatch.setattr(solver_module, "PARALLEL_CELLS", 1)
+  table = FeedbackTable.get()
+  solver = EntropySolver(table, workers=2)
+  try:
+    solver.update(table.index('1123'), table.encode(Feedback(1, 1)))
+    guesses = np.arange(len(table))
+    assert np.array_equal(solver._partition(guesses), partition_counts(table, guesses, solver.candidates))
+  finally:
+    solver.close()
@@ -0,0 +1,426 @@
+import random
+from time import perf_counter
+from typing import NamedTuple, Union
+from Othello.othello import MoveDelta, Othello
+from Othello.endgame import EndgameSolver
+from Othello.mcts import MCTSPlayer
+from Othello.transposition import EXACT, LOWER, NO_MOVE, UPPER, TranspositionTable
+
+DEFAULT_TIME_LIMIT = 1.0 # Seconds per move
+MAX_DEPTH = 64
+WIN_SCORE = 100000 # Added to the final disc differential so any win beats any heuristic score
+TIME_CHECK_INTERVAL = 256 # Nodes between clock checks
+ENDGAME_EMPTIES = 12 # Solve exactly once this few squares are empty
+
+# Evaluation weights, from the point of view of the side to move
+CORNER_WEIGHT = 25
+X_SQUARE_WEIGHT = -12 # Diagonally next to a corner
+C_SQUARE_WEIGHT = -5 # Next to a corner along an edge
+EDGE_WEIGHT = 3
+MOBILITY_WEIGHT = 2
+
+OPPONENT = {Othello.Color.BLACK: Othello.Color.WHITE, Othello.Color.WHITE: Othello.Color.BLACK}
+
+class SearchStats(NamedTuple):
+  """Summary of the search behind a single move"""
+  nodes: int
+  seconds: float
+  depth: int # Deepest fully searched iteration
+  score: int
+
+  @property
+  def nodes_per_second(self) -> float:
+    return self.nodes / self.seconds if self.seconds > 0 else 0.0
+
+  def __str__(self) -> str:
+    return (f"depth {self.depth}, {self.nodes:,} nodes in {self.seconds:.2f}s "
+      f"({self.nodes_per_second:,.0f} nodes/s), score {self.score}")
+
+class _SearchTimeout(Exception):
+  """Raised inside the search when the time budget runs out"""
+
+class _Weights:
+  """Square class masks for one board size, with the weight of each class"""
+  _cache: dict[int, "_Weights"] = {}
+
+  classes: tuple[tuple[int, int], ...] # (weight, mask) pairs
+  square_weights: tuple[int, ...] # Weight of each square, used for move ordering
+
+  def __init__(self, size: int):
+    def bit(row: int, column: int) -> int:
+      return 1 << (row * size + column)
+
+    last = size - 1
+    corners = x_squares = c_squares = edges = 0
+    for row, column, row_step, column_step in ((0, 0, 1, 1), (0, last, 1, -1), (last, 0, -1, 1), (last, last, -1, -1)):
+      corners |= bit(row, column)
+      x_squares |= bit(row + row_step, column + column_step)
+      c_squares |= bit(row + row_step, column) | bit(row, column + column_step)
+    for i in range(size):
+      edges |= bit(0, i) | bit(last, i) | bit(i, 0) | bit(i, last)
+    edges &= ~(corners | c_squares)
+
+    self.classes = (
+      (CORNER_WEIGHT, corners),
+      (X_SQUARE_WEIGHT, x_squares),
+      (C_SQUARE_WEIGHT, c_squares),
+      (EDGE_WEIGHT, edges),
+    )
+    self.square_weights = tuple(
+      sum(weight for weight, mask in self.classes if mask >> index & 1) for index in range(size * size)
+    )
+
+  @classmethod
+  def for_size(cls, size: int) -> "_Weights":
+    weights = cls._cache.get(size)
+    if weights is None:
+      weights = cls._cache[size] = cls(size)
+    return weights
+
+class AlphaBetaPlayer:
+  """Computer player using negamax alpha-beta search with iterative deepening and a hard time budget per move"""
+  name = "alphabeta"
+
+  time_limit: float
+  max_depth: int
+  endgame_empties: int # Positions with this many empty squares or fewer are solved exactly
+  table: TranspositionTable # Kept between moves, so later searches reuse earlier work
+  last_stats: Union[SearchStats, None] # Stats for the most recent move, None before the first one
+
+  def __init__(self, time_limit: float=DEFAULT_TIME_LIMIT, max_depth: int=MAX_DEPTH, table: Union[TranspositionTable, None]=None,
+      endgame_empties: int=ENDGAME_EMPTIES):
+    self.time_limit = time_limit
+    self.max_depth = max_depth
+    self.endgame_empties = endgame_empties
+    self._solver = EndgameSolver()
+    self.table = table if table is not None else TranspositionTable()
+    self.last_stats = None
+    self._nodes = 0
+    self._deadline = 0.0
+
+  def choose_move(self, board: Othello, color: Othello.Color) -> Union[str, None]:
+    """Searches the position and returns the best move found within the time budget
+
+    :param Othello board: Board to move on. It is left exactly as it was found.
+    :param Othello.Color color: Color to move
+    :return Union[str, None]: Square to play, or None if the color has no valid move
+    """
+    start = perf_counter()
+    self._deadline = start + self.time_limit
+    self._nodes = 0
+    self.table.new_search()
+    weights = _Weights.for_size(board.size)
+
+    moves = self._ordered_moves(board.valid_moves_mask(color), weights)
+    if not moves:
+      self.last_stats = SearchStats(0, perf_counter() - start, 0, 0)
+      return None
+
+    black, white = board.bitboards()
+    empty_squares = board.size * board.size - (black | white).bit_count()
+    if empty_squares <= self.endgame_empties:
+      # Spend at most half the budget on the exact solve, so a position that's too big still gets searched
+      try:
+        result = self._solver.solve(board, color, self.time_limit / 2)
+      except TimeoutError:
+        pass
+      else:
+        self.last_stats = SearchStats(result.nodes, perf_counter() - start, result.empties, result.score)
+        return board.square_name(result.move)
+    best_move = moves[0]
+    best_score = 0
+    completed_depth = 0
+    for depth in range(1, self.max_depth + 1):
+      try:
+        score, move = self._search_root(board, color, depth, moves, weights)
+      except _SearchTimeout:
+        break
+      best_score, best_move = score, move
+      completed_depth = depth
+      # Search the best move first on the next iteration, it's the most likely to cause cutoffs
+      moves.remove(move)
+      moves.insert(0, move)
+      if abs(score) >= WIN_SCORE or depth >= empty_squares: # the result can't change with more depth
+        break
+
+    self.last_stats = SearchStats(self._nodes, perf_counter() - start, completed_depth, best_score)
+    return board.square_name(best_move)
+
+  def _search_root(self, board: Othello, color: Othello.Color, depth: int, moves: list[int], weights: _Weights) -> tuple[int, int]:
+    """Searches every root move to the given depth
+
+    :return tuple[int, int]: Best score and the move that reaches it
+    """
+    alpha = -WIN_SCORE * 2
+    beta = WIN_SCORE * 2
+    best_move = moves[0]
+    for move in moves:
+      delta = self._make_move(board, move, color)
+      try:
+        score = -self._negamax(board, OPPONENT[color], depth - 1, -beta, -alpha, False, weights)
+      finally:
+        self._unmake_move(board, delta)
+      if score > alpha:
+        alpha = score
+        best_move = move
+    return alpha, best_move
+
+  def _negamax(self, board: Othello, color: Othello.Color, depth: int, alpha: int, beta: int, passed: bool, weights: _Weights) -> int:
+    """Scores a position from the point of view of the color to move
+
+    :param bool passed: Whether the previous turn was a pass, so two passes in a row end the game
+    :return int: Score of the position
+    """
+    self._nodes += 1
+    if self._nodes % TIME_CHECK_INTERVAL == 0 and perf_counter() > self._deadline:
+      raise _SearchTimeout()
+
+    mask = board.valid_moves_mask(color)
+    if not mask:
+      if passed:
+        return self._final_score(board, color)
+      return -self._negamax(board, OPPONENT[color], depth, -beta, -alpha, True, weights)
+    if depth <= 0:
+      return self.evaluate(board, color, mask, weights)
+
+    key = board.zobrist_hash(color)
+    entry = self.table.probe(key)
+    moves = self._ordered_moves(mask, weights)
+    if entry is not None:
+      if entry.depth >= depth:
+        if entry.bound == EXACT:
+          return entry.value
+        if entry.bound == LOWER and entry.value >= beta:
+          return entry.value
+        if entry.bound == UPPER and entry.value <= alpha:
+          return entry.value
+      if entry.move in moves:
+        moves.remove(entry.move)
+        moves.insert(0, entry.move)
+
+    original_alpha = alpha
+    best_move = NO_MOVE
+    for move in moves:
+      delta = self._make_move(board, move, color)
+      try:
+        score = -self._negamax(board, OPPONENT[color], depth - 1, -beta, -alpha, False, weights)
+      finally:
+        self._unmake_move(board, delta)
+      if score >= beta:
+        self.table.store(key, depth, LOWER, score, move)
+        return score
+      if score > alpha:
+        alpha = score
+        best_move = move
+    self.table.store(key, depth, EXACT if alpha > original_alpha else UPPER, alpha, best_move)
+    return alpha
+
+  def _make_move(self, board: Othello, move: int, color: Othello.Color) -> MoveDelta:
+    """Plays a move during the search. Subclasses that keep their own state per position update it here."""
+    return board.make_move(move, color)
+
+  def _unmake_move(self, board: Othello, delta: MoveDelta) -> None:
+    """Takes back a move played with _make_move"""
+    board.unmake_move(delta)
+
+  def evaluate(self, board: Othello, color: Othello.Color, mobility: int, weights: _Weights) -> int:
+    """Heuristic score of a position from the point of view of the color to move
+
+    :param int mobility: Valid move bitboard of the color to move
+    :return int: Positional score plus a mobility bonus
+    """
+    black, white = board.bitboards()
+    mine, theirs = (black, white) if color == Othello.Color.BLACK else (white, black)
+    score = 0
+    for weight, mask in weights.classes:
+      score += weight * ((mine & mask).bit_count() - (theirs & mask).bit_count())
+    their_mobility = board.valid_moves_mask(OPPONENT[color]).bit_count()
+    return score + MOBILITY_WEIGHT * (mobility.bit_count() - their_mobility)
+
+  @staticmethod
+  def _final_score(board: Othello, color: Othello.Color) -> int:
+    """Score of a finished game from the point of view of the color to move
+
+    :return int: WIN_SCORE plus the disc differential for a win, the negative for a loss, 0 for a tie
+    """
+    difference = board.count_discs(color) - board.count_discs(OPPONENT[color])
+    if difference > 0:
+      return WIN_SCORE + difference
+    if difference < 0:
+      return -WIN_SCORE + difference
+    return 0
+
+  @staticmethod
+  def _ordered_moves(mask: int, weights: _Weights) -> list[int]:
+    """Returns the moves in a bitboard, best looking squares first
+
+    :param int mask: Bitboard of moves
+    :return list[int]: Bit positions of the moves
+    """
+    moves = _mask_to_moves(mask)
+    moves.sort(key=weights.square_weights.__getitem__, reverse=True)
+    return moves
+
+class PatternPlayer(AlphaBetaPlayer):
+  """Alpha-beta search scored by trained pattern weights instead of fixed square weights.
+
+  The pattern codes of the board are kept up to date as the search plays and takes back moves,
+  so each leaf costs one table lookup per pattern. Weights come from Othello.training.
+  """
+  name = "pattern"
+
+  weights_directory: Union[str, None] # Where the trained weights are, the default folder if None
+
+  def __init__(self, time_limit: float=DEFAULT_TIME_LIMIT, max_depth: int=MAX_DEPTH, table: Union[TranspositionTable, None]=None,
+      endgame_empties: int=ENDGAME_EMPTIES, weights_directory: Union[str, None]=None):
+    super().__init__(time_limit, max_depth, table, endgame_empties)
+    self.weights_directory = weights_directory
+    self._evaluator = None
+    self._codes = None
+    self._discs = 0
+
+  def prepare(self, size: int) -> None:
+    """Loads the weights for a board size, so missing weights are reported before a game starts
+
+    :param int size: Size of the board
+    :raises FileNotFoundError: If no weights have been trained for the size
+    """
+    from Othello.patterns import WEIGHTS_DIRECTORY, PatternEvaluator # Only pattern players need NumPy
+
+    self._evaluator = PatternEvaluator.for_size(size, self.weights_directory or WEIGHTS_DIRECTORY)
+
+  def choose_move(self, board: Othello, color: Othello.Color) -> Union[str, None]:
+    """Searches the position with the pattern weights for the board's size
+
+    :raises FileNotFoundError: If no weights have been trained for the board's size
+    """
+    from Othello.patterns import PatternCodes
+
+    if self._evaluator is None or self._evaluator.weights.size != board.size:
+      self.prepare(board.size)
+    self._codes = PatternCodes.from_board(board)
+    self._discs = sum(bitboard.bit_count() for bitboard in board.bitboards())
+    return super().choose_move(board, color)
+
+  def _make_move(self, board: Othello, move: int, color: Othello.Color) -> MoveDelta:
+    delta = board.make_move(move, color)
+    self._codes.play(delta)
+    self._discs += 1
+    return delta
+
+  def _unmake_move(self, board: Othello, delta: MoveDelta) -> None:
+    board.unmake_move(delta)
+    self._codes.undo(delta)
+    self._discs -= 1
+
+  def evaluate(self, board: Othello, color: Othello.Color, mobility: int, weights: _Weights) -> int:
+    """Pattern score of a position from the point of view of the color to move
+
+    :param int mobility: Valid move bitboard of the color to move
+    :return int: Expected final disc difference in hundredths of a disc
+    """
+    their_mobility = board.valid_moves_mask(OPPONENT[color]).bit_count()
+    score = self._evaluator.evaluate(self._codes.codes, color, self._discs, mobility.bit_count() - their_mobility)
+    return max(-WIN_SCORE + 1, min(WIN_SCORE - 1, score)) # Never mistaken for a won or lost game
+
+class RandomPlayer:
+  """Computer player picking uniformly among the valid moves, a baseline for tournaments"""
+  name = "random"
+
+  last_stats: Union[SearchStats, None]
+
+  def __init__(self, time_limit: float=DEFAULT_TIME_LIMIT, seed: Union[int, None]=None):
+    self.time_limit = time_limit # unused, accepted so every player is built the same way
+    self.last_stats = None
+    self._random = random.Random(seed)
+
+  def seed(self, seed: Union[int, None]) -> None:
+    """Reseeds the player's random number generator
+
+    :param Union[int, None] seed: New seed
+    """
+    self._random.seed(seed)
+
+  def choose_move(self, board: Othello, color: Othello.Color) -> Union[str, None]:
+    """Returns a random valid move
+
+    :param Othello board: Board to move on
+    :param Othello.Color color: Color to move
+    :return Union[str, None]: Square to play, or None if the color has no valid move
+    """
+    start = perf_counter()
+    moves = _mask_to_moves(board.valid_moves_mask(color))
+    self.last_stats = SearchStats(0, perf_counter() - start, 0, 0)
+    if not moves:
+      return None
+    return board.square_name(self._random.choice(moves))
+
+class GreedyPlayer(RandomPlayer):
+  """Computer player taking the move that flips the most discs, breaking ties at random"""
+  name = "greedy"
+
+  def choose_move(self, board: Othello, color: Othello.Color) -> Union[str, None]:
+    """Returns the valid move that flips the most discs
+
+    :param Othello board: Board to move on
+    :param Othello.Color color: Color to move
+    :return Union[str, None]: Square to play, or None if the color has no valid move
+    """
+    start = perf_counter()
+    best_moves: list[int] = []
+    most_flips = 0
+    for move in _mask_to_moves(board.valid_moves_mask(color)):
+      delta = board.make_move(move, color)
+      flips = delta.flips.bit_count()
+      board.unmake_move(delta)
+      if flips > most_flips:
+        best_moves = [move]
+        most_flips = flips
+      elif flips == most_flips:
+        best_moves.append(move)
+    self.last_stats = SearchStats(len(best_moves), perf_counter() - start, 1, most_flips)
+    if not best_moves:
+      return None
+    return board.square_name(self._random.choice(best_moves))
+
+def _mask_to_moves(mask: int) -> list[int]:
+  """Returns the bit positions set in a bitboard
+
+  :param int mask: Bitboard of moves
+  :return list[int]: Bit positions, lowest first
+  """
+  moves = []
+  while mask:
+    low = mask & -mask
+    moves.append(low.bit_length() - 1)
+    mask ^= low
+  return moves
+
+PLAYERS = {
+  AlphaBetaPlayer.name: AlphaBetaPlayer,
+  PatternPlayer.name: PatternPlayer,
+  RandomPlayer.name: RandomPlayer,
+  GreedyPlayer.name: GreedyPlayer,
+  MCTSPlayer.name: MCTSPlayer,
+}
+
+def make_player(name: str, time_limit: float=DEFAULT_TIME_LIMIT, seed: Union[int, None]=None, size: Union[int, None]=None,
+    **options):
+  """Creates a computer player by name
+
+  :param str name: Name of the player, or "human" for no computer player
+  :param float time_limit: Seconds the player may think per move
+  :param Union[int, None] seed: Seed for players that make random choices
+  :param Union[int, None] size: Board size the player will play on, for players that load data per size
+  :param options: Extra keyword arguments for the player's constructor
+  :raises FileNotFoundError: If the player needs data that doesn't exist for the size, such as trained weights
+  :return: The player, or None for a human
+  """
+  if name == "human":
+    return None
+  player = PLAYERS[name](time_limit=time_limit, **options)
+  if seed is not None and hasattr(player, "seed"):
+    player.seed(seed)
+  if size is not None and hasattr(player, "prepare"):
+    player.prepare(size)
+  return player
@@ -0,0 +1,215 @@
+from typing import Union
+import numpy as np
+from Othello.othello import Othello
+from Othello.records import PASS
+
+# (row step, column step) of the eight directions
+_STEPS = ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+def _shift(boards: np.ndarray, row_step: int, column_step: int) -> np.ndarray:
+  """Moves every disc one square in a direction, dropping the ones that fall off the board
+
+  :param np.ndarray boards: Boolean array of shape (batch, size, size)
+  :param int row_step: -1, 0 or 1
+  :param int column_step: -1, 0 or 1
+  :return np.ndarray: Shifted copy
+  """
+  shifted = np.zeros_like(boards)
+  size = boards.shape[1]
+  rows_to = slice(max(row_step, 0), size + min(row_step, 0))
+  rows_from = slice(max(-row_step, 0), size + min(-row_step, 0))
+  columns_to = slice(max(column_step, 0), size + min(column_step, 0))
+  columns_from = slice(max(-column_step, 0), size + min(-column_step, 0))
+  shifted[:, rows_to, columns_to] = boards[:, rows_from, columns_from]
+  return shifted
+
+def _extend_runs(run: np.ndarray, opponent: np.ndarray, row_step: int, column_step: int) -> np.ndarray:
+  """Grows runs of opponent discs in a direction until every run hits a square that isn't an opponent disc
+
+  :param np.ndarray run: Boolean array (batch, size, size) of the first disc of each run
+  :param np.ndarray opponent: Boolean array (batch, size, size) of the discs runs may extend over
+  :param int row_step: -1, 0 or 1
+  :param int column_step: -1, 0 or 1
+  :return np.ndarray: The full runs
+  """
+  for _ in range(run.shape[1] - 3):
+    longer = run | (_shift(run, row_step, column_step) & opponent)
+    if np.array_equal(longer, run): # runs are usually short, so stop as soon as none grew
+      break
+    run = longer
+  return run
+
+def legal_moves(player: np.ndarray, opponent: np.ndarray) -> np.ndarray:
+  """Finds every empty square where the player would flank at least one opponent disc, for a whole batch
+
+  :param np.ndarray player: Boolean array (batch, size, size) of the discs of the side to move
+  :param np.ndarray opponent: Boolean array (batch, size, size) of the other side's discs
+  :return np.ndarray: Boolean array (batch, size, size) of legal moves
+  """
+  empty = ~(player | opponent)
+  moves = np.zeros_like(player)
+  for row_step, column_step in _STEPS:
+    run = _extend_runs(_shift(player, row_step, column_step) & opponent, opponent, row_step, column_step)
+    moves |= _shift(run, row_step, column_step) & empty
+  return moves
+
+def flips(player: np.ndarray, opponent: np.ndarray, placed: np.ndarray) -> np.ndarray:
+  """Finds the discs each placed disc flanks, for a whole batch
+
+  :param np.ndarray player: Boolean array (batch, size, size) of the discs of the side to move
+  :param np.ndarray opponent: Boolean array (batch, size, size) of the other side's discs
+  :param np.ndarray placed: Boolean array (batch, size, size) with at most one square set per board
+  :return np.ndarray: Boolean array (batch, size, size) of discs to flip
+  """
+  flipped = np.zeros_like(player)
+  for row_step, column_step in _STEPS:
+    run = _extend_runs(_shift(placed, row_step, column_step) & opponent, opponent, row_step, column_step)
+    flanked = (_shift(run, row_step, column_step) & player).any(axis=(1, 2))
+    flipped |= run & flanked[:, None, None]
+  return flipped
+
+class BatchOthello:
+  """Many boards of the same size advanced in lockstep with NumPy.
+
+  Discs are stored as two boolean arrays of shape (batch, size, size), indexed by
+  row then column, so flattening a board gives the same square numbering as
+  Othello.bitboards. Each board has its own side to move.
+  """
+  size: int
+  black: np.ndarray # (batch, size, size) bool
+  white: np.ndarray # (batch, size, size) bool
+  black_to_move: np.ndarray # (batch,) bool
+  passes: np.ndarray # (batch,) consecutive passes, the game is over at 2
+
+  def __init__(self, batch: int, size: int=8):
+    if size < 6 or size > 26 or size % 2:
+      raise ValueError(f"Invalid size: {size}. Must be an even integer between 6 and 26.")
+    self.size = size
+    start = Othello(size)
+    black, white = _bitboards_to_arrays(*start.bitboards(), size)
+    self.black = np.repeat(black[None], batch, axis=0)
+    self.white = np.repeat(white[None], batch, axis=0)
+    self.black_to_move = np.ones(batch, dtype=bool)
+    self.passes = np.zeros(batch, dtype=np.int8)
+
+  def __len__(self) -> int:
+    return self.black.shape[0]
+
+  def _sides(self) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the discs of the side to move and of the other side, per board
+    """
+    to_move = self.black_to_move[:, None, None]
+    return np.where(to_move, self.black, self.white), np.where(to_move, self.white, self.black)
+
+  def legal_moves(self) -> np.ndarray:
+    """Returns the legal moves of the side to move on every board
+
+    :return np.ndarray: Boolean array (batch, size, size)
+    """
+    return legal_moves(*self._sides())
+
+  def finished(self) -> np.ndarray:
+    """Returns which games are over, because neither side can move
+
+    :return np.ndarray: Boolean array (batch,)
+    """
+    player, opponent = self._sides()
+    over = self.passes >= 2
+    undecided = ~over
+    if undecided.any():
+      stuck = ~legal_moves(player[undecided], opponent[undecided]).any(axis=(1, 2))
+      stuck &= ~legal_moves(opponent[undecided], player[undecided]).any(axis=(1, 2))
+      over[undecided] = stuck
+    return over
+
+  def play(self, moves: np.ndarray) -> np.ndarray:
+    """Plays one move on every board. Boards given PASS switch sides without moving.
+
+    :param np.ndarray moves: Square index per board (row * size + column), or PASS
+    :return np.ndarray: Boolean array (batch, size, size) of the discs flipped on each board
+    """
+    moves = np.asarray(moves)
+    if moves.shape != (len(self),):
+      raise ValueError(f"Expected one move per board, got shape {moves.shape}")
+    player, opponent = self._sides()
+    legal = legal_moves(player, opponent)
+    playing = moves != PASS
+    if (playing & ((moves < 0) | (moves >= self.size * self.size))).any():
+      raise ValueError("Move off the board.")
+
+    placed = np.zeros_like(player)
+    rows, columns = np.divmod(moves[playing], self.size)
+    placed[np.flatnonzero(playing), rows, columns] = True
+    if not legal[placed].all():
+      raise ValueError("Illegal move.")
+    if (~playing & legal.any(axis=(1, 2))).any():
+      raise ValueError("A board passed with a legal move available.")
+
+    flipped = flips(player, opponent, placed)
+    player |= placed | flipped
+    opponent &= ~flipped
+    to_move = self.black_to_move[:, None, None]
+    self.black = np.where(to_move, player, opponent)
+    self.white = np.where(to_move, opponent, player)
+    self.black_to_move = ~self.black_to_move
+    self.passes = np.where(playing, 0, self.passes + 1).astype(np.int8)
+    return flipped
+
+  def random_moves(self, generator: np.random.Generator) -> np.ndarray:
+    """Picks a uniformly random legal move for every board, PASS where there is none
+
+    :param np.random.Generator generator: Random number source
+    :return np.ndarray: Square index per board, or PASS
+    """
+    legal = self.legal_moves().reshape(len(self), -1)
+    scores = generator.random(legal.shape) * legal
+    moves = scores.argmax(axis=1)
+    return np.where(legal.any(axis=1), moves, PASS)
+
+  def disc_counts(self) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the number of black and white discs on every board
+
+    :return tuple[np.ndarray, np.ndarray]: Black counts and white counts, shape (batch,)
+    """
+    return self.black.sum(axis=(1, 2)), self.white.sum(axis=(1, 2))
+
+  @classmethod
+  def from_games(cls, boards: list[Othello], black_to_move: Union[list[bool], None]=None) -> "BatchOthello":
+    """Builds a batch from existing boards, which must all be the same size
+
+    :param list[Othello] boards: Boards to copy
+    :param Union[list[bool], None] black_to_move: Side to move per board, black everywhere by default
+    :return BatchOthello: The new batch
+    """
+    if not boards:
+      raise ValueError("Need at least one board.")
+    size = boards[0].size
+    if any(board.size != size for board in boards):
+      raise ValueError("All boards in a batch must be the same size.")
+    batch = cls(len(boards), size)
+    for i, board in enumerate(boards):
+      batch.black[i], batch.white[i] = _bitboards_to_arrays(*board.bitboards(), size)
+    if black_to_move is not None:
+      batch.black_to_move = np.asarray(black_to_move, dtype=bool).copy()
+    return batch
+
+  def to_game(self, index: int) -> Othello:
+    """Copies one board of the batch into an Othello instance
+
+    :param int index: Board to copy
+    :return Othello: The board
+    """
+    return Othello.from_bitboards(_array_to_bitboard(self.black[index]), _array_to_bitboard(self.white[index]), self.size)
+
+def _bitboards_to_arrays(black: int, white: int, size: int) -> tuple[np.ndarray, np.ndarray]:
+  """Unpacks a pair of bitboards into (size, size) boolean arrays
+  """
+  return _bitboard_to_array(black, size), _bitboard_to_array(white, size)
+
+def _bitboard_to_array(bitboard: int, size: int) -> np.ndarray:
+  squares = size * size
+  packed = np.frombuffer(bitboard.to_bytes((squares + 7) // 8, "little"), dtype=np.uint8)
+  return np.unpackbits(packed, bitorder="little")[:squares].astype(bool).reshape(size, size)
+
+def _array_to_bitboard(board: np.ndarray) -> int:
+  return int.from_bytes(np.packbits(board.reshape(-1), bitorder="little").tobytes(), "little")
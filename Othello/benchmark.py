@@ -0,0 +1,259 @@
+import argparse
+import json
+import platform
+import random
+import sys
+from time import perf_counter, time
+from typing import Callable, NamedTuple, Union
+from Othello.othello import Othello
+from Othello.perft import OPPONENT, perft
+from Othello.records import PASS, finished_moves
+
+BOARD_SIZES = list(range(6, 27, 2))
+RESULTS_VERSION = 1
+DEFAULT_GAMES = 4 # Seeded random games per size, their positions are the inputs of most benchmarks
+DEFAULT_PERFT_DEPTH = 6
+DEFAULT_REPEAT = 3 # Runs of each benchmark, the fastest is kept
+DEFAULT_TOLERANCE = 0.15 # Slowdown, as a fraction, before a benchmark counts as a regression
+
+class BenchmarkResult(NamedTuple):
+  """Timing of one benchmark on one board size"""
+  size: int
+  name: str
+  operations: int # Calls made, moves played, games or perft leaves, depending on the benchmark
+  seconds: float
+
+  @property
+  def operations_per_second(self) -> float:
+    return self.operations / self.seconds if self.seconds > 0 else 0.0
+
+def random_game(size: int, seed: int) -> list[int]:
+  """Plays one game picking uniformly random valid moves
+
+  :param int size: Size of the board
+  :param int seed: Seed for the moves
+  :return list[int]: Bit position of every move, PASS for skipped turns
+  """
+  generator = random.Random(seed)
+  board = Othello(size)
+  color = Othello.Color.BLACK
+  moves = []
+  while len(moves) < 2 or moves[-1] != PASS or moves[-2] != PASS:
+    mask = board.valid_moves_mask(color)
+    if mask:
+      squares = _bits(mask)
+      square = squares[generator.randrange(len(squares))]
+      board.make_move(square, color)
+      moves.append(square)
+    else:
+      moves.append(PASS)
+    color = OPPONENT[color]
+  return list(finished_moves(moves))
+
+def game_positions(size: int, games: list[list[int]]) -> list[tuple[Othello, Othello.Color]]:
+  """Replays games and copies out every position where the side to move has a valid move
+
+  :param int size: Size of the board
+  :param list[list[int]] games: Move lists from random_game
+  :return list[tuple[Othello, Othello.Color]]: Independent boards and the color to move on each
+  """
+  positions = []
+  for moves in games:
+    board = Othello(size)
+    color = Othello.Color.BLACK
+    for move in moves:
+      if move != PASS:
+        positions.append((Othello.from_bitboards(*board.bitboards(), size), color))
+        board.make_move(move, color)
+      color = OPPONENT[color]
+  return positions
+
+def bench_check_move(size: int, games: list[list[int]]) -> tuple[int, float]:
+  """Checks every empty square for the color to move, in every position of the games"""
+  work = []
+  for board, color in game_positions(size, games):
+    black, white = board.bitboards()
+    empty = board._geometry.full & ~(black | white)
+    work.append((board, color, [board.square_name(square) for square in _bits(empty)]))
+  calls = 0
+  start = perf_counter()
+  for board, color, squares in work:
+    for square in squares:
+      board.check_move(square, color)
+    calls += len(squares)
+  return calls, perf_counter() - start
+
+def bench_all_valid_moves(size: int, games: list[list[int]]) -> tuple[int, float]:
+  """Replays the games, listing the valid moves before every turn, so each call sees a position just changed by a move"""
+  calls = 0
+  start = perf_counter()
+  for moves in games:
+    board = Othello(size)
+    color = Othello.Color.BLACK
+    for move in moves:
+      board.all_valid_moves(color)
+      calls += 1
+      if move != PASS:
+        board.make_move(move, color)
+      color = OPPONENT[color]
+  return calls, perf_counter() - start
+
+def bench_make_unmake(size: int, games: list[list[int]]) -> tuple[int, float]:
+  """Plays and takes back every valid move, in every position of the games"""
+  work = [(board, color, _bits(board.valid_moves_mask(color))) for board, color in game_positions(size, games)]
+  moves = 0
+  start = perf_counter()
+  for board, color, squares in work:
+    for square in squares:
+      board.unmake_move(board.make_move(square, color))
+    moves += len(squares)
+  return moves, perf_counter() - start
+
+def bench_random_games(size: int, games: int, seed: int) -> tuple[int, float]:
+  """Plays full games picking uniformly random valid moves"""
+  start = perf_counter()
+  for i in range(games):
+    random_game(size, seed + i)
+  return games, perf_counter() - start
+
+def bench_perft(size: int, depth: int) -> tuple[int, float]:
+  """Counts move paths from the starting position"""
+  start = perf_counter()
+  leaves = perft(Othello(size), Othello.Color.BLACK, depth)
+  return leaves, perf_counter() - start
+
+def _bits(mask: int) -> list[int]:
+  squares = []
+  while mask:
+    low = mask & -mask
+    squares.append(low.bit_length() - 1)
+    mask ^= low
+  return squares
+
+def _fastest(repeat: int, benchmark: Callable[..., tuple[int, float]], *args) -> tuple[int, float]:
+  """Runs a benchmark several times and keeps the fastest run, the one least disturbed by anything else on the machine"""
+  return min((benchmark(*args) for _ in range(max(1, repeat))), key=lambda timing: timing[1])
+
+def run_benchmarks(sizes: list[int], games: int=DEFAULT_GAMES, perft_depth: int=DEFAULT_PERFT_DEPTH,
+    seed: int=0, repeat: int=DEFAULT_REPEAT) -> list[BenchmarkResult]:
+  """Runs every benchmark on every board size
+
+  :param list[int] sizes: Board sizes to measure
+  :param int games: Random games per size used as input, and played by the random game benchmark
+  :param int perft_depth: Depth of the perft benchmark, 0 to skip it
+  :param int seed: Base seed for the random games
+  :param int repeat: Runs of each benchmark, the fastest is kept
+  :return list[BenchmarkResult]: One result per benchmark and size
+  """
+  results = []
+  for size in sizes:
+    sample = [random_game(size, seed + i) for i in range(games)]
+    timings = {
+      "check_move": _fastest(repeat, bench_check_move, size, sample),
+      "all_valid_moves": _fastest(repeat, bench_all_valid_moves, size, sample),
+      "make_unmake": _fastest(repeat, bench_make_unmake, size, sample),
+      "random_games": _fastest(repeat, bench_random_games, size, games, seed),
+    }
+    if perft_depth > 0:
+      timings[f"perft_{perft_depth}"] = _fastest(repeat, bench_perft, size, perft_depth)
+    for name, (operations, seconds) in timings.items():
+      results.append(BenchmarkResult(size, name, operations, seconds))
+  return results
+
+def results_to_json(results: list[BenchmarkResult]) -> dict:
+  """Packs results with enough context to compare them against a run from another commit or machine
+
+  :param list[BenchmarkResult] results: Results of run_benchmarks
+  :return dict: JSON-ready results
+  """
+  return {
+    "version": RESULTS_VERSION,
+    "created": time(),
+    "python": platform.python_version(),
+    "platform": platform.platform(),
+    "results": [
+      {"size": r.size, "name": r.name, "operations": r.operations, "seconds": r.seconds,
+        "operations_per_second": r.operations_per_second}
+      for r in results
+    ],
+  }
+
+def compare(baseline: dict, current: dict, tolerance: float=DEFAULT_TOLERANCE) -> list[dict]:
+  """Matches up two result files benchmark by benchmark
+
+  :param dict baseline: Earlier results, from results_to_json
+  :param dict current: New results, from results_to_json
+  :param float tolerance: Fraction slower than the baseline a benchmark may be before it counts as a regression
+  :return list[dict]: Per shared benchmark, the speed ratio (above 1 is faster), whether it regressed,
+    and whether the operation counts differ, which means the two runs didn't do the same work
+  """
+  old = {(r["size"], r["name"]): r for r in baseline["results"]}
+  rows = []
+  for result in current["results"]:
+    before = old.get((result["size"], result["name"]))
+    if before is None:
+      continue
+    ratio = result["operations_per_second"] / before["operations_per_second"] if before["operations_per_second"] else 0.0
+    rows.append({
+      "size": result["size"],
+      "name": result["name"],
+      "ratio": ratio,
+      "regression": ratio < 1 - tolerance,
+      "mismatch": result["operations"] != before["operations"],
+    })
+  return rows
+
+def print_results(results: list[BenchmarkResult]) -> None:
+  print(f"{'size':>4} {'benchmark':<16} {'operations':>12} {'seconds':>9} {'ops/s':>12}")
+  for r in results:
+    print(f"{r.size:>4} {r.name:<16} {r.operations:>12,} {r.seconds:>9.3f} {r.operations_per_second:>12,.0f}")
+
+def print_comparison(rows: list[dict]) -> None:
+  print(f"{'size':>4} {'benchmark':<16} {'speed':>7}")
+  for row in rows:
+    flags = " REGRESSION" if row["regression"] else ""
+    if row["mismatch"]:
+      flags += " COUNT MISMATCH"
+    print(f"{row['size']:>4} {row['name']:<16} {row['ratio']:>6.2f}x{flags}")
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+  """Parses the command line arguments for the benchmarks
+
+  :param list[str] argv: Arguments, not including the script name
+  :return argparse.Namespace: The parsed arguments
+  """
+  parser = argparse.ArgumentParser(description="Time the Othello engine and compare against earlier runs.")
+  parser.add_argument("--sizes", type=int, nargs="+", default=BOARD_SIZES, help="Board sizes to measure")
+  parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="Random games per size")
+  parser.add_argument("--perft-depth", type=int, default=DEFAULT_PERFT_DEPTH, help="Depth of the perft benchmark, 0 to skip")
+  parser.add_argument("--seed", type=int, default=0, help="Base seed for the random games")
+  parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Runs of each benchmark, the fastest is kept")
+  parser.add_argument("--output", help="Write the results to this file as JSON")
+  parser.add_argument("--compare", help="Earlier results file to compare against")
+  parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+    help="Fraction slower than the earlier results before a benchmark counts as a regression")
+  return parser.parse_args(argv)
+
+def main(argv: Union[list[str], None]=None) -> int:
+  args = parse_args(sys.argv[1:] if argv is None else argv)
+  for size in args.sizes:
+    if size < 6 or size > 26 or size % 2:
+      raise SystemExit(f"Invalid size: {size}. Must be an even integer between 6 and 26.")
+
+  results = run_benchmarks(args.sizes, args.games, args.perft_depth, args.seed, args.repeat)
+  print_results(results)
+  current = results_to_json(results)
+  if args.output:
+    with open(args.output, "w") as f:
+      json.dump(current, f, indent=2)
+  if args.compare:
+    with open(args.compare) as f:
+      baseline = json.load(f)
+    rows = compare(baseline, current, args.tolerance)
+    print_comparison(rows)
+    if any(row["regression"] or row["mismatch"] for row in rows):
+      return 1
+  return 0
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,268 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+from time import perf_counter
+from typing import Iterable, NamedTuple, Union
+from Othello.othello import Othello
+from Othello.records import PASS, GameRecord, finished_moves, read_games
+from Othello.tournament import DEFAULT_PLAYERS, run_tournament, schedule_games
+
+MAGIC = b"OTBK"
+VERSION = 1
+DEFAULT_PLIES = 12 # Moves into each game that are added to the book
+DEFAULT_MIN_GAMES = 2 # Games a move needs before the book will play it
+BOOK_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "books") # Next to the package, wherever it's run from
+
+# magic, version, board size, position count
+HEADER = struct.Struct("<4sBBxxI")
+KEY = struct.Struct("<Q")
+MOVE = struct.Struct("<H")
+GAMES = struct.Struct("<I")
+
+class BookEntry(NamedTuple):
+  """The move the book plays in one position"""
+  move: int # Bit position of the move, see Othello.bitboards
+  games: int # Self-play games the move was played in
+  score: float # Average result for the side to move, 1 for a win, 0.5 for a draw
+
+def book_path(size: int, directory: str=BOOK_DIRECTORY) -> str:
+  """Returns the default file name of the book for a board size
+
+  :param int size: Size of the board
+  :param str directory: Folder the books are kept in
+  :return str: Path of the book
+  """
+  return os.path.join(directory, f"book_{size}.bin")
+
+def collect_book_moves(games: Iterable[GameRecord], size: int, plies: int=DEFAULT_PLIES,
+    min_games: int=DEFAULT_MIN_GAMES) -> dict[int, BookEntry]:
+  """Tallies the opening moves of finished games and picks the best scoring move in each position
+
+  :param Iterable[GameRecord] games: Games to learn from, games on other board sizes are skipped
+  :param int size: Size of the board
+  :param int plies: Moves into each game to look at, passes included
+  :param int min_games: Games a move needs to be picked
+  :return dict[int, BookEntry]: Chosen move per position hash, see Othello.zobrist_hash
+  """
+  # hash -> move -> [games, points for the side to move]
+  tallies: dict[int, dict[int, list]] = {}
+  for record in games:
+    if record.size != size:
+      continue
+    final = record.replay()
+    difference = final.count_discs(Othello.Color.BLACK) - final.count_discs(Othello.Color.WHITE)
+    black_points = 1.0 if difference > 0 else 0.0 if difference < 0 else 0.5
+
+    board = Othello(size)
+    turn = Othello.Color.BLACK
+    other = Othello.Color.WHITE
+    for move in record.moves[:plies]:
+      if move != PASS:
+        tally = tallies.setdefault(board.zobrist_hash(turn), {}).setdefault(move, [0, 0.0])
+        tally[0] += 1
+        tally[1] += black_points if turn == Othello.Color.BLACK else 1.0 - black_points
+        board.make_move(move, turn)
+      turn, other = other, turn
+
+  book = {}
+  for key, moves in tallies.items():
+    candidates = [(points / games, games, move) for move, (games, points) in moves.items() if games >= min_games]
+    if candidates:
+      score, games, move = max(candidates)
+      book[key] = BookEntry(move, games, score)
+  return book
+
+def write_book(path: str, size: int, book: dict[int, BookEntry]) -> None:
+  """Writes a book with its keys sorted, so a reader can binary search the file in place.
+
+  The file is the header, then every key, then every move, then every game count, each
+  as a little-endian array in key order. Scores aren't stored, only the chosen moves.
+
+  :param str path: File to write
+  :param int size: Size of the board
+  :param dict[int, BookEntry] book: Chosen move per position hash
+  """
+  keys = sorted(book)
+  with open(path, "wb") as f:
+    f.write(HEADER.pack(MAGIC, VERSION, size, len(keys)))
+    f.write(b"".join(KEY.pack(key) for key in keys))
+    f.write(b"".join(MOVE.pack(book[key].move) for key in keys))
+    f.write(b"".join(GAMES.pack(min(book[key].games, 0xFFFFFFFF)) for key in keys))
+
+class OpeningBook:
+  """Read-only view of a book file through a memory map.
+
+  Nothing is loaded up front: each lookup binary searches the sorted keys in the mapped
+  file, touching only the pages it needs.
+  """
+  path: str
+  size: int
+  lookups: int
+  hits: int
+
+  def __init__(self, path: str):
+    self.path = path
+    with open(path, "rb") as f:
+      self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(self._map) < HEADER.size:
+      self._map.close()
+      raise ValueError("Truncated opening book header.")
+    magic, version, self.size, self._count = HEADER.unpack_from(self._map)
+    if magic != MAGIC:
+      self._map.close()
+      raise ValueError("Not an opening book, or the file is corrupted.")
+    if version != VERSION:
+      self._map.close()
+      raise ValueError(f"Unsupported opening book version: {version}")
+    self._moves_offset = HEADER.size + self._count * KEY.size
+    self._games_offset = self._moves_offset + self._count * MOVE.size
+    if len(self._map) < self._games_offset + self._count * GAMES.size:
+      self._map.close()
+      raise ValueError("Truncated opening book.")
+    self.lookups = 0
+    self.hits = 0
+
+  def __len__(self) -> int:
+    return self._count
+
+  def _find(self, key: int) -> int:
+    """Returns the slot of a key, or -1 if it isn't in the book"""
+    low = 0
+    high = self._count
+    unpack_from = KEY.unpack_from
+    book = self._map
+    while low < high:
+      middle = (low + high) >> 1
+      if unpack_from(book, HEADER.size + middle * KEY.size)[0] < key:
+        low = middle + 1
+      else:
+        high = middle
+    if low < self._count and unpack_from(book, HEADER.size + low * KEY.size)[0] == key:
+      return low
+    return -1
+
+  def probe(self, key: int) -> Union[BookEntry, None]:
+    """Looks up a position by hash
+
+    :param int key: Zobrist hash of the position with the side to move mixed in
+    :return Union[BookEntry, None]: The book move, or None if the position isn't in the book.
+      The score is not stored in the file and is always 0.
+    """
+    slot = self._find(key)
+    if slot < 0:
+      return None
+    move = MOVE.unpack_from(self._map, self._moves_offset + slot * MOVE.size)[0]
+    games = GAMES.unpack_from(self._map, self._games_offset + slot * GAMES.size)[0]
+    return BookEntry(move, games, 0.0)
+
+  def lookup(self, board: Othello, color: Othello.Color) -> Union[BookEntry, None]:
+    """Returns the book move for a position, checking it is valid in case of a hash collision
+
+    :param Othello board: Current board
+    :param Othello.Color color: Color to move
+    :return Union[BookEntry, None]: The book move, or None if the position isn't in the book
+    """
+    self.lookups += 1
+    if board.size != self.size:
+      return None
+    entry = self.probe(board.zobrist_hash(color))
+    if entry is None or not board.valid_moves_mask(color) >> entry.move & 1:
+      return None
+    self.hits += 1
+    return entry
+
+  def close(self) -> None:
+    self._map.close()
+
+class BookStats(NamedTuple):
+  """Stats for a move taken from the book"""
+  games: int
+  seconds: float
+
+  def __str__(self) -> str:
+    return f"book move from {self.games:,} games in {self.seconds * 1_000_000:.0f}us"
+
+class BookPlayer:
+  """Wraps a computer player so that it plays from an opening book while the position is in it,
+  and only searches once the game leaves the book
+  """
+  player: object
+  book: OpeningBook
+  last_stats: object
+
+  def __init__(self, player, book: OpeningBook):
+    self.player = player
+    self.book = book
+    self.name = player.name
+    self.last_stats = None
+
+  def seed(self, seed: Union[int, None]) -> None:
+    if hasattr(self.player, "seed"):
+      self.player.seed(seed)
+
+  def choose_move(self, board: Othello, color: Othello.Color) -> Union[str, None]:
+    """Returns the book move if there is one, otherwise the wrapped player's move
+
+    :param Othello board: Board to move on
+    :param Othello.Color color: Color to move
+    :return Union[str, None]: Square to play, or None if the color has no valid move
+    """
+    start = perf_counter()
+    entry = self.book.lookup(board, color)
+    if entry is not None:
+      self.last_stats = BookStats(entry.games, perf_counter() - start)
+      return board.square_name(entry.move)
+    move = self.player.choose_move(board, color)
+    self.last_stats = self.player.last_stats
+    return move
+
+  def close(self) -> None:
+    if hasattr(self.player, "close"):
+      self.player.close()
+    self.book.close()
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+  """Parses the command line arguments for building a book
+
+  :param list[str] argv: Arguments, not including the script name
+  :return argparse.Namespace: The parsed arguments
+  """
+  parser = argparse.ArgumentParser(description="Build an Othello opening book from self-play games.")
+  parser.add_argument("size", type=int, nargs="?", default=8, help="Size of the board")
+  parser.add_argument("--games", type=int, default=1000, help="Self-play games to play")
+  parser.add_argument("--players", nargs=2, default=list(DEFAULT_PLAYERS), metavar=("FIRST", "SECOND"),
+    help="Player specs for the self-play games, name[:seconds per move]")
+  parser.add_argument("--records", nargs="*", default=[], help="Game record files to learn from as well as, or instead of, self-play")
+  parser.add_argument("--plies", type=int, default=DEFAULT_PLIES, help="Moves into each game to add to the book")
+  parser.add_argument("--min-games", type=int, default=DEFAULT_MIN_GAMES, help="Games a move needs before the book plays it")
+  parser.add_argument("--workers", type=int, default=None, help="Worker processes, defaults to one per CPU core")
+  parser.add_argument("--seed", type=int, default=0, help="Base seed for players that make random choices")
+  parser.add_argument("--output", help="Book file to write, defaults to book_<size>.bin in the package's books folder")
+  return parser.parse_args(argv)
+
+def main(argv: Union[list[str], None]=None) -> str:
+  args = parse_args(sys.argv[1:] if argv is None else argv)
+  if args.size < 6 or args.size > 26 or args.size % 2:
+    raise SystemExit(f"Invalid size: {args.size}. Must be an even integer between 6 and 26.")
+
+  start = perf_counter()
+  games: list[GameRecord] = []
+  if args.games > 0:
+    first, second = args.players
+    tasks = schedule_games(args.games, first, second, [args.size], args.seed)
+    for result in run_tournament(tasks, args.workers):
+      games.append(GameRecord(result.size, result.started, result.black, result.white, finished_moves(result.move_list)))
+  for path in args.records:
+    games.extend(read_games(path))
+
+  book = collect_book_moves(games, args.size, args.plies, args.min_games)
+  path = args.output or book_path(args.size)
+  os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+  write_book(path, args.size, book)
+  print(f"Wrote {len(book):,} positions from {len(games):,} games to {path} in {perf_counter() - start:.2f}s")
+  return path
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,350 @@
+import argparse
+import glob
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import blake2b
+from time import perf_counter
+from typing import NamedTuple, Union
+import numpy as np
+from Othello.othello import Othello, SIZE
+from Othello.records import PASS, GameRecord, finished_moves, read_games
+from Othello.symmetry import canonicalize
+
+MAGIC = b"OTPD"
+VERSION = 1
+# magic, version, board size, partition bits, positions, games
+HEADER = struct.Struct("<4sBBBxQQ")
+# Where each partition's slots start in the file, its number of home slots (a power of two) and its number of slots
+DIRECTORY_ENTRY = struct.Struct("<QQQ")
+PARTITION_BITS = 8 # The index is split into 2 ** bits partitions, each built in memory on its own
+FLUSH_BYTES = 1 << 20 # Ingestion buffers this much per partition before appending it to disk
+LOAD_FACTOR = 0.5 # Most a partition's home slots are filled, so probes stay short
+
+BLACK_TO_MOVE = 0
+WHITE_TO_MOVE = 1
+
+class PositionStats(NamedTuple):
+  """How the games that reached a position ended"""
+  games: int
+  black_wins: int
+  white_wins: int
+  draws: int
+  disc_sum: int # Final black discs minus white discs, summed over the games
+
+  @property
+  def average_disc_difference(self) -> float:
+    return self.disc_sum / self.games if self.games else 0.0
+
+  def __str__(self) -> str:
+    return (f"{self.games:,} games: black won {self.black_wins:,}, white won {self.white_wins:,}, "
+      f"{self.draws:,} drawn, average disc difference {self.average_disc_difference:+.2f}")
+
+class BuildStats(NamedTuple):
+  """What building a database did"""
+  files: int
+  games: int
+  skipped: int # Games on a board of another size
+  positions: int # Distinct positions stored
+  occurrences: int # Positions seen across every game, before merging
+  seconds: float
+
+  def __str__(self) -> str:
+    return (f"{self.games:,} games from {self.files} file(s) ({self.skipped:,} of another size skipped), "
+      f"{self.occurrences:,} positions merged into {self.positions:,} distinct, {self.seconds:.2f}s")
+
+def key_width(size: int) -> int:
+  """Bytes used for one bitboard of a board size"""
+  return (size * size + 7) // 8
+
+def _run_dtype(size: int) -> np.dtype:
+  """One position seen in one game, as written while ingesting"""
+  return np.dtype([("hash", "<u8"), ("key", f"V{2 * key_width(size) + 1}"), ("result", "i1"), ("difference", "<i2")])
+
+def _slot_dtype(size: int) -> np.dtype:
+  """One slot of the index. A slot with no games is empty."""
+  return np.dtype([("hash", "<u8"), ("key", f"V{2 * key_width(size) + 1}"), ("games", "<u4"), ("black_wins", "<u4"),
+    ("white_wins", "<u4"), ("draws", "<u4"), ("disc_sum", "<i8")])
+
+def position_key(black: int, white: int, to_move: int, size: int) -> bytes:
+  """Encodes a position the same way for all eight of its symmetric forms
+
+  :param int black: Bitboard of black discs
+  :param int white: Bitboard of white discs
+  :param int to_move: BLACK_TO_MOVE or WHITE_TO_MOVE
+  :param int size: Size of the board
+  :return bytes: Canonical black and white bitboards followed by the side to move
+  """
+  canonical = canonicalize(black, white, size)
+  width = key_width(size)
+  return canonical.black.to_bytes(width, "little") + canonical.white.to_bytes(width, "little") + bytes([to_move])
+
+def key_hash(key: bytes) -> int:
+  """64-bit hash of a position key, the same in every process"""
+  return int.from_bytes(blake2b(key, digest_size=8).digest(), "little")
+
+def game_positions(record: GameRecord) -> tuple[list[bytes], int]:
+  """Replays a game, collecting the key of every position the game passed through
+
+  :param GameRecord record: The game
+  :raises ValueError: If a move isn't legal
+  :return tuple[list[bytes], int]: Keys of every position with its side to move, the final one included once
+    even in older records that kept the passes ending the game, and the final black discs minus white discs
+  """
+  board = Othello(record.size, errors="raise")
+  turn, other = Othello.Color.BLACK, Othello.Color.WHITE
+  to_move = BLACK_TO_MOVE
+  keys = []
+  for number, move in enumerate(finished_moves(record.moves), start=1):
+    keys.append(position_key(*board.bitboards(), to_move, record.size))
+    if move != PASS and board.make_move(move, turn) is None:
+      raise ValueError(f"Move {number}: {turn.name.title()} can't play on square {move}.")
+    turn, other = other, turn
+    to_move ^= 1
+  keys.append(position_key(*board.bitboards(), to_move, record.size))
+  black, white = board.bitboards()
+  return keys, black.bit_count() - white.bit_count()
+
+def _ingest_file(path: str, size: int, run_directory: str, file_number: int, partition_bits: int) -> tuple[int, int, int]:
+  """Streams the games of one record file into per-partition run files. Runs in a worker process.
+
+  :return tuple[int, int, int]: Games ingested, games skipped for their size, and positions written
+  """
+  shift = 64 - partition_bits
+  buffers = [bytearray() for _ in range(1 << partition_bits)]
+
+  def flush(partition: int) -> None:
+    with open(os.path.join(run_directory, f"part-{partition:05d}.{file_number}"), "ab") as f:
+      f.write(buffers[partition])
+    buffers[partition].clear()
+
+  games = skipped = positions = 0
+  for record in read_games(path):
+    if record.size != size:
+      skipped += 1
+      continue
+    keys, difference = game_positions(record)
+    result = (difference > 0) - (difference < 0)
+    games += 1
+    positions += len(keys)
+    for key in keys:
+      hashed = key_hash(key)
+      partition = hashed >> shift
+      buffers[partition] += hashed.to_bytes(8, "little") + key + struct.pack("<bh", result, difference)
+      if len(buffers[partition]) >= FLUSH_BYTES:
+        flush(partition)
+  for partition, buffer in enumerate(buffers):
+    if buffer:
+      flush(partition)
+  return games, skipped, positions
+
+def _build_partition(runs: np.ndarray, size: int) -> tuple[np.ndarray, int]:
+  """Merges the runs of one partition and lays the distinct positions out as a linear probing hash table
+
+  :param np.ndarray runs: Every position seen in this partition, of _run_dtype
+  :param int size: Size of the board
+  :return tuple[np.ndarray, int]: Slots of _slot_dtype, and how many of them keys hash to; probing runs on past those
+  """
+  if len(runs) == 0:
+    return np.zeros(2, dtype=_slot_dtype(size)), 1
+  runs.sort(order=["hash", "key"])
+  starts = np.flatnonzero(np.concatenate(([True], (runs["hash"][1:] != runs["hash"][:-1]) | (runs["key"][1:] != runs["key"][:-1]))))
+  distinct = runs[starts]
+  home_slots = 1
+  while home_slots * LOAD_FACTOR < len(distinct):
+    home_slots <<= 1
+  # Taken in order of home slot, placing each entry at its home slot or just after the previous entry,
+  # whichever is later, is exactly what inserting them one by one with linear probing does.
+  home = (distinct["hash"] & np.uint64(home_slots - 1)).astype(np.int64)
+  order = np.argsort(home, kind="stable")
+  home = home[order]
+  steps = np.arange(len(home))
+  placed = np.maximum.accumulate(home - steps) + steps
+  slots = np.zeros(max(home_slots, int(placed[-1]) + 1) + 1, dtype=_slot_dtype(size)) # one empty slot always ends a probe
+  entries = distinct[order]
+  results = runs["result"]
+  slots["hash"][placed] = entries["hash"]
+  slots["key"][placed] = entries["key"]
+  slots["games"][placed] = np.diff(np.append(starts, len(runs)))[order]
+  slots["black_wins"][placed] = np.add.reduceat((results == 1).astype(np.uint32), starts)[order]
+  slots["white_wins"][placed] = np.add.reduceat((results == -1).astype(np.uint32), starts)[order]
+  slots["draws"][placed] = np.add.reduceat((results == 0).astype(np.uint32), starts)[order]
+  slots["disc_sum"][placed] = np.add.reduceat(runs["difference"].astype(np.int64), starts)[order]
+  return slots, home_slots
+
+def build_database(output: str, record_paths: list[str], size: int=SIZE, workers: int=1,
+    partition_bits: int=PARTITION_BITS, temporary_directory: Union[str, None]=None) -> BuildStats:
+  """Builds a position database from game record files.
+
+  Each record file is streamed by its own worker process, which replays the games and appends
+  every position to a run file for the partition its hash falls in. The partitions are then
+  merged one at a time, so only one partition's positions are ever in memory, and written
+  out as hash tables one after another.
+
+  :param str output: Database file to write
+  :param list[str] record_paths: Game record files written by GameRecordWriter
+  :param int size: Board size to keep; games on other boards are skipped
+  :param int workers: Processes to ingest files with, 0 for one per CPU
+  :param int partition_bits: The index is split into 2 ** partition_bits partitions
+  :param Union[str, None] temporary_directory: Where run files go while building, the system default if None
+  :return BuildStats: What was built
+  """
+  start = perf_counter()
+  workers = workers if workers > 0 else os.cpu_count() or 1
+  run_directory = tempfile.mkdtemp(prefix="othello-positions-", dir=temporary_directory)
+  try:
+    arguments = [(path, size, run_directory, number, partition_bits) for number, path in enumerate(record_paths)]
+    if workers == 1 or len(record_paths) == 1:
+      counts = [_ingest_file(*task) for task in arguments]
+    else:
+      with ProcessPoolExecutor(max_workers=min(workers, len(record_paths))) as executor:
+        counts = list(executor.map(_ingest_file, *zip(*arguments)))
+    games = sum(count[0] for count in counts)
+    skipped = sum(count[1] for count in counts)
+    occurrences = sum(count[2] for count in counts)
+
+    partitions = 1 << partition_bits
+    dtype = _run_dtype(size)
+    directory = []
+    positions = 0
+    with open(output, "wb") as f:
+      f.write(bytes(HEADER.size + partitions * DIRECTORY_ENTRY.size))
+      for partition in range(partitions):
+        paths = glob.glob(os.path.join(run_directory, f"part-{partition:05d}.*"))
+        runs = np.concatenate([np.fromfile(path, dtype=dtype) for path in paths]) if paths else np.zeros(0, dtype=dtype)
+        slots, home_slots = _build_partition(runs, size)
+        directory.append((f.tell(), home_slots, len(slots)))
+        positions += int(np.count_nonzero(slots["games"]))
+        slots.tofile(f)
+        for path in paths:
+          os.remove(path)
+      f.seek(0)
+      f.write(HEADER.pack(MAGIC, VERSION, size, partition_bits, positions, games))
+      for entry in directory:
+        f.write(DIRECTORY_ENTRY.pack(*entry))
+  finally:
+    shutil.rmtree(run_directory, ignore_errors=True)
+  return BuildStats(len(record_paths), games, skipped, positions, occurrences, perf_counter() - start)
+
+class PositionDatabase:
+  """Read-only, memory-mapped position database written by build_database.
+
+  Lookups hash the position's key, find its partition from the top bits of the hash and probe
+  that partition's slots from the home slot given by the low bits. Only the pages touched are
+  read from disk, so the database can be far larger than memory.
+  """
+  path: str
+  size: int
+  positions: int
+  games: int
+
+  def __init__(self, path: str):
+    self.path = path
+    with open(path, "rb") as f:
+      self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+      if len(self._map) < HEADER.size:
+        raise ValueError("Truncated position database header.")
+      magic, version, self.size, self._partition_bits, self.positions, self.games = HEADER.unpack_from(self._map)
+      if magic != MAGIC:
+        raise ValueError("Not a position database, or the file is corrupted.")
+      if version != VERSION:
+        raise ValueError(f"Unsupported position database version: {version}")
+      self._directory = [DIRECTORY_ENTRY.unpack_from(self._map, HEADER.size + i * DIRECTORY_ENTRY.size)
+        for i in range(1 << self._partition_bits)]
+      self._slot = struct.Struct(f"<Q{2 * key_width(self.size) + 1}sIIIIq")
+      offset, _, slots = self._directory[-1]
+      if len(self._map) < offset + slots * self._slot.size:
+        raise ValueError("Truncated position database.")
+    except ValueError:
+      self._map.close()
+      raise
+    self._shift = 64 - self._partition_bits
+
+  def __len__(self) -> int:
+    return self.positions
+
+  def probe(self, key: bytes) -> Union[PositionStats, None]:
+    """Looks up a position by its key
+
+    :param bytes key: Key from position_key
+    :return Union[PositionStats, None]: How the games through it ended, None if no game reached it
+    """
+    hashed = key_hash(key)
+    offset, home_slots, slots = self._directory[hashed >> self._shift]
+    slot = hashed & (home_slots - 1)
+    unpack_from = self._slot.unpack_from
+    size = self._slot.size
+    while slot < slots:
+      stored_hash, stored_key, games, black_wins, white_wins, draws, disc_sum = unpack_from(self._map, offset + slot * size)
+      if games == 0:
+        return None
+      if stored_hash == hashed and stored_key == key:
+        return PositionStats(games, black_wins, white_wins, draws, disc_sum)
+      slot += 1
+    return None
+
+  def lookup(self, board: Othello, color: Othello.Color) -> Union[PositionStats, None]:
+    """Looks up a board, or any rotation or reflection of it
+
+    :param Othello board: The board
+    :param Othello.Color color: Color to move
+    :return Union[PositionStats, None]: How the games through it ended, None if no game reached it
+    """
+    if board.size != self.size:
+      return None
+    to_move = BLACK_TO_MOVE if color == Othello.Color.BLACK else WHITE_TO_MOVE
+    return self.probe(position_key(*board.bitboards(), to_move, self.size))
+
+  def close(self) -> None:
+    self._map.close()
+
+  def __enter__(self) -> "PositionDatabase":
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self.close()
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+  """Parses the command line arguments for building and querying a database
+
+  :param list[str] argv: Arguments, not including the script name
+  :return argparse.Namespace: The parsed arguments
+  """
+  parser = argparse.ArgumentParser(description="Build or query a database of the positions reached in recorded games.")
+  commands = parser.add_subparsers(dest="command", required=True)
+  build = commands.add_parser("build", help="Build a database from game record files")
+  build.add_argument("output", help="Database file to write")
+  build.add_argument("records", nargs="+", help="Game record files")
+  build.add_argument("--size", type=int, default=SIZE, help="Board size to keep")
+  build.add_argument("--workers", type=int, default=1, help="Processes to ingest files with, 0 for one per CPU")
+  build.add_argument("--partition-bits", type=int, default=PARTITION_BITS, help="Split the index into 2 ** bits partitions")
+  build.add_argument("--tmp-dir", default=None, help="Where to keep run files while building")
+  query = commands.add_parser("query", help="Look up the position reached after some moves")
+  query.add_argument("database", help="Database file")
+  query.add_argument("moves", nargs="*", help="Moves from the start, e.g. D3 C3, or pass")
+  return parser.parse_args(argv)
+
+def main(argv: Union[list[str], None]=None) -> None:
+  args = parse_args(sys.argv[1:] if argv is None else argv)
+  if args.command == "build":
+    print(build_database(args.output, args.records, args.size, args.workers, args.partition_bits, args.tmp_dir))
+    return
+  with PositionDatabase(args.database) as database:
+    board = Othello(database.size, errors="raise")
+    turn, other = Othello.Color.BLACK, Othello.Color.WHITE
+    for move in args.moves:
+      if move.lower() != "pass" and board.make_move(move, turn) is None:
+        raise SystemExit(f"Illegal move: {move}")
+      turn, other = other, turn
+    start = perf_counter()
+    stats = database.lookup(board, turn)
+    microseconds = (perf_counter() - start) * 1_000_000
+    print(f"{stats if stats else 'No recorded game reached this position'} ({microseconds:.1f} us)")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,355 @@
+from time import perf_counter
+from typing import NamedTuple, Union
+from Othello.othello import Othello
+
+MOBILITY_ORDER_EMPTIES = 6 # Above this many empties moves are ordered by opponent mobility, below by parity alone
+TABLE_EMPTIES = 6 # Positions with at least this many empties are kept in the transposition table
+SHALLOW_EMPTIES = 5 # At or below this many empties the solver switches to its tight loop
+TIME_CHECK_INTERVAL = 4096 # Nodes between clock checks
+
+class EndgameResult(NamedTuple):
+  """Perfect play result of a position"""
+  move: Union[int, None] # Best move for the side to move, None if they must pass or the game is over
+  score: int # Final disc differential for the side to move
+  empties: int
+  nodes: int
+  seconds: float
+
+  @property
+  def nodes_per_second(self) -> float:
+    return self.nodes / self.seconds if self.seconds > 0 else 0.0
+
+  def __str__(self) -> str:
+    return (f"solved {self.empties} empties, score {self.score:+d}, {self.nodes:,} nodes in {self.seconds:.2f}s "
+      f"({self.nodes_per_second:,.0f} nodes/s)")
+
+class _Tables:
+  """Bitboard lookup tables for one board size"""
+  _cache: dict[int, "_Tables"] = {}
+
+  up_rays: tuple[tuple[tuple[int, int], ...], ...] # (first square, mask) of the rays from each square towards higher bits
+  down_rays: tuple[tuple[tuple[int, int], ...], ...] # (first square, mask) of the rays from each square towards lower bits
+  around: tuple[int, ...] # Mask of the squares touching each square
+  region: tuple[int, ...] # Quadrant of each square, used for parity
+  corners: int
+
+  def __init__(self, board: Othello):
+    geometry = board._geometry
+    up_rays = []
+    down_rays = []
+    for square, rays in enumerate(geometry.rays):
+      up = []
+      down = []
+      for ray in rays:
+        (up if ray[0] > 1 << square else down).append((ray[0], sum(ray)))
+      up_rays.append(tuple(up))
+      down_rays.append(tuple(down))
+    self.up_rays = tuple(up_rays)
+    self.down_rays = tuple(down_rays)
+    self.around = geometry.around
+    half = board.size // 2
+    self.region = tuple((square // board.size >= half) * 2 + (square % board.size >= half)
+      for square in range(board.size * board.size))
+    last = board.size - 1
+    self.corners = sum(1 << (row * board.size + column) for row in (0, last) for column in (0, last))
+
+  @classmethod
+  def for_board(cls, board: Othello) -> "_Tables":
+    tables = cls._cache.get(board.size)
+    if tables is None:
+      tables = cls._cache[board.size] = cls(board)
+    return tables
+
+class EndgameSolver:
+  """Exact alpha-beta solver for the end of the game.
+
+  Works on bare bitboards rather than the board's make/unmake, so the search allocates
+  nothing per node beyond a few ints. Flips are found with one mask operation per ray
+  instead of walking the ray. Moves are ordered by the opponent's resulting mobility
+  (fastest first) while the position is large, then by quadrant parity; the last few
+  empties are solved by a tight loop over the empty squares with no move generation.
+  """
+  nodes: int
+  table: dict[tuple[int, int], tuple[int, int, int]] # (player, opponent) -> (lower bound, upper bound, best move)
+
+  def __init__(self):
+    self.nodes = 0
+    self.table = {}
+    self._deadline = None
+
+  def solve(self, board: Othello, color: Othello.Color, time_limit: Union[float, None]=None) -> EndgameResult:
+    """Finds the perfect play result and best move of a position
+
+    :param Othello board: Position to solve, left untouched
+    :param Othello.Color color: Color to move
+    :param Union[float, None] time_limit: Seconds to give up after, no limit if None
+    :raises TimeoutError: If the time limit runs out before the position is solved
+    :return EndgameResult: Best move, final disc differential for the color to move, and search stats
+    """
+    start = perf_counter()
+    self.nodes = 0
+    self.table = {}
+    self._deadline = None if time_limit is None else start + time_limit
+    self._tables = _Tables.for_board(board)
+    self._up_rays = self._tables.up_rays
+    self._down_rays = self._tables.down_rays
+    self._legal_mask = board.legal_mask
+
+    black, white = board.bitboards()
+    player, opponent = (black, white) if color == Othello.Color.BLACK else (white, black)
+    empties = board._geometry.full & ~(black | white)
+    count = empties.bit_count()
+    score, move = self._root(player, opponent, empties, count)
+    return EndgameResult(move, score, count, self.nodes, perf_counter() - start)
+
+  def _flips(self, square: int, player: int, opponent: int) -> int:
+    """Returns the discs a move would flip, 0 if it isn't legal"""
+    # The nearest square along the ray that isn't an opponent disc must be the player's own
+    flips = 0
+    for first, mask in self._up_rays[square]:
+      if opponent & first:
+        blockers = mask & ~opponent
+        nearest = blockers & -blockers
+        if nearest & player:
+          flips |= mask & (nearest - 1)
+    for first, mask in self._down_rays[square]:
+      if opponent & first:
+        blockers = mask & ~opponent
+        if blockers:
+          nearest = 1 << (blockers.bit_length() - 1)
+          if nearest & player:
+            flips |= mask & -(nearest << 1)
+    return flips
+
+  def _moves(self, player: int, opponent: int, empties: int) -> list[tuple[int, int]]:
+    """Returns (square, flips) for every legal move"""
+    moves = []
+    around = self._tables.around
+    candidates = empties
+    while candidates:
+      low = candidates & -candidates
+      candidates ^= low
+      square = low.bit_length() - 1
+      if around[square] & opponent:
+        flips = self._flips(square, player, opponent)
+        if flips:
+          moves.append((square, flips))
+    return moves
+
+  def _ordered(self, moves: list[tuple[int, int]], player: int, opponent: int, empties: int, count: int) -> list[tuple[int, int]]:
+    """Sorts moves so the ones most likely to cut off come first"""
+    tables = self._tables
+    odd_regions = self._odd_regions(empties)
+    if count > MOBILITY_ORDER_EMPTIES:
+      legal_mask = self._legal_mask
+      corners = tables.corners
+      def key(move: tuple[int, int]) -> int:
+        square, flips = move
+        placed = flips | (1 << square)
+        mobility = legal_mask(opponent ^ flips, player | placed)
+        # Fewer replies is better; corners and odd regions break ties
+        return mobility.bit_count() * 4 - (corners >> square & 1) * 2 - (odd_regions >> tables.region[square] & 1)
+    else:
+      def key(move: tuple[int, int]) -> int:
+        return -(odd_regions >> tables.region[move[0]] & 1)
+    moves.sort(key=key)
+    return moves
+
+  def _odd_regions(self, empties: int) -> int:
+    """Returns a bit per quadrant holding an odd number of empty squares"""
+    region = self._tables.region
+    odd = 0
+    while empties:
+      low = empties & -empties
+      empties ^= low
+      odd ^= 1 << region[low.bit_length() - 1]
+    return odd
+
+  def _tick(self) -> None:
+    self.nodes += 1
+    if self._deadline is not None and self.nodes % TIME_CHECK_INTERVAL == 0 and perf_counter() > self._deadline:
+      raise TimeoutError("Ran out of time solving the endgame.")
+
+  def _root(self, player: int, opponent: int, empties: int, count: int) -> tuple[int, Union[int, None]]:
+    self._tick()
+    moves = self._moves(player, opponent, empties)
+    if not moves:
+      if self._moves(opponent, player, empties):
+        beta = (player | opponent | empties).bit_count() + 1
+        return -self._search(opponent, player, empties, count, -beta, beta, False), None
+      return player.bit_count() - opponent.bit_count(), None
+    best_score = None
+    best_move = None
+    beta = (player | opponent | empties).bit_count() + 1
+    for square, flips in self._ordered(moves, player, opponent, empties, count):
+      child = (opponent ^ flips, player | flips | (1 << square), empties ^ (1 << square), count - 1)
+      if best_score is None:
+        score = -self._search(*child, -beta, beta, False)
+      else:
+        # Only prove the other moves are no better, and search exactly only when one is
+        score = -self._search(*child, -best_score - 1, -best_score, False)
+        if score > best_score:
+          score = -self._search(*child, -beta, -score, False)
+      if best_score is None or score > best_score:
+        best_score, best_move = score, square
+    return best_score, best_move
+
+  def _search(self, player: int, opponent: int, empties: int, count: int, alpha: int, beta: int, passed: bool) -> int:
+    """Negamax with principal variation search, the transposition table and move ordering
+
+    :return int: Final disc differential for the player, exact when it lies strictly between alpha and beta
+    """
+    if count <= SHALLOW_EMPTIES:
+      return self._shallow(player, opponent, empties, count, alpha, beta, passed, self._odd_regions(empties))
+    self._tick()
+
+    key = None
+    best_move = -1
+    if count >= TABLE_EMPTIES:
+      key = (player, opponent)
+      entry = self.table.get(key)
+      if entry is not None:
+        lower, upper, best_move = entry
+        if lower >= beta:
+          return lower
+        if upper <= alpha:
+          return upper
+        if lower == upper:
+          return lower
+        alpha = max(alpha, lower)
+        beta = min(beta, upper)
+
+    moves = self._moves(player, opponent, empties)
+    if not moves:
+      if passed:
+        return player.bit_count() - opponent.bit_count()
+      return -self._search(opponent, player, empties, count, -beta, -alpha, True)
+
+    moves = self._ordered(moves, player, opponent, empties, count)
+    if best_move >= 0:
+      for i, (square, _) in enumerate(moves):
+        if square == best_move:
+          moves.insert(0, moves.pop(i))
+          break
+
+    original_alpha = alpha
+    best_score = -1 << 30
+    first = True
+    for square, flips in moves:
+      placed = flips | (1 << square)
+      child = (opponent ^ flips, player | placed, empties ^ (1 << square), count - 1)
+      if first:
+        score = -self._search(*child, -beta, -alpha, False)
+        first = False
+      else:
+        score = -self._search(*child, -alpha - 1, -alpha, False)
+        if alpha < score < beta:
+          score = -self._search(*child, -beta, -score, False)
+      if score > best_score:
+        best_score = score
+        best_move = square
+        if score > alpha:
+          alpha = score
+          if alpha >= beta:
+            break
+
+    if key is not None:
+      lower, upper = -1 << 30, 1 << 30
+      if best_score <= original_alpha:
+        upper = best_score
+      elif best_score >= beta:
+        lower = best_score
+      else:
+        lower = upper = best_score
+      self.table[key] = (lower, upper, best_move)
+    return best_score
+
+  def _shallow(self, player: int, opponent: int, empties: int, count: int, alpha: int, beta: int, passed: bool,
+      odd_regions: int) -> int:
+    """Tight loop for the last few empties: plain alpha-beta over the empty squares, odd quadrants first.
+    The quadrant parity is passed down and updated per move rather than recounted.
+    """
+    self.nodes += 1
+    if count == 2:
+      return self._last_two(player, opponent, empties, alpha, beta, passed)
+    if count == 1:
+      return self._last(player, opponent, empties.bit_length() - 1)
+
+    tables = self._tables
+    region = tables.region
+    around = tables.around
+    squares = []
+    even = []
+    candidates = empties
+    while candidates:
+      low = candidates & -candidates
+      candidates ^= low
+      square = low.bit_length() - 1
+      (squares if odd_regions >> region[square] & 1 else even).append(square)
+    squares += even
+
+    best_score = -1 << 30
+    for square in squares:
+      if not around[square] & opponent:
+        continue
+      flips = self._flips(square, player, opponent)
+      if not flips:
+        continue
+      bit = 1 << square
+      score = -self._shallow(opponent ^ flips, player | flips | bit, empties ^ bit, count - 1, -beta, -alpha, False,
+        odd_regions ^ 1 << region[square])
+      if score > best_score:
+        best_score = score
+        if score > alpha:
+          alpha = score
+          if alpha >= beta:
+            return best_score
+
+    if best_score == -1 << 30:
+      if passed:
+        return player.bit_count() - opponent.bit_count()
+      return -self._shallow(opponent, player, empties, count, -beta, -alpha, True, odd_regions)
+    return best_score
+
+  def _last_two(self, player: int, opponent: int, empties: int, alpha: int, beta: int, passed: bool) -> int:
+    """Solves two empty squares without recursing through the general loop"""
+    first = empties.bit_length() - 1
+    second = (empties & -empties).bit_length() - 1
+    around = self._tables.around
+    best_score = -1 << 30
+    for square, other in ((first, second), (second, first)):
+      flips = around[square] & opponent and self._flips(square, player, opponent)
+      if flips:
+        self.nodes += 1
+        score = -self._last(opponent ^ flips, player | flips | (1 << square), other)
+        if score > best_score:
+          best_score = score
+          if score >= beta:
+            return best_score
+    if best_score == -1 << 30:
+      if passed:
+        return player.bit_count() - opponent.bit_count()
+      return -self._last_two(opponent, player, empties, -beta, -alpha, True)
+    return best_score
+
+  def _last(self, player: int, opponent: int, square: int) -> int:
+    """Scores the final empty square directly"""
+    score = player.bit_count() - opponent.bit_count()
+    flips = self._flips(square, player, opponent)
+    if flips:
+      return score + 2 * flips.bit_count() + 1
+    flips = self._flips(square, opponent, player)
+    if flips:
+      return score - 2 * flips.bit_count() - 1
+    return score
+
+def solve(board: Othello, color: Othello.Color, time_limit: Union[float, None]=None) -> EndgameResult:
+  """Solves a position exactly with a fresh solver
+
+  :param Othello board: Position to solve, left untouched
+  :param Othello.Color color: Color to move
+  :param Union[float, None] time_limit: Seconds to give up after, no limit if None
+  :raises TimeoutError: If the time limit runs out before the position is solved
+  :return EndgameResult: Best move, final disc differential for the color to move, and search stats
+  """
+  return EndgameSolver().solve(board, color, time_limit)
@@ -0,0 +1,190 @@
+import argparse
+import inspect
+import sys
+from typing import TextIO, Union
+from Othello.othello import Othello, MoveDelta, OthelloError, SIZE
+from Othello.ai import make_player
+from Othello.tournament import parse_player_spec
+
+DEFAULT_PLAYER = "alphabeta:1"
+PASS = "pass"
+
+# Characters used for the board command, so bots don't have to read the emoji discs
+BOARD_CHARACTERS = {Othello.Color.BLACK.value: "X", Othello.Color.WHITE.value: "O"}
+EMPTY_CHARACTER = "."
+
+COLOR_NAMES = {
+  "b": Othello.Color.BLACK,
+  "black": Othello.Color.BLACK,
+  "w": Othello.Color.WHITE,
+  "white": Othello.Color.WHITE,
+}
+
+class ProtocolError(Exception):
+  """A command that can't be carried out, reported to the controller as a failure response"""
+
+class Engine:
+  """Line-based text protocol around a board and a computer player, for driving an engine from another process.
+
+  Each command is one line; each response starts with "=" on success or "?" on failure,
+  followed by the result, and ends with an empty line:
+
+    newgame [size]           start a new game, on a board of the given size
+    play <color> <square>    play a move for either color, or "pass" if it has no valid move
+    genmove <color>          let the engine choose, play and print a move for a color
+    undo                     take back the last move or pass
+    board                    print the board, one row per line from row 1 (the first on the "=" line),
+                             X for black, O for white, . for empty
+    valid <color>            list the valid moves of a color
+    score                    print the disc counts of black and white
+    quit                     stop reading commands
+
+  The board runs with errors="raise", so invalid input never prints anything of its own.
+  """
+  player_spec: str
+  board: Othello
+  history: list[tuple[Othello.Color, Union[MoveDelta, None]]] # Every move and pass, None for a pass
+  running: bool # False once quit has been received
+
+  def __init__(self, player_spec: str=DEFAULT_PLAYER, size: int=SIZE, seed: Union[int, None]=None):
+    name, time_limit = parse_player_spec(player_spec)
+    self.player_spec = player_spec
+    self._player = make_player(name, time_limit, seed, size)
+    self.board = Othello(size, errors="raise")
+    self.history = []
+    self.running = True
+
+  def handle(self, line: str) -> str:
+    """Runs one command
+
+    :param str line: The command line, without its line ending
+    :return str: The full response, including the empty line that ends it. Blank lines get no response.
+    """
+    words = line.split()
+    if not words:
+      return ""
+    command, arguments = words[0].lower(), words[1:]
+    handler = getattr(self, f"_command_{command}", None)
+    if handler is None:
+      return f"? unknown command: {command}\n\n"
+    try:
+      inspect.signature(handler).bind(*arguments)
+    except TypeError:
+      return f"? wrong number of arguments for {command}\n\n"
+    try:
+      result = handler(*arguments)
+    except (ProtocolError, OthelloError) as error:
+      return f"? {error}\n\n"
+    return f"= {result}\n\n" if result else "=\n\n"
+
+  def run(self, input_stream: TextIO=sys.stdin, output_stream: TextIO=sys.stdout) -> None:
+    """Reads commands until quit or the end of the input, flushing after every response
+
+    :param TextIO input_stream: Where commands come from
+    :param TextIO output_stream: Where responses go
+    """
+    for line in input_stream:
+      response = self.handle(line.strip())
+      if response:
+        output_stream.write(response)
+        output_stream.flush()
+      if not self.running:
+        break
+    self.close()
+
+  def close(self) -> None:
+    if hasattr(self._player, "close"):
+      self._player.close()
+
+  def _color(self, name: str) -> Othello.Color:
+    color = COLOR_NAMES.get(name.lower())
+    if color is None:
+      raise ProtocolError(f"invalid color: {name}")
+    return color
+
+  def _command_newgame(self, size: Union[str, None]=None) -> str:
+    new_size = self.board.size
+    if size is not None:
+      try:
+        new_size = int(size)
+      except ValueError:
+        raise ProtocolError(f"invalid size: {size}")
+    board = Othello(new_size, errors="raise")
+    if hasattr(self._player, "prepare"):
+      try:
+        self._player.prepare(new_size)
+      except FileNotFoundError as error:
+        raise ProtocolError(str(error))
+    self.board = board
+    self.history = []
+    return ""
+
+  def _command_play(self, color_name: str, square: str) -> str:
+    color = self._color(color_name)
+    if square.lower() == PASS:
+      if self.board.any_valid_move(color):
+        raise ProtocolError("illegal pass, a valid move is available")
+      self.history.append((color, None))
+      return ""
+    self.board.get_square(square) # raises if the square isn't on the board
+    delta = self.board.make_move(square, color)
+    if delta is None:
+      raise ProtocolError(f"illegal move: {square}")
+    self.history.append((color, delta))
+    return ""
+
+  def _command_genmove(self, color_name: str) -> str:
+    color = self._color(color_name)
+    square = self._player.choose_move(self.board, color)
+    if square is None:
+      self.history.append((color, None))
+      return PASS
+    self.history.append((color, self.board.make_move(square, color)))
+    return square
+
+  def _command_undo(self) -> str:
+    if not self.history:
+      raise ProtocolError("no moves to undo")
+    _, delta = self.history.pop()
+    if delta is not None:
+      self.board.unmake_move(delta)
+    return ""
+
+  def _command_board(self) -> str:
+    rows = []
+    for row in range(1, self.board.size + 1):
+      rows.append("".join(BOARD_CHARACTERS.get(value, EMPTY_CHARACTER) for value in self.board.get_row(row)))
+    return "\n".join(rows)
+
+  def _command_valid(self, color_name: str) -> str:
+    return " ".join(self.board.all_valid_moves(self._color(color_name))[1])
+
+  def _command_score(self) -> str:
+    return f"{self.board.count_discs(Othello.Color.BLACK)} {self.board.count_discs(Othello.Color.WHITE)}"
+
+  def _command_quit(self) -> str:
+    self.running = False
+    return ""
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+  """Parses the command line arguments for the engine
+
+  :param list[str] argv: Arguments, not including the script name
+  :return argparse.Namespace: The parsed arguments
+  """
+  parser = argparse.ArgumentParser(description="Run an Othello engine speaking a line-based protocol on stdin and stdout.")
+  parser.add_argument("--player", default=DEFAULT_PLAYER, help="Player spec used by genmove, name[:seconds per move]")
+  parser.add_argument("--size", type=int, default=SIZE, help="Board size of the first game")
+  parser.add_argument("--seed", type=int, default=None, help="Seed for players that make random choices")
+  return parser.parse_args(argv)
+
+def main(argv: Union[list[str], None]=None) -> None:
+  args = parse_args(sys.argv[1:] if argv is None else argv)
+  try:
+    engine = Engine(args.player, args.size, args.seed)
+  except (ValueError, OthelloError, FileNotFoundError) as error:
+    raise SystemExit(str(error))
+  engine.run()
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,114 @@
+import cProfile
+import functools
+import pstats
+import sys
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Iterator, NamedTuple, TextIO
+from Othello.othello import Othello
+
+# Methods of Othello that are timed while instrumentation is on
+INSTRUMENTED_METHODS = (
+  "check_move",
+  "get_next_space",
+  "update_board_table",
+  "all_valid_moves",
+  "make_move",
+  "unmake_move",
+)
+PROFILE_LINES = 20 # Functions listed when a profile is printed
+
+class CallStats(NamedTuple):
+  """Totals for one instrumented method"""
+  calls: int
+  seconds: float # Wall time inside the method, including anything it calls
+
+  @property
+  def microseconds_per_call(self) -> float:
+    return self.seconds * 1_000_000 / self.calls if self.calls else 0.0
+
+# name -> [calls, seconds]
+_totals: dict[str, list] = {}
+# name -> the method as it was before instrumentation wrapped it
+_originals: dict[str, Callable] = {}
+
+def _timed(name: str, method: Callable) -> Callable:
+  totals = _totals.setdefault(name, [0, 0.0])
+
+  @functools.wraps(method)
+  def wrapper(*args, **kwargs):
+    start = perf_counter()
+    try:
+      return method(*args, **kwargs)
+    finally:
+      totals[0] += 1
+      totals[1] += perf_counter() - start
+  return wrapper
+
+def enable(methods: tuple[str, ...]=INSTRUMENTED_METHODS) -> None:
+  """Starts counting calls and time for the given Othello methods, on every board.
+
+  The methods are swapped for timing wrappers on the class, so when instrumentation is off
+  the engine runs its plain methods and pays nothing at all.
+
+  :param tuple[str, ...] methods: Names of the methods to time
+  """
+  for name in methods:
+    if name in _originals:
+      continue
+    _originals[name] = getattr(Othello, name)
+    setattr(Othello, name, _timed(name, _originals[name]))
+
+def disable() -> None:
+  """Puts the plain methods back. The totals are kept until reset is called.
+  """
+  for name, method in _originals.items():
+    setattr(Othello, name, method)
+  _originals.clear()
+
+def is_enabled() -> bool:
+  return bool(_originals)
+
+def reset() -> None:
+  """Zeroes every total
+  """
+  for totals in _totals.values():
+    totals[0] = 0
+    totals[1] = 0.0
+
+def stats() -> dict[str, CallStats]:
+  """Returns the totals so far, for every method that has been instrumented
+
+  :return dict[str, CallStats]: Calls and time per method name
+  """
+  return {name: CallStats(calls, seconds) for name, (calls, seconds) in _totals.items()}
+
+def print_stats(stream: TextIO=sys.stdout) -> None:
+  """Prints the totals as a table, the most expensive method first
+
+  :param TextIO stream: Where to print
+  """
+  rows = sorted(stats().items(), key=lambda item: item[1].seconds, reverse=True)
+  print(f"{'method':<20} {'calls':>10} {'seconds':>9} {'us/call':>9}", file=stream)
+  for name, totals in rows:
+    print(f"{name:<20} {totals.calls:>10,} {totals.seconds:>9.3f} {totals.microseconds_per_call:>9.1f}", file=stream)
+
+@contextmanager
+def profile_session(path: str, lines: int=PROFILE_LINES, stream: TextIO=sys.stdout) -> Iterator[cProfile.Profile]:
+  """Profiles everything run inside the block with cProfile, then saves the raw stats and prints a summary.
+  The saved file can be loaded again with pstats.Stats(path) or a viewer such as snakeviz.
+
+  :param str path: File to save the profile to
+  :param int lines: Functions to list in the summary, sorted by cumulative time, 0 for none
+  :param TextIO stream: Where to print the summary
+  :return Iterator[cProfile.Profile]: The running profiler
+  """
+  profiler = cProfile.Profile()
+  profiler.enable()
+  try:
+    yield profiler
+  finally:
+    profiler.disable()
+    profiler.dump_stats(path)
+    if lines > 0:
+      pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(lines)
@@ -0,0 +1,239 @@
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import NamedTuple, Union
+from Othello.othello import Othello
+from Othello.records import PASS
+
+DEFAULT_TIME_LIMIT = 1.0 # Seconds per move when no playout count is given
+EXPLORATION = 1.4 # UCT exploration constant
+TIME_CHECK_INTERVAL = 16 # Playouts between clock checks
+
+COLORS = (Othello.Color.BLACK, Othello.Color.WHITE)
+
+class MCTSStats(NamedTuple):
+  """Summary of the search behind a single move"""
+  playouts: int
+  seconds: float
+  best_visits: int # Visits of the chosen move, summed over workers
+  workers: int
+
+  @property
+  def playouts_per_second(self) -> float:
+    return self.playouts / self.seconds if self.seconds > 0 else 0.0
+
+  def __str__(self) -> str:
+    return (f"{self.playouts:,} playouts in {self.seconds:.2f}s ({self.playouts_per_second:,.0f} playouts/s) "
+      f"on {self.workers} worker(s), chosen move visited {self.best_visits:,} times")
+
+class _Node:
+  """One position in the search tree"""
+  __slots__ = ("move", "player", "parent", "children", "untried", "visits", "wins")
+
+  def __init__(self, move: int, player: int, parent: Union["_Node", None], untried: list[int]):
+    self.move = move # Move that led here, PASS for a skipped turn
+    self.player = player # Index in COLORS of the side to move here
+    self.parent = parent
+    self.children: list["_Node"] = []
+    self.untried = untried # Moves not expanded yet, [PASS] if the side to move must skip
+    self.visits = 0
+    self.wins = 0.0 # From the point of view of the player who made self.move
+
+def _moves_of(board: Othello, player: int) -> list[int]:
+  """Returns the valid moves of a player, [PASS] if they must skip, or [] if the game is over
+  """
+  mask = board.valid_moves_mask(COLORS[player])
+  if not mask:
+    return [PASS] if board.valid_moves_mask(COLORS[1 - player]) else []
+  moves = []
+  while mask:
+    low = mask & -mask
+    moves.append(low.bit_length() - 1)
+    mask ^= low
+  return moves
+
+def _corner_mask(size: int) -> int:
+  last = size - 1
+  return sum(1 << (row * size + column) for row in (0, last) for column in (0, last))
+
+def search(board: Othello, color: Othello.Color, playouts: Union[int, None]=None, time_limit: float=DEFAULT_TIME_LIMIT,
+    exploration: float=EXPLORATION, guided: bool=True, seed: Union[int, None]=None) -> tuple[dict[int, int], int]:
+  """Runs UCT Monte Carlo tree search from a position
+
+  :param Othello board: Position to search. It is left exactly as it was found.
+  :param Othello.Color color: Color to move
+  :param Union[int, None] playouts: Number of playouts to run. If None, search until the time runs out.
+  :param float time_limit: Seconds to search for when no playout count is given. At least one playout is run
+    even when the time is already up, so there is always a move to pick.
+  :param float exploration: UCT exploration constant
+  :param bool guided: Whether rollouts always take a corner when one is available, instead of moving purely at random
+  :param Union[int, None] seed: Seed for the rollouts
+  :return tuple[dict[int, int], int]: Visits of each root move, and the number of playouts run
+  """
+  generator = random.Random(seed)
+  corners = _corner_mask(board.size) if guided else 0
+  root_player = COLORS.index(color)
+  root = _Node(PASS, root_player, None, _moves_of(board, root_player))
+  if not root.untried or root.untried == [PASS]:
+    return {}, 0
+
+  full = (1 << (board.size * board.size)) - 1
+  adjacent = board.adjacent_mask
+  flip_mask = board.flip_mask
+  deadline = perf_counter() + time_limit
+  done = 0
+  while (done < playouts) if playouts is not None else (not done or done % TIME_CHECK_INTERVAL or perf_counter() < deadline):
+    node = root
+    deltas = []
+
+    # Selection: follow UCT through fully expanded nodes
+    while not node.untried and node.children:
+      log_visits = math.log(node.visits)
+      node = max(node.children, key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits))
+      if node.move != PASS:
+        deltas.append(board.make_move(node.move, COLORS[1 - node.player]))
+
+    # Expansion: add one untried move
+    if node.untried:
+      move = node.untried.pop(generator.randrange(len(node.untried)))
+      if move != PASS:
+        deltas.append(board.make_move(move, COLORS[node.player]))
+      child_player = 1 - node.player
+      child = _Node(move, child_player, node, _moves_of(board, child_player))
+      node.children.append(child)
+      node = child
+
+    # Rollout: play random moves to the end of the game on bare bitboards, skipping the board's undo and caches
+    discs = list(board.bitboards())
+    for delta in reversed(deltas):
+      board.unmake_move(delta)
+    player = node.player
+    passes = 0
+    while passes < 2:
+      mine = discs[player]
+      theirs = discs[1 - player]
+      # Try random squares next to an opponent disc until one flips something, corners first,
+      # which is cheaper than generating every legal move on each turn
+      candidates = full & ~(mine | theirs) & adjacent(theirs)
+      flips = 0
+      while candidates and not flips:
+        pool = candidates & corners or candidates
+        for _ in range(generator.randrange(pool.bit_count())):
+          pool &= pool - 1
+        low = pool & -pool
+        candidates ^= low
+        flips = flip_mask(low.bit_length() - 1, mine, theirs)
+      if flips:
+        passes = 0
+        discs[player] = mine | flips | low
+        discs[1 - player] = theirs ^ flips
+      else:
+        passes += 1
+      player = 1 - player
+    difference = discs[0].bit_count() - discs[1].bit_count()
+
+    # Backpropagation, scoring each node for the player who moved into it
+    black_result = 1.0 if difference > 0 else 0.0 if difference < 0 else 0.5
+    while node is not None:
+      node.visits += 1
+      mover = 1 - node.player
+      node.wins += black_result if mover == 0 else 1.0 - black_result
+      node = node.parent
+    done += 1
+
+  return {child.move: child.visits for child in root.children}, done
+
+def _search_worker(size: int, black: int, white: int, color_index: int, playouts: Union[int, None],
+    time_limit: float, exploration: float, guided: bool, seed: Union[int, None]) -> tuple[dict[int, int], int]:
+  """Runs search in a worker process, rebuilding the position from bitboards"""
+  board = Othello.from_bitboards(black, white, size)
+  return search(board, COLORS[color_index], playouts, time_limit, exploration, guided, seed)
+
+class MCTSPlayer:
+  """Computer player using Monte Carlo tree search, optionally root-parallel across worker processes.
+
+  Each worker grows its own tree from the current position and the visit counts of the
+  root moves are summed; the most visited move is played.
+  """
+  name = "mcts"
+
+  time_limit: float
+  playouts: Union[int, None]
+  workers: int
+  last_stats: Union[MCTSStats, None]
+
+  def __init__(self, time_limit: float=DEFAULT_TIME_LIMIT, playouts: Union[int, None]=None, workers: int=1,
+      exploration: float=EXPLORATION, guided: bool=True, seed: Union[int, None]=None):
+    if playouts is not None and playouts < 1:
+      raise ValueError(f"An MCTS player needs at least one playout per move, not {playouts}")
+    self.time_limit = time_limit
+    self.playouts = playouts
+    self.workers = workers if workers > 0 else os.cpu_count() or 1
+    self.exploration = exploration
+    self.guided = guided
+    self.last_stats = None
+    self._random = random.Random(seed)
+    self._executor: Union[ProcessPoolExecutor, None] = None
+
+  def seed(self, seed: Union[int, None]) -> None:
+    """Reseeds the player's random number generator
+
+    :param Union[int, None] seed: New seed
+    """
+    self._random.seed(seed)
+
+  def choose_move(self, board: Othello, color: Othello.Color) -> Union[str, None]:
+    """Searches the position and returns the most visited move
+
+    :param Othello board: Board to move on. It is left exactly as it was found.
+    :param Othello.Color color: Color to move
+    :return Union[str, None]: Square to play, or None if the color has no valid move
+    """
+    start = perf_counter()
+    moves = board.valid_moves_mask(color)
+    if not moves:
+      self.last_stats = MCTSStats(0, perf_counter() - start, 0, 0)
+      return None
+    if moves & (moves - 1) == 0: # only one move, nothing to search
+      self.last_stats = MCTSStats(0, perf_counter() - start, 0, 0)
+      return board.square_name(moves.bit_length() - 1)
+
+    seeds = [self._random.getrandbits(32) for _ in range(self.workers)]
+    if self.workers == 1:
+      results = [search(board, color, self.playouts, self.time_limit, self.exploration, self.guided, seeds[0])]
+    else:
+      results = self._search_in_workers(board, color, seeds)
+
+    visits: dict[int, int] = {}
+    playouts = 0
+    for worker_visits, worker_playouts in results:
+      playouts += worker_playouts
+      for move, count in worker_visits.items():
+        visits[move] = visits.get(move, 0) + count
+    best_move = max(visits, key=visits.__getitem__)
+    self.last_stats = MCTSStats(playouts, perf_counter() - start, visits[best_move], self.workers)
+    return board.square_name(best_move)
+
+  def _search_in_workers(self, board: Othello, color: Othello.Color, seeds: list[int]) -> list[tuple[dict[int, int], int]]:
+    """Runs one independent search per worker process on the same position"""
+    if self._executor is None:
+      self._executor = ProcessPoolExecutor(max_workers=self.workers)
+    black, white = board.bitboards()
+    playouts = None
+    if self.playouts is not None:
+      playouts = -(-self.playouts // self.workers) # split the playouts, rounding up
+    futures = [
+      self._executor.submit(_search_worker, board.size, black, white, COLORS.index(color), playouts,
+        self.time_limit, self.exploration, self.guided, seed)
+      for seed in seeds
+    ]
+    return [future.result() for future in futures]
+
+  def close(self) -> None:
+    """Shuts down the worker processes, if any were started
+    """
+    if self._executor is not None:
+      self._executor.shutdown()
+      self._executor = None
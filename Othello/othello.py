@@ -1,50 +1,517 @@
 # import sys
+import random
 from enum import Enum
-from prettytable import PrettyTable
-from typing import Union
+from typing import TYPE_CHECKING, NamedTuple, Union
+from Othello.position import Position
+
+if TYPE_CHECKING:
+  from prettytable import PrettyTable # Only needed once a board is printed, so it's imported then
 
 SIZE = 8
 DEFAULT = " "
 
+# How a board reacts to invalid input: print a message and return a sentinel (the original
+# terminal behavior), return the sentinel silently, or raise one of the errors below
+ERROR_MODES = ("print", "ignore", "raise")
+
+# (row step, column step) for each of the eight directions, in the order check_move walks them
+DIRECTION_STEPS = {
+  "left": (0, -1),
+  "right": (0, 1),
+  "up": (-1, 0),
+  "down": (1, 0),
+  "upleft": (-1, -1),
+  "upright": (-1, 1),
+  "downleft": (1, -1),
+  "downright": (1, 1),
+}
+
+class _Geometry:
+  """Lookup tables for one board size, built once and shared by every board of that size.
+
+  Squares are numbered row by row, so square ``A1`` is bit 0, ``B1`` is bit 1 and the
+  last square is bit ``size * size - 1``. On an 8x8 board the bitboards fit in a
+  native 64-bit integer; larger boards fall back to Python's arbitrary precision ints.
+  """
+  _cache: dict[int, "_Geometry"] = {}
+
+  size: int
+  full: int # Mask with a bit set for every square on the board
+  keys: tuple[str, ...] # Square names indexed by bit position
+  index: dict[str, int] # Bit position of each square name
+  up_shifts: tuple[tuple[int, int], ...] # (shift, mask) pairs for directions that shift left
+  down_shifts: tuple[tuple[int, int], ...] # (shift, mask) pairs for directions that shift right
+  neighbors: dict[tuple[int, int], tuple[int, ...]] # Neighbor of each square per (row step, column step), -1 off the board
+  rays: tuple[tuple[tuple[int, ...], ...], ...] # Bits walking outwards from each square, only rays long enough to flank
+  around: tuple[int, ...] # Mask of the squares touching each square
+  lines: tuple[int, ...] # Mask of each square plus every square sharing a row, column or diagonal with it
+  zobrist: tuple[tuple[int, ...], tuple[int, ...]] # Random 64-bit key per color per square, indexed like Othello._discs
+  zobrist_flip: tuple[int, ...] # Both colors' keys XORed together, for turning a disc over
+  zobrist_white_to_move: int # XORed in when white is to move
+
+  def __init__(self, size: int):
+    self.size = size
+    self.full = (1 << (size * size)) - 1
+    self.keys = tuple(f"{chr(65 + column)}{row + 1}" for row in range(size) for column in range(size))
+    self.index = {key: i for i, key in enumerate(self.keys)}
+
+    first_column = 0
+    last_column = 0
+    for row in range(size):
+      first_column |= 1 << (row * size)
+      last_column |= 1 << (row * size + size - 1)
+
+    up_shifts = []
+    down_shifts = []
+    for row_step in (-1, 0, 1):
+      for column_step in (-1, 0, 1):
+        if row_step == 0 and column_step == 0:
+          continue
+        # Moving right can only land in the first column by wrapping around a row, and vice versa
+        mask = self.full
+        if column_step == 1:
+          mask &= ~first_column
+        elif column_step == -1:
+          mask &= ~last_column
+        shift = row_step * size + column_step
+        if shift > 0:
+          up_shifts.append((shift, mask))
+        else:
+          down_shifts.append((-shift, mask))
+    self.up_shifts = tuple(up_shifts)
+    self.down_shifts = tuple(down_shifts)
+
+    self.neighbors = {}
+    for step in DIRECTION_STEPS.values():
+      row_step, column_step = step
+      self.neighbors[step] = tuple(
+        (row + row_step) * size + column + column_step
+        if 0 <= row + row_step < size and 0 <= column + column_step < size else -1
+        for row in range(size) for column in range(size)
+      )
+
+    rays = []
+    around = []
+    lines = []
+    for square in range(size * size):
+      square_rays = []
+      square_around = 0
+      square_lines = 1 << square
+      for step in DIRECTION_STEPS.values():
+        ray = []
+        current = self.neighbors[step][square]
+        while current >= 0:
+          ray.append(1 << current)
+          current = self.neighbors[step][current]
+        if ray:
+          square_around |= ray[0]
+        for bit in ray:
+          square_lines |= bit
+        if len(ray) >= 2: # a single square can't hold both the flipped disc and the flanking one
+          square_rays.append(tuple(ray))
+      rays.append(tuple(square_rays))
+      around.append(square_around)
+      lines.append(square_lines)
+    self.rays = tuple(rays)
+    self.around = tuple(around)
+    self.lines = tuple(lines)
+
+    # Seeded by size so hashes are the same in every process, e.g. for opening books on disk
+    generator = random.Random(f"othello-zobrist-{size}")
+    self.zobrist = (
+      tuple(generator.getrandbits(64) for _ in range(size * size)),
+      tuple(generator.getrandbits(64) for _ in range(size * size)),
+    )
+    self.zobrist_flip = tuple(black ^ white for black, white in zip(*self.zobrist))
+    self.zobrist_white_to_move = generator.getrandbits(64)
+
+  @classmethod
+  def for_size(cls, size: int) -> "_Geometry":
+    """Returns the shared geometry for the given board size, building it on first use
+
+    :param int size: Size of the board
+    :return _Geometry: Lookup tables for that size
+    """
+    geometry = cls._cache.get(size)
+    if geometry is None:
+      geometry = cls._cache[size] = cls(size)
+    return geometry
+
+class OthelloError(ValueError):
+  """Base class for invalid input to a board"""
+
+class InvalidSizeError(OthelloError):
+  """The board size is not an even integer between 6 and 26"""
+
+class InvalidSquareError(OthelloError):
+  """The square name is not on the board"""
+
+class InvalidRowError(OthelloError):
+  """The row number is not on the board"""
+
+class InvalidColumnError(OthelloError):
+  """The column letter is not on the board"""
+
+class InvalidDirectionError(OthelloError):
+  """The direction is not a valid combination of up/down and left/right"""
+
+class MoveDelta(NamedTuple):
+  """Everything needed to take a move back: where the disc went, which discs it flipped, and whose it was"""
+  square: int # Bit position of the placed disc
+  flips: int # Bitboard of the flipped discs
+  color: "Othello.Color"
+
 class Othello:
   class Color(Enum):
     WHITE = "⚪"
     BLACK = "⚫"
 
+  # Bitboard index of each color in _discs
+  _COLOR_INDEX = {Color.BLACK: 0, Color.WHITE: 1}
+
   # Instance Variables
   size: int
+  errors: str # One of ERROR_MODES
   column_letters: list[str]
-  _board_dict: dict[str, Color] # TODO: Make this private / inaccessible
-  _board_table: PrettyTable # TODO: Make this private / inaccessible
-
-  def __init__(self, size: int=8):
+  _geometry: _Geometry
+  _discs: list[int] # One bitboard per color, indexed by _COLOR_INDEX
+  _frontier: int # Empty squares touching at least one disc, the only squares a move can be played on
+  _legal: list[Union[int, None]] # Cached legal move bitboard per color, None until first computed
+  _stale: list[int] # Squares per color whose cached legality may have changed since it was computed
+  _hash: int # Zobrist hash of the discs on the board, updated with every placement and flip
+  _history: list[tuple] # Undo stack of (MoveDelta, frontier, legal, stale, hash) saved by make_move
+  _table: Union["PrettyTable", None] # Rendered board, built on demand by update_board_table
+  _table_dirty: bool # True when the board changed since _table was last built
+
+  def __init__(self, size: int=8, errors: str="print"):
+    if errors not in ERROR_MODES:
+      raise ValueError(f"Unknown error mode: {errors}. Must be one of {ERROR_MODES}")
+    self.errors = errors
     if type(size) == int and (size >= 6 and size <= 26 and size%2 == 0):
       self.size = size
     else:
-      print(f"Invalid size, setting to {SIZE}.")
+      if errors == "raise":
+        raise InvalidSizeError(f"Invalid size: {size}. Must be an even integer between 6 and 26.")
+      if errors == "print":
+        print(f"Invalid size, setting to {SIZE}.")
       self.size = SIZE
     self._show_guides = True
-    self._board_dict = {}
+    self._geometry = _Geometry.for_size(self.size)
     self.initialize_board_dict()
     self.column_letters = self.get_column_letters()
-    table_columns = self.column_letters
-    self._board_table = PrettyTable(table_columns)
-    self.update_board_table()
+    self._table = None
+    self._table_dirty = True
+
+  @property
+  def _board_table(self) -> "PrettyTable":
+    """The rendered board, rebuilt first if the board changed since it was last built
+    """
+    if self._table_dirty:
+      self.update_board_table()
+    return self._table
+
+  @property
+  def _board_dict(self) -> dict[str, str]:
+    """Snapshot of the board as a dictionary of square names to square values
+    """
+    return {key: self._value_at(i) for i, key in enumerate(self._geometry.keys)}
 
   def initialize_board_dict(self) -> None:
     """Initializes the board to the starting state
     """
-    for i in range(1, self.size + 1):
-      for j in range(1, self.size + 1):
-        if i == int(self.size/2) or i == int(self.size/2) + 1:
-          if j == int(self.size/2) or j == int(self.size/2) + 1:
-            if i == j:
-              self._board_dict[f"{chr(64 + i)}{j}"] = self.Color.WHITE.value
-            else:
-              self._board_dict[f"{chr(64 + i)}{j}"] = self.Color.BLACK.value
-            continue
+    half = self.size // 2
+    white_squares = [f"{chr(64 + half)}{half}", f"{chr(65 + half)}{half + 1}"]
+    black_squares = [f"{chr(65 + half)}{half}", f"{chr(64 + half)}{half + 1}"]
+    index = self._geometry.index
+    self._discs = [0, 0]
+    for key in black_squares:
+      self._discs[0] |= 1 << index[key]
+    for key in white_squares:
+      self._discs[1] |= 1 << index[key]
+    self._reset_move_tracking()
+    self._table_dirty = True
+
+  def _reset_move_tracking(self) -> None:
+    """Rebuilds the frontier and Zobrist hash from scratch and drops the cached legal moves and undo stack
+    """
+    occupied = self._discs[0] | self._discs[1]
+    self._frontier = self._geometry.full & ~occupied & self.adjacent_mask(occupied)
+    self._legal = [None, None]
+    self._stale = [0, 0]
+    self._history = []
+    self._hash = 0
+    for player in (0, 1):
+      keys = self._geometry.zobrist[player]
+      discs = self._discs[player]
+      while discs:
+        low = discs & -discs
+        self._hash ^= keys[low.bit_length() - 1]
+        discs ^= low
+
+  def _value_at(self, index: int) -> str:
+    """Returns the value of the square at the given bit position
+
+    :param int index: Bit position of the square
+    :return str: The color value of the disc on the square, or DEFAULT if it's empty
+    """
+    bit = 1 << index
+    if self._discs[0] & bit:
+      return self.Color.BLACK.value
+    if self._discs[1] & bit:
+      return self.Color.WHITE.value
+    return DEFAULT
+
+  def _mask_to_keys(self, mask: int) -> list[str]:
+    """Returns the names of the squares set in a bitboard
+
+    :param int mask: Bitboard of squares
+    :return list[str]: Square names in bit order
+    """
+    keys = self._geometry.keys
+    squares: list[str] = []
+    while mask:
+      low = mask & -mask
+      squares.append(keys[low.bit_length() - 1])
+      mask ^= low
+    return squares
+
+  def _set_discs(self, squares: int, color: Color) -> None:
+    """Puts discs of the given color on a set of squares, replacing whatever was there,
+    and updates the frontier and the squares whose cached legality needs rechecking
+
+    :param int squares: Bitboard of the squares to set
+    :param Color color: Color of the discs
+    """
+    player = self._COLOR_INDEX[color]
+    occupied = self._discs[0] | self._discs[1]
+    theirs = self._discs[1 - player]
+    squares &= ~self._discs[player] # squares already holding this color don't change
+    self._discs[player] |= squares
+    self._discs[1 - player] &= ~squares
+
+    geometry = self._geometry
+    keys = geometry.zobrist[player]
+    flip_keys = geometry.zobrist_flip
+    frontier = self._frontier
+    position_hash = self._hash
+    affected = 0
+    while squares:
+      low = squares & -squares
+      index = low.bit_length() - 1
+      affected |= geometry.lines[index]
+      if theirs & low:
+        position_hash ^= flip_keys[index]
+      else:
+        position_hash ^= keys[index]
+      if not occupied & low:
+        frontier |= geometry.around[index]
+      squares ^= low
+    self._hash = position_hash
+    self._frontier = frontier & ~(self._discs[0] | self._discs[1])
+    self._stale[0] |= affected
+    self._stale[1] |= affected
+
+  def _legal_moves(self, player: int) -> int:
+    """Returns the legal move bitboard for a color, only rechecking squares a move could have affected
+
+    :param int player: Index of the color in _discs
+    :return int: Bitboard of legal moves
+    """
+    mine = self._discs[player]
+    theirs = self._discs[1 - player]
+    legal = self._legal[player]
+    stale = self._stale[player] & self._frontier
+    if legal is None or stale.bit_count() > self._geometry.size:
+      # Generating the whole mask is cheaper than walking rays for this many squares
+      legal = self.legal_mask(mine, theirs)
+    else:
+      legal &= self._frontier & ~self._stale[player]
+      while stale:
+        low = stale & -stale
+        if self._is_legal(low.bit_length() - 1, mine, theirs):
+          legal |= low
+        stale ^= low
+    self._legal[player] = legal
+    self._stale[player] = 0
+    return legal
+
+  def legal_mask(self, player: int, opponent: int) -> int:
+    """Returns a bitboard of every empty square where the player would flank at least one opponent disc.
+    Works on any pair of bitboards of this board's size, without touching the board or its caches.
+
+    :param int player: Bitboard of the player's discs
+    :param int opponent: Bitboard of the opponent's discs
+    :return int: Bitboard of legal moves
+    """
+    geometry = self._geometry
+    empty = geometry.full & ~(player | opponent)
+    moves = 0
+    for shift, mask in geometry.up_shifts:
+      flankable = mask & opponent
+      run = (player << shift) & flankable
+      while run:
+        longer = run | ((run << shift) & flankable)
+        if longer == run:
+          break
+        run = longer
+      moves |= (run << shift) & mask & empty
+    for shift, mask in geometry.down_shifts:
+      flankable = mask & opponent
+      run = (player >> shift) & flankable
+      while run:
+        longer = run | ((run >> shift) & flankable)
+        if longer == run:
+          break
+        run = longer
+      moves |= (run >> shift) & mask & empty
+    return moves
+
+  def adjacent_mask(self, discs: int) -> int:
+    """Returns a bitboard of every square touching at least one of the given discs
+
+    :param int discs: Bitboard of discs
+    :return int: Bitboard of the squares next to them, which may include the discs themselves
+    """
+    adjacent = 0
+    for shift, mask in self._geometry.up_shifts:
+      adjacent |= (discs << shift) & mask
+    for shift, mask in self._geometry.down_shifts:
+      adjacent |= (discs >> shift) & mask
+    return adjacent
+
+  def flip_mask(self, index: int, player: int, opponent: int) -> int:
+    """Returns a bitboard of the opponent discs that would flip if the player moved on a square.
+    Works on any pair of bitboards of this board's size, without touching the board or its caches.
+
+    :param int index: Bit position of the move
+    :param int player: Bitboard of the player's discs
+    :param int opponent: Bitboard of the opponent's discs
+    :return int: Bitboard of discs to flip, 0 if the move is not legal
+    """
+    flips = 0
+    for ray in self._geometry.rays[index]:
+      run = 0
+      for bit in ray:
+        if opponent & bit:
+          run |= bit
+          continue
+        if player & bit:
+          flips |= run
+        break
+    return flips
+
+  def _is_legal(self, index: int, player: int, opponent: int) -> bool:
+    """Checks whether a move would flip anything, stopping at the first flanked disc
+
+    :param int index: Bit position of the move
+    :param int player: Bitboard of the player's discs
+    :param int opponent: Bitboard of the opponent's discs
+    :return bool: True if at least one disc would flip
+    """
+    for ray in self._geometry.rays[index]:
+      if not opponent & ray[0]:
+        continue
+      for bit in ray[1:]:
+        if opponent & bit:
+          continue
+        if player & bit:
+          return True
+        break
+    return False
+
+  def make_move(self, square: Union[str, int], color: Color) -> Union[MoveDelta, None]:
+    """Plays a move for the given color, flipping every flanked disc. Returns None if the move is not valid.
+
+    :param Union[str, int] square: Square name or bit position to play on
+    :param Color color: Color of the player moving
+    :return Union[MoveDelta, None]: The placed square and flipped discs, to pass to unmake_move
+    """
+    if type(square) == int:
+      index = square if 0 <= square < len(self._geometry.keys) else None
+    else:
+      index = self._geometry.index.get(square.upper())
+    if index is None or color not in self._COLOR_INDEX:
+      return None
+
+    player = self._COLOR_INDEX[color]
+    mine = self._discs[player]
+    theirs = self._discs[1 - player]
+    if (mine | theirs) >> index & 1:
+      return None
+    flips = self.flip_mask(index, mine, theirs)
+    if not flips:
+      return None
+
+    delta = MoveDelta(index, flips, color)
+    self._history.append((delta, self._frontier, self._legal[0], self._legal[1], self._stale[0], self._stale[1], self._hash))
+    self._set_discs(flips | (1 << index), color)
+    self._table_dirty = True
+    return delta
 
-        self._board_dict[f"{chr(64 + i)}{j}"] = DEFAULT
+  def unmake_move(self, delta: Union[MoveDelta, None]=None) -> Union[MoveDelta, None]:
+    """Takes back the most recent move played with make_move, restoring the board exactly as it was
+
+    :param Union[MoveDelta, None] delta: The move to take back. Must be the most recent one, defaults to it.
+    :return Union[MoveDelta, None]: The move taken back, or None if there is nothing to undo.
+    """
+    if not self._history:
+      return None
+    last, frontier, legal_black, legal_white, stale_black, stale_white, position_hash = self._history[-1]
+    if delta is not None and delta != last:
+      raise ValueError("Moves must be taken back in the reverse order they were made.")
+    self._history.pop()
+
+    player = self._COLOR_INDEX[last.color]
+    self._discs[player] ^= last.flips | (1 << last.square)
+    self._discs[1 - player] |= last.flips
+    self._frontier = frontier
+    self._legal = [legal_black, legal_white]
+    self._stale = [stale_black, stale_white]
+    self._hash = position_hash
+    self._table_dirty = True
+    return last
+
+  def move_squares(self, delta: MoveDelta) -> tuple[str, list[str]]:
+    """Returns the square names a move touched
+
+    :param MoveDelta delta: Move returned by make_move
+    :return tuple[str, list[str]]: The placed square and the flipped squares
+    """
+    return self._geometry.keys[delta.square], self._mask_to_keys(delta.flips)
+
+  def zobrist_hash(self, color: Union[Color, None]=None) -> int:
+    """Returns a 64-bit Zobrist hash of the position, kept up to date as discs are placed and flipped
+
+    :param Union[Color, None] color: Color to move, mixed into the hash if given
+    :return int: Hash of the position
+    """
+    if color == self.Color.WHITE:
+      return self._hash ^ self._geometry.zobrist_white_to_move
+    return self._hash
+
+  def square_name(self, index: int) -> str:
+    """Returns the name of the square at a bit position
+
+    :param int index: Bit position, see bitboards for the numbering
+    :return str: Square name such as "C4"
+    """
+    return self._geometry.keys[index]
+
+  def square_index(self, key: str) -> Union[int, None]:
+    """Returns the bit position of a square
+
+    :param str key: Square name such as "C4"
+    :return Union[int, None]: Bit position, or None if the square is not on the board
+    """
+    return self._geometry.index.get(key.upper())
+
+  def count_discs(self, color: Color) -> int:
+    """Returns the number of discs of the given color on the board
+
+    :param Color color: Color to count
+    :return int: Number of discs of that color
+    """
+    return self._discs[self._COLOR_INDEX[color]].bit_count()
 
   def get_column_letters(self) -> list[str]:
     """Return the column letters for the board
@@ -55,14 +522,18 @@ class Othello:
     return start + [chr(65 + i) for i in range(self.size)]
 
   def update_board_table(self) -> None:
-    """Updates the board table with the values in the board dictionary
+    """Updates the board table with the values in the board. Called automatically before the table is printed.
     """
-    self._board_table.clear()
-    self._board_table.header = self._show_guides
-    self._board_table.field_names = self.get_column_letters()
+    if self._table is None:
+      from prettytable import PrettyTable
+      self._table = PrettyTable()
+    self._table.clear()
+    self._table.header = self._show_guides
+    self._table.field_names = self.get_column_letters()
     for i in range(self.size):
       start = [i + 1] if self._show_guides else []
-      self._board_table.add_row(start + self.get_row(i+1), divider=True)
+      self._table.add_row(start + self.get_row(i+1), divider=True)
+    self._table_dirty = False
 
   def set_square(self, key: str, color: Color) -> bool:
     """Sets a single square in the board dictionary to a color. Returns True if successful, False if not
@@ -71,11 +542,12 @@ class Othello:
     :param str color: The color to set
     :return bool: Returns True if successful, False if not.
     """
-    key = key.upper()
-    if key in self._board_dict.keys():
-      if color in self.Color:
-        self._board_dict[key] = color.value
-        self.update_board_table()
+    index = self._geometry.index.get(key.upper())
+    if index is not None:
+      if color in self._COLOR_INDEX:
+        self._set_discs(1 << index, color)
+        self._history.clear() # edits outside make_move can't be undone reliably
+        self._table_dirty = True
         return True
 
     return False
@@ -88,17 +560,21 @@ class Othello:
     :return bool: Returns True if successful, False if not.
     """
     valid = True
+    squares = 0
     for key in keys:
-      key = key.upper()
-      if key in self._board_dict.keys():
-        if color in self.Color:
-          self._board_dict[key] = color.value
+      index = self._geometry.index.get(key.upper())
+      if index is not None:
+        if color in self._COLOR_INDEX:
+          squares |= 1 << index
         else:
           valid = False
       else:
         valid = False
 
-    self.update_board_table()
+    if squares:
+      self._set_discs(squares, color)
+      self._history.clear() # edits outside make_move can't be undone reliably
+      self._table_dirty = True
     return valid
 
   def get_square(self, key: str) -> str:
@@ -107,23 +583,77 @@ class Othello:
     :param str key: The square to get the value for
     :return str: The value of the square
     """
-    try:
-      return self._board_dict[key.upper()]
-    except KeyError:
-      print("Invalid square. Not in board.")
+    index = self._geometry.index.get(key.upper())
+    if index is None:
+      self._report(InvalidSquareError("Invalid square. Not in board."))
       return None
+    return self._value_at(index)
+
+  def _report(self, error: OthelloError) -> None:
+    """Handles invalid input according to the board's error mode
+
+    :param OthelloError error: What went wrong
+    :raises OthelloError: If the error mode is "raise"
+    """
+    if self.errors == "raise":
+      raise error
+    if self.errors == "print":
+      print(error)
 
   def toggle_guides(self) -> None:
     """Toggles the guides of the board table and refreshes the board.
     """
     self._show_guides = not self._show_guides
-    self.update_board_table()
+    self._table_dirty = True
 
   def print_board(self) -> None:
     """Prints the board
     """
     print(self._board_table)
 
+  def bitboards(self) -> tuple[int, int]:
+    """Returns the board as bitboards, with square A1 as bit 0 and squares numbered row by row
+
+    :return tuple[int, int]: The black and white bitboards
+    """
+    return self._discs[0], self._discs[1]
+
+  @classmethod
+  def from_bitboards(cls, black: int, white: int, size: int=SIZE, errors: str="print") -> "Othello":
+    """Creates a board holding the given discs
+
+    :param int black: Bitboard of black discs, see bitboards for the numbering
+    :param int white: Bitboard of white discs, must not overlap the black ones
+    :param int size: Size of the board
+    :param str errors: How the board reacts to invalid input, one of ERROR_MODES
+    :return Othello: The new board
+    """
+    board = cls(size, errors)
+    full = board._geometry.full
+    if black & white or (black | white) & ~full:
+      raise ValueError("Bitboards overlap or have discs off the board.")
+    board._discs = [black, white]
+    board._reset_move_tracking()
+    board._table_dirty = True
+    return board
+
+  @classmethod
+  def from_position(cls, position: Position, errors: str="print") -> "Othello":
+    """Creates a board holding a position's discs. Nothing is rendered until the board is printed.
+
+    :param Position position: The discs
+    :param str errors: How the board reacts to invalid input, one of ERROR_MODES
+    :return Othello: The new board
+    """
+    return cls.from_bitboards(*position.bitboards(), position.size, errors)
+
+  def to_position(self) -> Position:
+    """Returns a compact copy of the discs on the board
+
+    :return Position: The discs
+    """
+    return Position.from_bitboards(self._discs[0], self._discs[1], self.size)
+
   def get_row(self, row: int) -> list[str]:
     """Returns a list of the values in the given row
 
@@ -134,14 +664,15 @@ class Othello:
     try:
       row = int(row)
     except ValueError:
-      print("Invalid row input. Must be Integer")
+      self._report(InvalidRowError("Invalid row input. Must be Integer"))
       return []
 
     if row < 1 or row > self.size:
-      print(f"Invalid row input. Must be between 1 and {self.size}")
+      self._report(InvalidRowError(f"Invalid row input. Must be between 1 and {self.size}"))
       return []
 
-    return [self._board_dict[f"{chr(65 + i)}{row}"] for i in range(self.size)]
+    start = (row - 1) * self.size
+    return [self._value_at(start + i) for i in range(self.size)]
 
   def get_column(self, column: str) -> list[str]:
     """Returns a list of the values in the given column
@@ -153,74 +684,82 @@ class Othello:
     try:
       column = str(column)
     except ValueError:
-      print("Invalid row input. Must be String")
+      self._report(InvalidColumnError("Invalid row input. Must be String"))
       return []
 
     column = column.upper()
     if (not column in self.column_letters) or column == DEFAULT:
-      print(f"Invalid column input. Must be between A and {self.column_letters[-1]}")
+      self._report(InvalidColumnError(f"Invalid column input. Must be between A and {self.column_letters[-1]}"))
       return []
 
-    return [self._board_dict[f"{column}{i + 1}"] for i in range(self.size)]
+    column_index = ord(column) - 65
+    return [self._value_at(i * self.size + column_index) for i in range(self.size)]
 
   def get_next_space(self, space: str, direction: str) -> Union[str, None]:
+    """Returns the square next to the given one in the given direction
+
+    :param str space: Square to start from
+    :param str direction: Direction to move in, made of "up"/"down" and/or "left"/"right"
+    :return Union[str, None]: The neighboring square, or None if it would be off the board
+    """
     space = space.upper()
-    error_message = f"Error!: Invalid key: {space}"
-    if len(space) != 2 and len(space) != 3:
-      print(error_message)
+    index = self._geometry.index.get(space)
+    if index is None:
+      self._report(self._invalid_space_error(space))
       return None
-    column = list(space)[0]
-    row = int(''.join(list(space)[1:])) # TODO: need error handling around this
 
-    valid_column_letters = [letter for letter in self.column_letters if letter != DEFAULT]
-    if not column in valid_column_letters:
-      print(error_message)
-      print(f"Column must be in {valid_column_letters}")
+    try:
+      step = self._parse_direction(direction)
+    except InvalidDirectionError as error:
+      self._report(error)
       return None
 
-    if row < 1 or row > self.size:
-      print(error_message)
-      print(f"Row must be between 1 and {self.size}")
-      return None
+    neighbor = self._geometry.neighbors[step][index]
+    return self._geometry.keys[neighbor] if neighbor >= 0 else None
 
-    direction = direction.lower()
-    valid_directions = ["left", "right", "up", "down"]
-    if not any(item in direction for item in valid_directions):
-      print (f"Error!: Invalid direction: {direction}")
-      print(f"Directions must contain at least one of the following {valid_directions}")
-      return None
-    elif "up" in direction and "down" in direction:
-      print (f"Error!: Invalid direction: {direction}")
-      print("Cannot contain both 'up' and 'down'.")
-      return None
-    elif "left" in direction and "right" in direction:
-      print (f"Error!: Invalid direction: {direction}")
-      print("Cannot contain both 'left' and 'right'.")
-      return None
+  def _invalid_space_error(self, space: str) -> InvalidSquareError:
+    """Explains why a square name is not on the board
 
-    if "left" in direction:
-      if column == "A":
-        return None
-      else:
-        column = chr(ord(column)-1)
-    elif "right" in direction:
-      if column == valid_column_letters[-1]:
-        return None
-      else:
-        column = chr(ord(column)+1)
+    :param str space: The invalid square name
+    :return InvalidSquareError: The error, with the reason on a second line when there is one
+    """
+    error_message = f"Error!: Invalid key: {space}"
+    if len(space) != 2 and len(space) != 3:
+      return InvalidSquareError(error_message)
+    column = space[0]
+    valid_column_letters = [letter for letter in self.column_letters if letter != DEFAULT]
+    if not column in valid_column_letters:
+      return InvalidSquareError(f"{error_message}\nColumn must be in {valid_column_letters}")
+    return InvalidSquareError(f"{error_message}\nRow must be between 1 and {self.size}")
 
-    if "up" in direction:
-      if row == 1:
-        return None
-      else:
-        row -= 1
-    elif "down" in direction:
-      if row == self.size:
-        return None
-      else:
-        row += 1
+  _parsed_directions: dict[str, tuple[int, int]] = {}
 
-    return f"{column}{row}"
+  @classmethod
+  def _parse_direction(cls, direction: str) -> tuple[int, int]:
+    """Turns a direction string into a (row step, column step) pair. Valid strings are cached.
+
+    :param str direction: Direction made of "up"/"down" and/or "left"/"right"
+    :raises InvalidDirectionError: If the direction is invalid
+    :return tuple[int, int]: The step
+    """
+    step = cls._parsed_directions.get(direction)
+    if step is not None:
+      return step
+
+    lowered = direction.lower()
+    valid_directions = ["left", "right", "up", "down"]
+    error_message = f"Error!: Invalid direction: {lowered}"
+    if not any(item in lowered for item in valid_directions):
+      raise InvalidDirectionError(f"{error_message}\nDirections must contain at least one of the following {valid_directions}")
+    elif "up" in lowered and "down" in lowered:
+      raise InvalidDirectionError(f"{error_message}\nCannot contain both 'up' and 'down'.")
+    elif "left" in lowered and "right" in lowered:
+      raise InvalidDirectionError(f"{error_message}\nCannot contain both 'left' and 'right'.")
+
+    row_step = -1 if "up" in lowered else 1 if "down" in lowered else 0
+    column_step = -1 if "left" in lowered else 1 if "right" in lowered else 0
+    step = cls._parsed_directions[direction] = (row_step, column_step)
+    return step
 
   def check_move(self, space: str, color: Color) -> tuple[bool, list[str]]:
     """Checks if given space is a valid move for given color (will flank with a piece with a matching color)
@@ -230,60 +769,37 @@ class Othello:
     :return tuple[bool, list[str]]: Boolean of whether the move is valid or not,
       and a list of spaces to flip if a piece were placed there.
     """
-    space = space.upper()
-    if (space not in self._board_dict.keys()) or color not in self.Color or self.get_square(space) != DEFAULT:
+    index = self._geometry.index.get(space.upper())
+    if index is None or color not in self._COLOR_INDEX:
+      return False, []
+    if (self._discs[0] | self._discs[1]) >> index & 1: # square already taken
       return False, []
 
-    spaces_to_flip: list[str] = []  # spaces to be flipped if move is valid
-    # directions = ["left", "right", "above", "below", "dul", "dur", "ddl", "ddr"]
-    directions = ["left", "right", "up", "down", "upleft", "upright", "downleft", "downright"]
-
-    for direction in directions:
-      current_space = space
-      working_spaces: list[str] = []  # working list of spaces, only add to final list if valid move
-      continue_check = True
-      count = 0 # Failsafe for infinite loops
-      while continue_check and count < 100:
-        count += 1
-        # current_space = getattr(self, f"get_{direction}")(current_space)
-        current_space = self.get_next_space(current_space, direction)
-
-        if current_space == None: # edge of board, not valid move
-          continue_check = False
-        elif self.get_square(current_space) == DEFAULT: # empty space, not a valid move
-          continue_check = False
-        elif self.get_square(current_space) == color.value: # flanking with same color, valid move
-          spaces_to_flip += working_spaces # add working spaces to total list
-          continue_check = False
-        else: # opposite color, add to working list and continue
-          working_spaces.append(current_space)
-
-    if spaces_to_flip:
-      return True, spaces_to_flip
-    else:
-      return False, spaces_to_flip
+    player = self._COLOR_INDEX[color]
+    flips = self.flip_mask(index, self._discs[player], self._discs[1 - player])
+    return flips != 0, self._mask_to_keys(flips)
 
   def any_valid_move(self, color: Color) -> bool:
-    """Loops through each available space to see if it is a valid move for the given color. Returns once it finds one.
+    """Checks whether the given color has at least one valid move, using the cached legal moves.
 
     :param Color color: Color to check valid moves for
     :return bool: A boolean of whether there is at least one valid move.
     """
-    for space in self._board_dict.keys():
-      if self.check_move(space, color)[0]:
-        return True
+    return self._legal_moves(self._COLOR_INDEX[color]) != 0
 
-    return False
+  def valid_moves_mask(self, color: Color) -> int:
+    """Returns every valid move for the given color as a bitboard, using the cached legal moves.
+
+    :param Color color: Color to check valid moves for
+    :return int: Bitboard with a bit set on each valid square, see bitboards for the numbering
+    """
+    return self._legal_moves(self._COLOR_INDEX[color])
 
   def all_valid_moves(self, color: Color) -> tuple[bool, list[str]]:
-    """Loops through all spaces on the board to check if there are any valid moves for the given color.
+    """Finds every valid move for the given color.
 
     :param Color color: Color to check valid moves for
     :return tuple[bool, list[str]]: A boolean of whether there are any valid moves, and a list of valid spaces.
     """
-    valid_spaces: list[str] = []
-    for space in self._board_dict.keys():
-      if self.check_move(space, color)[0]:
-        valid_spaces.append(space)
-
-    return len(valid_spaces) > 0, valid_spaces
+    moves = self._legal_moves(self._COLOR_INDEX[color])
+    return moves != 0, self._mask_to_keys(moves)
@@ -0,0 +1,320 @@
+import os
+from typing import Union
+import numpy as np
+from Othello.othello import MoveDelta, Othello
+from Othello.symmetry import TRANSFORMS, transform_square
+
+WEIGHTS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weights") # Next to the package, wherever it's run from
+WEIGHTS_VERSION = 1
+STAGES = 4 # Weights are fitted separately for this many stretches of the game, by discs on the board
+MAX_LINE = 8 # Longest edge or diagonal pattern, so no table grows past the corner's 3 ** 9 entries
+EVAL_SCALE = 100 # Evaluations are in hundredths of a disc
+
+# Digit of a square in a pattern code. Black and white are from black's point of view;
+# codes for white to move swap them, see PatternSet.swap.
+EMPTY_DIGIT = 0
+BLACK_DIGIT = 1
+WHITE_DIGIT = 2
+
+def _shapes(size: int) -> tuple[tuple[str, tuple[tuple[int, int], ...]], ...]:
+  """Pattern shapes as (row, column) cells next to corner A1. Every rotation and reflection of a shape is used too."""
+  line = min(size, MAX_LINE)
+  return (
+    ("edge", tuple((0, column) for column in range(line))),
+    ("corner", tuple((row, column) for row in range(3) for column in range(3))),
+    ("diagonal", tuple((i, i) for i in range(line))),
+  )
+
+def stage_of(discs: int, size: int, stages: int) -> int:
+  """Returns which stretch of the game a position is in
+
+  :param int discs: Discs on the board
+  :param int size: Size of the board
+  :param int stages: Number of stages the game is split into
+  :return int: Stage, 0 for the opening up to stages - 1
+  """
+  return min(stages - 1, max(0, discs - 4) * stages // (size * size - 4))
+
+def stage_table(size: int, stages: int) -> tuple[int, ...]:
+  """Returns the stage of every disc count, so evaluation and training split the game the same way
+
+  :param int size: Size of the board
+  :param int stages: Number of stages the game is split into
+  :return tuple[int, ...]: Stage for 0 up to size * size discs
+  """
+  return tuple(stage_of(discs, size, stages) for discs in range(size * size + 1))
+
+class PatternSet:
+  """Every pattern instance on one board size and how to turn discs into pattern codes.
+
+  A pattern instance is an ordered run of squares; its code reads the squares as base 3 digits,
+  first square lowest. Instances of the same shape share one table of 3 ** length weights, so
+  all eight symmetric forms of a position evaluate the same. Each instance's code has its shape's
+  offset added, making it an index straight into a stage's flat weight table.
+  """
+  _cache: dict[int, "PatternSet"] = {}
+
+  size: int
+  names: tuple[str, ...] # Name of each shape
+  instances: tuple[tuple[int, ...], ...] # Squares of every instance, grouped by shape
+  shape_of: tuple[int, ...] # Shape of each instance
+  offsets: tuple[int, ...] # Where each shape's weights start in a stage
+  features: int # Pattern weights per stage
+  width: int # Weights per stage: the pattern weights, then mobility, then bias
+  mobility: int # Index of the mobility weight in a stage
+  bias: int # Index of the bias weight in a stage
+  swap: np.ndarray # int64 (features,), the index of each code with black and white swapped
+  terms: tuple[tuple[tuple[int, int], ...], ...] # For each square, (instance, 3 ** place) for every instance it's in
+
+  def __init__(self, size: int):
+    self.size = size
+    names, instances, shape_of, offsets = [], [], [], []
+    swap = []
+    features = 0
+    for shape, (name, cells) in enumerate(_shapes(size)):
+      base = [row * size + column for row, column in cells]
+      for transform in TRANSFORMS:
+        instance = tuple(transform_square(square, transform, size) for square in base)
+        if instance not in instances:
+          instances.append(instance)
+          shape_of.append(shape)
+      names.append(name)
+      offsets.append(features)
+      # Swapping colors turns every 1 digit into 2 and back
+      digits = np.arange(3 ** len(cells))
+      swapped = np.zeros_like(digits)
+      for place in range(len(cells)):
+        digit = digits // 3 ** place % 3
+        swapped += np.where(digit == EMPTY_DIGIT, 0, 3 - digit) * 3 ** place
+      swap.append(swapped + features)
+      features += 3 ** len(cells)
+    self.names = tuple(names)
+    self.instances = tuple(instances)
+    self.shape_of = tuple(shape_of)
+    self.offsets = tuple(offsets)
+    self.features = features
+    self.mobility = features
+    self.bias = features + 1
+    self.width = features + 2
+    self.swap = np.concatenate(swap)
+
+    terms = [[] for _ in range(size * size)]
+    for instance, squares in enumerate(self.instances):
+      for place, square in enumerate(squares):
+        terms[square].append((instance, 3 ** place))
+    self.terms = tuple(tuple(square_terms) for square_terms in terms)
+
+    # Instances of one shape sit next to each other, so each shape's codes are one vectorized product
+    self._groups = []
+    for shape in range(len(self.names)):
+      members = [instance for instance, of in enumerate(self.shape_of) if of == shape]
+      squares = np.array([self.instances[instance] for instance in members], dtype=np.intp)
+      powers = 3 ** np.arange(squares.shape[1], dtype=np.int32)
+      self._groups.append((members[0], squares, powers, self.offsets[shape]))
+
+  @classmethod
+  def for_size(cls, size: int) -> "PatternSet":
+    patterns = cls._cache.get(size)
+    if patterns is None:
+      patterns = cls._cache[size] = cls(size)
+    return patterns
+
+  def codes(self, black: int, white: int) -> list[int]:
+    """Works out every instance's code from scratch
+
+    :param int black: Bitboard of black discs
+    :param int white: Bitboard of white discs
+    :return list[int]: Code of each instance, its shape's offset included, from black's point of view
+    """
+    codes = [self.offsets[shape] for shape in self.shape_of]
+    for instance, squares in enumerate(self.instances):
+      for place, square in enumerate(squares):
+        if black >> square & 1:
+          codes[instance] += BLACK_DIGIT * 3 ** place
+        elif white >> square & 1:
+          codes[instance] += WHITE_DIGIT * 3 ** place
+    return codes
+
+  def batch_codes(self, cells: np.ndarray) -> np.ndarray:
+    """Works out the codes of many positions at once
+
+    :param np.ndarray cells: uint8 (positions, squares) of Position cell codes, which are also the pattern digits
+    :return np.ndarray: int32 (positions, instances), the same codes as codes() gives
+    """
+    codes = np.empty((len(cells), len(self.instances)), dtype=np.int32)
+    for first, squares, powers, offset in self._groups:
+      codes[:, first:first + len(squares)] = cells[:, squares].astype(np.int32) @ powers + offset
+    return codes
+
+class PatternCodes:
+  """The pattern codes of one board, kept up to date move by move.
+
+  Playing a move only touches the instances through the placed and flipped squares, a few
+  additions each, instead of reading the whole board again.
+  """
+  __slots__ = ("patterns", "codes")
+
+  patterns: PatternSet
+  codes: list[int]
+
+  def __init__(self, patterns: PatternSet, black: int, white: int):
+    self.patterns = patterns
+    self.codes = patterns.codes(black, white)
+
+  @classmethod
+  def from_board(cls, board: Othello) -> "PatternCodes":
+    return cls(PatternSet.for_size(board.size), *board.bitboards())
+
+  def play(self, delta: MoveDelta, sign: int=1) -> None:
+    """Updates the codes for a move made with Othello.make_move
+
+    :param MoveDelta delta: The move
+    :param int sign: 1 to play the move, -1 to take it back
+    """
+    codes = self.codes
+    terms = self.patterns.terms
+    if delta.color == Othello.Color.BLACK:
+      placed, flipped = BLACK_DIGIT * sign, (BLACK_DIGIT - WHITE_DIGIT) * sign
+    else:
+      placed, flipped = WHITE_DIGIT * sign, (WHITE_DIGIT - BLACK_DIGIT) * sign
+    for instance, power in terms[delta.square]:
+      codes[instance] += placed * power
+    flips = delta.flips
+    while flips:
+      low = flips & -flips
+      for instance, power in terms[low.bit_length() - 1]:
+        codes[instance] += flipped * power
+      flips ^= low
+
+  def undo(self, delta: MoveDelta) -> None:
+    """Updates the codes for a move taken back with Othello.unmake_move
+
+    :param MoveDelta delta: The move
+    """
+    self.play(delta, -1)
+
+class PatternWeights:
+  """Fitted weights for one board size, stored as one flat table.
+
+  Stage s takes table[s * width:(s + 1) * width]: one weight per pattern code, then the mobility
+  weight, then a bias. Weights are in discs, scored for the side to move.
+  """
+  size: int
+  stages: int
+  table: np.ndarray # float32 (stages * width,)
+
+  def __init__(self, size: int, stages: int=STAGES, table: Union[np.ndarray, None]=None):
+    """Creates the weights for a board size, given or all zero
+
+    :param int size: Size of the board
+    :param int stages: Number of stages the game is split into
+    :param Union[np.ndarray, None] table: The weights, all zero if None
+    :raises ValueError: If the table isn't the right length for the size and stages
+    """
+    width = PatternSet.for_size(size).width
+    if table is None:
+      table = np.zeros(stages * width, dtype=np.float32)
+    elif table.shape != (stages * width,):
+      raise ValueError(f"A {size}x{size} table with {stages} stages needs {stages * width} weights, not {table.shape}.")
+    self.size = size
+    self.stages = stages
+    self.table = table
+
+  def save(self, path: str) -> None:
+    """Writes the weights to a .npz file
+
+    :param str path: File to write
+    """
+    directory = os.path.dirname(path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as f:
+      np.savez(f, version=np.array(WEIGHTS_VERSION), size=np.array(self.size), stages=np.array(self.stages), table=self.table)
+
+  @classmethod
+  def load(cls, path: str) -> "PatternWeights":
+    """Reads weights written by save
+
+    :param str path: File to read
+    :raises ValueError: If the file isn't weights this version can read
+    :return PatternWeights: The weights
+    """
+    with np.load(path) as data:
+      if "version" not in data or int(data["version"]) != WEIGHTS_VERSION:
+        raise ValueError(f"{path} is not a version {WEIGHTS_VERSION} pattern weights file.")
+      return cls(int(data["size"]), int(data["stages"]), data["table"].astype(np.float32))
+
+def weights_path(size: int, directory: str=WEIGHTS_DIRECTORY) -> str:
+  """Returns the default file name of the weights for a board size
+
+  :param int size: Size of the board
+  :param str directory: Folder the weights are kept in
+  :return str: Path of the weights
+  """
+  return os.path.join(directory, f"patterns_{size}.npz")
+
+class PatternEvaluator:
+  """Scores positions from pattern codes: one table lookup per instance, plus mobility and a bias.
+
+  The weights are scaled to integers and copied into plain lists once, one per stage and side
+  to move, so scoring a position never touches NumPy.
+  """
+  _cache: dict[str, "PatternEvaluator"] = {}
+
+  weights: PatternWeights
+  patterns: PatternSet
+
+  def __init__(self, weights: PatternWeights):
+    self.weights = weights
+    self.patterns = patterns = PatternSet.for_size(weights.size)
+    scaled = np.rint(weights.table.astype(np.float64) * EVAL_SCALE).astype(np.int64).reshape(weights.stages, patterns.width)
+    pattern_weights = scaled[:, :patterns.features]
+    self._tables = ( # [white to move][stage][code]
+      [stage.tolist() for stage in pattern_weights],
+      [stage.tolist() for stage in pattern_weights[:, patterns.swap]],
+    )
+    self._mobility = scaled[:, patterns.mobility].tolist()
+    self._bias = scaled[:, patterns.bias].tolist()
+    self._stages = stage_table(weights.size, weights.stages)
+
+  @classmethod
+  def for_size(cls, size: int, directory: str=WEIGHTS_DIRECTORY) -> "PatternEvaluator":
+    """Loads the saved weights for a board size, once per process
+
+    :param int size: Size of the board
+    :param str directory: Folder the weights are kept in
+    :raises FileNotFoundError: If no weights have been trained for the size
+    :return PatternEvaluator: The evaluator
+    """
+    path = weights_path(size, directory)
+    evaluator = cls._cache.get(path)
+    if evaluator is None:
+      if not os.path.exists(path):
+        raise FileNotFoundError(f"No pattern weights for {size}x{size} at {path}. Train them with: python main.py train --size {size}")
+      evaluator = cls._cache[path] = cls(PatternWeights.load(path))
+    return evaluator
+
+  def evaluate(self, codes: list[int], color: Othello.Color, discs: int, mobility: int) -> int:
+    """Scores a position for the side to move
+
+    :param list[int] codes: Pattern codes of the position, see PatternCodes
+    :param Othello.Color color: Color to move
+    :param int discs: Discs on the board
+    :param int mobility: Valid moves of the color to move minus those of its opponent
+    :return int: Expected final disc difference, in hundredths of a disc
+    """
+    stage = self._stages[discs]
+    table = self._tables[color == Othello.Color.WHITE][stage]
+    return sum(map(table.__getitem__, codes)) + self._mobility[stage] * mobility + self._bias[stage]
+
+  def evaluate_board(self, board: Othello, color: Othello.Color) -> int:
+    """Scores a board from scratch, for when there are no codes being kept up to date
+
+    :param Othello board: The board
+    :param Othello.Color color: Color to move
+    :return int: Expected final disc difference, in hundredths of a disc
+    """
+    black, white = board.bitboards()
+    opponent = Othello.Color.WHITE if color == Othello.Color.BLACK else Othello.Color.BLACK
+    mobility = board.valid_moves_mask(color).bit_count() - board.valid_moves_mask(opponent).bit_count()
+    return self.evaluate(self.patterns.codes(black, white), color, (black | white).bit_count(), mobility)
@@ -0,0 +1,85 @@
+import argparse
+import sys
+from time import perf_counter
+from typing import Union
+from Othello.othello import Othello
+
+OPPONENT = {Othello.Color.BLACK: Othello.Color.WHITE, Othello.Color.WHITE: Othello.Color.BLACK}
+
+def perft(board: Othello, color: Othello.Color, depth: int) -> int:
+  """Counts the positions reachable in exactly the given number of plies.
+
+  A forced pass counts as a ply, and a finished game counts as a single leaf however
+  much depth is left, so the counts match the usual Othello perft tables.
+
+  :param Othello board: Position to start from. It is left exactly as it was found.
+  :param Othello.Color color: Color to move
+  :param int depth: Plies to look ahead
+  :return int: Number of leaf positions
+  """
+  if depth <= 0:
+    return 1
+  mask = board.valid_moves_mask(color)
+  if not mask:
+    if not board.valid_moves_mask(OPPONENT[color]):
+      return 1 # game over
+    return perft(board, OPPONENT[color], depth - 1)
+  if depth == 1:
+    return mask.bit_count()
+
+  total = 0
+  while mask:
+    low = mask & -mask
+    mask ^= low
+    delta = board.make_move(low.bit_length() - 1, color)
+    total += perft(board, OPPONENT[color], depth - 1)
+    board.unmake_move(delta)
+  return total
+
+def perft_divide(board: Othello, color: Othello.Color, depth: int) -> dict[str, int]:
+  """Splits the perft count by the first move, for tracking down which branch a backend gets wrong
+
+  :param Othello board: Position to start from. It is left exactly as it was found.
+  :param Othello.Color color: Color to move
+  :param int depth: Plies to look ahead, at least 1
+  :return dict[str, int]: Leaf count below each first move, keyed by square name, or "pass"
+  """
+  moves = board.all_valid_moves(color)[1]
+  if not moves:
+    return {"pass": perft(board, color, depth)}
+  counts = {}
+  for move in moves:
+    delta = board.make_move(move, color)
+    counts[move] = perft(board, OPPONENT[color], depth - 1)
+    board.unmake_move(delta)
+  return counts
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+  """Parses the command line arguments for perft
+
+  :param list[str] argv: Arguments, not including the script name
+  :return argparse.Namespace: The parsed arguments
+  """
+  parser = argparse.ArgumentParser(description="Count Othello move paths from the starting position.")
+  parser.add_argument("depth", type=int, help="Plies to look ahead")
+  parser.add_argument("--sizes", type=int, nargs="+", default=[8], help="Board sizes to count on")
+  parser.add_argument("--divide", action="store_true", help="Also print the count below each first move")
+  return parser.parse_args(argv)
+
+def main(argv: Union[list[str], None]=None) -> dict[int, int]:
+  args = parse_args(sys.argv[1:] if argv is None else argv)
+  counts = {}
+  for size in args.sizes:
+    if size < 6 or size > 26 or size % 2:
+      raise SystemExit(f"Invalid size: {size}. Must be an even integer between 6 and 26.")
+    board = Othello(size)
+    start = perf_counter()
+    if args.divide:
+      for move, count in perft_divide(board, Othello.Color.BLACK, args.depth).items():
+        print(f"  {move}: {count:,}")
+    counts[size] = perft(board, Othello.Color.BLACK, args.depth)
+    print(f"{size}x{size} perft({args.depth}) = {counts[size]:,} in {perf_counter() - start:.2f}s")
+  return counts
+
+if __name__ == "__main__":
+  main()
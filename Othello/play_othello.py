@@ -1,9 +1,15 @@
+import argparse
+import os
 import sys
-from datetime import datetime
-from typing import Any
-from othello import Othello, SIZE, DEFAULT
+from typing import Any, Union
+from Othello.othello import Othello, SIZE, DEFAULT
+from Othello.render import TerminalRenderer
+from Othello.ai import DEFAULT_TIME_LIMIT, PLAYERS, make_player
+from Othello.book import BookPlayer, OpeningBook
+from Othello import instrument
+from Othello.records import PASS, GameRecordWriter, finished_moves, new_record
 
-LOG_PATH = "Othello/game_logs.txt"
+RECORD_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_records.bin") # Next to the package, wherever it's run from
 
 def valid_size_input(size_input: Any) -> bool:
   """Checks if the input is valid (an int between 6 and 26)
@@ -34,26 +40,66 @@ def opposite_color(color: Othello.Color) -> Othello.Color:
   else:
     raise ValueError("Input must be a member of the Color enum.")
 
-def set_up_logs() -> None:
-  """Sets up the log file, clearing any previous logs
+def take_back_move(moves: list[int]) -> None:
+  """Removes the last move from a game's move list, along with any passes made after it
+
+  :param list[int] moves: Moves played so far, PASS for skipped turns
   """
-  with open(LOG_PATH, "w") as l:
-    l.write(f"Time: {datetime.now()}\n\n")
+  while moves and moves[-1] == PASS:
+    moves.pop()
+  if moves:
+    moves.pop()
 
-def log_message(message: str) -> None:
-  """Writes a log message to the log file.
+def parse_args(argv: list[str]) -> argparse.Namespace:
+  """Parses the command line arguments for a game
 
-  :param str message: Message to write to the log file
+  :param list[str] argv: Arguments, not including the script name
+  :return argparse.Namespace: The parsed arguments
   """
-  with open(LOG_PATH, "a") as l:
-    l.write(message)
+  parser = argparse.ArgumentParser(description="Play a game of Othello in the terminal.")
+  parser.add_argument("size", nargs="?", help="Size of the board, an even integer between 6 and 26")
+  parser.add_argument("--ansi", action="store_true", help="Pin the board to the top of the terminal and redraw only changed squares")
+  player_choices = ["human"] + list(PLAYERS)
+  parser.add_argument("--black", choices=player_choices, default="human", help="Who plays black")
+  parser.add_argument("--white", choices=player_choices, default="human", help="Who plays white")
+  parser.add_argument("--time", type=float, default=DEFAULT_TIME_LIMIT, help="Seconds a computer player may think per move")
+  parser.add_argument("--playouts", type=int, default=None, help="Playouts per move for mcts players, instead of a time limit")
+  parser.add_argument("--workers", type=int, default=1, help="Processes an mcts player searches with, 0 for one per CPU core")
+  parser.add_argument("--book", help="Opening book computer players move from before they start searching")
+  parser.add_argument("--record", default=RECORD_PATH, help="Binary game record file the finished game is appended to")
+  parser.add_argument("--stats", action="store_true", help="Count calls and time spent in the engine's hot methods and print them at the end")
+  parser.add_argument("--profile", metavar="PATH", help="Profile the whole session with cProfile and save the stats to this file")
+  args = parser.parse_args(argv)
+  if args.playouts is not None and args.playouts < 1:
+    parser.error("--playouts must be at least 1")
+  return args
+
+def run_game(argv: Union[list[str], None]=None) -> None:
+  args = parse_args(sys.argv[1:] if argv is None else argv)
+  if args.stats:
+    instrument.enable()
+  try:
+    if args.profile:
+      with instrument.profile_session(args.profile):
+        play(args)
+    else:
+      play(args)
+  finally:
+    if args.stats:
+      print("Engine call stats:")
+      instrument.print_stats()
+      instrument.disable()
 
-def run_game():
+def play(args: argparse.Namespace) -> None:
+  """Plays one game in the terminal
+
+  :param argparse.Namespace args: Parsed command line arguments, see parse_args
+  """
   board_size = 0
   missing_size = True
-  if len(sys.argv) > 1:
-    if valid_size_input(sys.argv[1]):
-      board_size = int(sys.argv[1])
+  if args.size is not None:
+    if valid_size_input(args.size):
+      board_size = int(args.size)
       missing_size = False
       print(f"Using first argument from command line as size: {board_size}") # because argv[0] is the name of the script
 
@@ -71,48 +117,94 @@ def run_game():
   turn = Othello.Color.BLACK
   skip_count = 0
   move_number = 0
-  set_up_logs()
+  mcts_options = {"playouts": args.playouts, "workers": args.workers}
+  try:
+    players = {
+      Othello.Color.BLACK: make_player(args.black, args.time, size=board_size, **(mcts_options if args.black == "mcts" else {})),
+      Othello.Color.WHITE: make_player(args.white, args.time, size=board_size, **(mcts_options if args.white == "mcts" else {})),
+    }
+  except FileNotFoundError as error:
+    raise SystemExit(str(error))
+  if args.book:
+    for color, player in players.items():
+      if player is not None:
+        players[color] = BookPlayer(player, OpeningBook(args.book))
+  record = new_record(board_size, args.black, args.white)
+  moves: list[int] = []
+
+  renderer = TerminalRenderer() if args.ansi else None
+  def show_board() -> None:
+    if renderer:
+      renderer.draw(board)
+    else:
+      board.print_board()
 
-  board.print_board()
+  show_board()
   print(empty_spaces)
 
   while empty_spaces > 0 and skip_count < 2:
     if board.any_valid_move(turn):
       print(f"Open spaces left: {empty_spaces}")
+      player = players[turn]
       move_chosen = False
       while not move_chosen:
-        space = input(f"It's {turn.name.title()}'s turn! Choose a square: ")
-        is_valid, spaces_to_flip = board.check_move(space, turn)
-        if is_valid:
-          board.set_square(space, turn)
-          board.set_squares(spaces_to_flip, turn)
+        if player is not None:
+          space = player.choose_move(board, turn)
+          print(f"{turn.name.title()} ({player.name}) plays {space}: {player.last_stats}")
+        else:
+          space = input(f"It's {turn.name.title()}'s turn! Choose a square (or 'undo'): ")
+        if space.strip().lower() == "undo":
+          undone = board.unmake_move()
+          if undone is None:
+            print("No moves to undo.")
+            continue
+          # Keep going back past computer moves so the human gets to replay their own
+          while True:
+            take_back_move(moves)
+            empty_spaces += 1
+            move_number -= 1
+            if players[undone.color] is None:
+              break
+            earlier = board.unmake_move()
+            if earlier is None:
+              break
+            undone = earlier
+          skip_count = 0
+          show_board()
+          turn = opposite_color(undone.color) # flipped back to the undone color below
+          move_chosen = True
+        elif board.make_move(space, turn) is not None:
           empty_spaces -= 1
           move_number += 1
-          board.print_board()
+          show_board()
           move_chosen = True
-          log_message(f"{move_number}\t{turn.name.title()}\t{space}\n")
+          moves.append(board.square_index(space))
           skip_count = 0
         else:
           print("Invalid square, please select again.")
     else:
       print(f"No valid moves for {turn.name.title()}. Skipping turn.")
       skip_count += 1
-      log_message(f"{turn.name.title()} skips")
+      moves.append(PASS)
 
     turn = opposite_color(turn)
 
+  if renderer:
+    renderer.close()
+  for player in players.values():
+    if hasattr(player, "close"):
+      player.close()
+
+  with GameRecordWriter(args.record) as writer:
+    writer.write_game(record._replace(moves=finished_moves(moves)))
+
   if skip_count >= 2:
     print("No more valid moves. Game over!")
   else:
     print("All spaces filled. Game Over!")
 
-  white_spaces = 0
-  black_spaces = 0
-  for space in board._board_dict.values():
-    if space == Othello.Color.BLACK.value:
-      black_spaces += 1
-    elif space == Othello.Color.WHITE.value:
-      white_spaces += 1
+  white_spaces = board.count_discs(Othello.Color.WHITE)
+  black_spaces = board.count_discs(Othello.Color.BLACK)
 
   print(f"Black: {black_spaces} | White: {white_spaces}")
 
@@ -123,4 +215,5 @@ def run_game():
   else:
     print("========================IT'S A TIE!!!========================")
 
-run_game()
+if __name__ == "__main__":
+  run_game()
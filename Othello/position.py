@@ -0,0 +1,132 @@
+from math import isqrt
+from typing import Union
+
+# Cell codes
+EMPTY = 0
+BLACK = 1
+WHITE = 2
+
+# Byte translations between cells and the binary digits of a bitboard
+_BLACK_DIGITS = bytes.maketrans(bytes([EMPTY, BLACK, WHITE]), b"010")
+_WHITE_DIGITS = bytes.maketrans(bytes([EMPTY, BLACK, WHITE]), b"001")
+_DIGIT_BLACK = bytes.maketrans(b"01", bytes([EMPTY, BLACK]))
+_DIGIT_WHITE = bytes.maketrans(b"01", bytes([EMPTY, WHITE]))
+_CODES = bytes([EMPTY, BLACK, WHITE])
+
+class Position:
+  """The discs of a board and nothing else: one byte per square, A1 first and row by row, as in Othello.bitboards.
+
+  A position takes a couple of hundred bytes on an 8x8 board, so large numbers of them can be
+  kept for search frontiers, sessions or databases. from_bytes uses the buffer it is given instead
+  of copying, so positions can live inside one large buffer or a memory-mapped file. A read-only
+  buffer is copied on the first write to the position, never written through.
+  """
+  __slots__ = ("size", "cells")
+
+  size: int
+  cells: Union[bytearray, memoryview] # One cell code per square, a read-only view until the first write
+
+  def __init__(self, size: int, cells: Union[bytearray, memoryview, None]=None):
+    """Creates a position, empty or from cell codes
+
+    :param int size: Size of the board
+    :param Union[bytearray, memoryview, None] cells: Cell codes to use as they are, without copying. None for an empty board.
+    :raises ValueError: If there isn't one cell per square
+    """
+    if cells is None:
+      cells = bytearray(size * size)
+    elif len(cells) != size * size:
+      raise ValueError(f"A {size}x{size} position needs {size * size} cells, not {len(cells)}.")
+    self.size = size
+    self.cells = cells
+
+  @classmethod
+  def from_bitboards(cls, black: int, white: int, size: int) -> "Position":
+    """Creates a position from a pair of bitboards
+
+    :param int black: Bitboard of black discs
+    :param int white: Bitboard of white discs, must not overlap the black ones
+    :param int size: Size of the board
+    :raises ValueError: If the bitboards overlap or have discs off the board
+    :return Position: The new position
+    """
+    squares = size * size
+    if black & white or (black | white) >> squares:
+      raise ValueError("Bitboards overlap or have discs off the board.")
+    black_cells = format(black, f"0{squares}b")[::-1].encode().translate(_DIGIT_BLACK)
+    white_cells = format(white, f"0{squares}b")[::-1].encode().translate(_DIGIT_WHITE)
+    # The two never overlap, so OR-ing them as numbers merges them cell by cell
+    merged = int.from_bytes(black_cells, "little") | int.from_bytes(white_cells, "little")
+    return cls(size, bytearray(merged.to_bytes(squares, "little")))
+
+  @classmethod
+  def from_bytes(cls, data: Union[bytes, bytearray, memoryview]) -> "Position":
+    """Creates a position from cell codes, such as those returned by to_bytes. The size is worked out
+    from the length. The buffer is used directly: writes to the position go to a writable buffer,
+    while a read-only one is copied the first time the position changes.
+
+    :param Union[bytes, bytearray, memoryview] data: One cell code per square
+    :raises ValueError: If the length isn't the square of a board size or a cell code is invalid
+    :return Position: The position
+    """
+    view = memoryview(data).cast("B") if not isinstance(data, bytearray) else data
+    size = isqrt(len(view))
+    if size * size != len(view) or not 6 <= size <= 26 or size % 2:
+      raise ValueError(f"{len(view)} cells is not a board of an even size between 6 and 26.")
+    if bytes(view).translate(None, _CODES):
+      raise ValueError("Cell codes must be EMPTY, BLACK or WHITE.")
+    return cls(size, view)
+
+  def to_bytes(self) -> bytes:
+    """Returns a snapshot of the cells. It is a copy, so later changes to the position don't show in it.
+
+    :return bytes: One cell code per square
+    """
+    return bytes(self.cells)
+
+  def copy(self) -> "Position":
+    """Returns an independent copy, a single copy of the cells
+
+    :return Position: The copy
+    """
+    return Position(self.size, bytearray(self.cells))
+
+  __copy__ = copy
+
+  def bitboards(self) -> tuple[int, int]:
+    """Returns the discs as bitboards
+
+    :return tuple[int, int]: The black and white bitboards
+    """
+    cells = self.cells if isinstance(self.cells, bytearray) else bytes(self.cells)
+    return int(cells.translate(_BLACK_DIGITS)[::-1], 2), int(cells.translate(_WHITE_DIGITS)[::-1], 2)
+
+  def count(self, code: int) -> int:
+    """Counts the squares holding a cell code
+
+    :param int code: EMPTY, BLACK or WHITE
+    :return int: Number of squares
+    """
+    cells = self.cells if isinstance(self.cells, bytearray) else bytes(self.cells)
+    return cells.count(code)
+
+  def __getitem__(self, index: int) -> int:
+    return self.cells[index]
+
+  def __setitem__(self, index: int, code: int) -> None:
+    if isinstance(self.cells, memoryview) and self.cells.readonly:
+      self.cells = bytearray(self.cells)
+    self.cells[index] = code
+
+  def __len__(self) -> int:
+    return len(self.cells)
+
+  def __eq__(self, other: object) -> bool:
+    if not isinstance(other, Position):
+      return NotImplemented
+    return self.size == other.size and self.cells == other.cells
+
+  __hash__ = None # Positions can change, so they can't be dict keys; use position.to_bytes() instead
+
+  def __repr__(self) -> str:
+    return f"Position(size={self.size}, black={self.count(BLACK)}, white={self.count(WHITE)})"
@@ -0,0 +1,167 @@
+import struct
+import sys
+from array import array
+from time import time
+from typing import BinaryIO, Iterator, NamedTuple, Union
+from Othello.othello import Othello
+
+MAGIC = b"OTGR"
+VERSION = 1
+PASS = -1 # Move value for a turn the player had to skip
+
+# magic, version, board size, start time in microseconds since the epoch, move count,
+# then the byte lengths of the black and white player names
+HEADER = struct.Struct("<4sBBqHBB")
+WRITE_BUFFER = 1 << 20
+
+class GameRecord(NamedTuple):
+  """One game: board size, start time, players, and every move including passes.
+  The two passes that end a game are not recorded, see finished_moves."""
+  size: int
+  started: float # Seconds since the epoch
+  black: str
+  white: str
+  moves: tuple[int, ...] # Bit position of each move, see Othello.bitboards, or PASS
+
+  def replay(self) -> Othello:
+    """Plays the moves on a fresh board, checking each one
+
+    :return Othello: The final position
+    """
+    board = Othello(self.size)
+    turn = Othello.Color.BLACK
+    other = Othello.Color.WHITE
+    for number, move in enumerate(self.moves, start=1):
+      if move == PASS:
+        if board.any_valid_move(turn):
+          raise ValueError(f"Move {number}: {turn.name.title()} passed with a valid move available.")
+      elif board.make_move(move, turn) is None:
+        raise ValueError(f"Move {number}: {turn.name.title()} can't play on square {move}.")
+      turn, other = other, turn
+    return board
+
+def _move_format(size: int) -> tuple[str, int]:
+  """Returns the array type code used for moves on a board, and the value used for a pass
+
+  Boards up to 14x14 have fewer than 255 squares, so moves fit in a byte; larger boards use two.
+  """
+  if size * size < 0xFF:
+    return "B", 0xFF
+  return "H", 0xFFFF
+
+def _encode_name(name: str) -> bytes:
+  """Encodes a player name in at most 255 bytes, cutting only between characters"""
+  return name.encode()[:255].decode(errors="ignore").encode()
+
+def encode_game(record: GameRecord) -> bytes:
+  """Packs a game into its binary form
+
+  :param GameRecord record: Game to pack
+  :return bytes: Header, player names and moves
+  """
+  black = _encode_name(record.black)
+  white = _encode_name(record.white)
+  if len(record.moves) > 0xFFFF:
+    raise ValueError("Too many moves for one record.")
+  type_code, pass_code = _move_format(record.size)
+  moves = array(type_code, [pass_code if move == PASS else move for move in record.moves])
+  if sys.byteorder == "big":
+    moves.byteswap()
+  header = HEADER.pack(MAGIC, VERSION, record.size, round(record.started * 1_000_000), len(moves), len(black), len(white))
+  return header + black + white + moves.tobytes()
+
+class GameRecordWriter:
+  """Appends games to a record file through a large write buffer, so the file isn't reopened per move or game"""
+  path: str
+  games: int # Games written since the writer was opened
+
+  def __init__(self, path: str, buffer_size: int=WRITE_BUFFER):
+    self.path = path
+    self.games = 0
+    self._file: BinaryIO = open(path, "ab", buffering=buffer_size)
+
+  def write_game(self, record: GameRecord) -> None:
+    """Appends one game
+
+    :param GameRecord record: Game to write
+    """
+    self._file.write(encode_game(record))
+    self.games += 1
+
+  def flush(self) -> None:
+    self._file.flush()
+
+  def close(self) -> None:
+    self._file.close()
+
+  def __enter__(self) -> "GameRecordWriter":
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self.close()
+
+def iter_games(stream: BinaryIO) -> Iterator[GameRecord]:
+  """Yields the games in a binary stream one at a time, reading only as far as each game
+
+  :param BinaryIO stream: Stream positioned at the start of a game
+  :return Iterator[GameRecord]: The games, in file order
+  """
+  while True:
+    header = stream.read(HEADER.size)
+    if not header:
+      return
+    if len(header) < HEADER.size:
+      raise ValueError("Truncated game record header.")
+    magic, version, size, started, count, black_length, white_length = HEADER.unpack(header)
+    if magic != MAGIC:
+      raise ValueError("Not a game record, or the file is corrupted.")
+    if version != VERSION:
+      raise ValueError(f"Unsupported game record version: {version}")
+
+    names = stream.read(black_length + white_length)
+    type_code, pass_code = _move_format(size)
+    moves = array(type_code)
+    body = stream.read(count * moves.itemsize)
+    if len(names) < black_length + white_length or len(body) < count * moves.itemsize:
+      raise ValueError("Truncated game record.")
+    moves.frombytes(body)
+    if sys.byteorder == "big":
+      moves.byteswap()
+    yield GameRecord(
+      size,
+      started / 1_000_000,
+      names[:black_length].decode(),
+      names[black_length:].decode(),
+      tuple(PASS if move == pass_code else move for move in moves),
+    )
+
+def read_games(path: str) -> Iterator[GameRecord]:
+  """Lazily yields every game in a record file
+
+  :param str path: Record file written by GameRecordWriter
+  :return Iterator[GameRecord]: The games, in file order
+  """
+  with open(path, "rb") as f:
+    yield from iter_games(f)
+
+def finished_moves(moves: Union[list[int], tuple[int, ...]]) -> tuple[int, ...]:
+  """Drops the two passes that end a game, which every record leaves out so the final position
+  is the one after the last disc placed
+
+  :param list[int]|tuple[int, ...] moves: Moves as played, PASS for skipped turns
+  :return tuple[int, ...]: The moves to record
+  """
+  if len(moves) >= 2 and moves[-1] == PASS and moves[-2] == PASS:
+    moves = moves[:-2]
+  return tuple(moves)
+
+def new_record(size: int, black: str, white: str, moves: Union[list[int], None]=None) -> GameRecord:
+  """Creates a record for a game starting now
+
+  :param int size: Size of the board
+  :param str black: Name of the black player
+  :param str white: Name of the white player
+  :param Union[list[int], None] moves: Moves played so far
+  :return GameRecord: The record
+  """
+  return GameRecord(size, time(), black, white, tuple(moves or ()))
@@ -0,0 +1,107 @@
+import shutil
+import sys
+from typing import TYPE_CHECKING, TextIO
+
+if TYPE_CHECKING:
+  from Othello.othello import Othello
+
+EMPTY_CELL = "· " # Two columns wide, like the disc emoji
+CELL_WIDTH = 3 # Cell plus a separating space
+ROW_LABEL_WIDTH = 3
+
+ESC = "\x1b"
+
+class TerminalRenderer:
+  """Draws a board with ANSI escape codes and redraws only the cells that changed since the last draw.
+
+  The board is pinned to the top of the screen and anything printed afterwards scrolls in the
+  region below it, so cells can be rewritten in place.
+  """
+  _stream: TextIO
+  _size: int # Size of the board currently on screen, 0 before the first draw
+  _black: int # Bitboards as they were last drawn
+  _white: int
+
+  def __init__(self, stream: TextIO=sys.stdout):
+    self._stream = stream
+    self._size = 0
+    self._black = 0
+    self._white = 0
+
+  def draw(self, board: "Othello") -> int:
+    """Brings the screen up to date with the board
+
+    :param Othello board: Board to draw
+    :return int: Number of cells written
+    """
+    black, white = board.bitboards()
+    if board.size != self._size:
+      self._draw_full(board, black, white)
+      return board.size * board.size
+
+    changed = (black ^ self._black) | (white ^ self._white)
+    cells = 0
+    parts = [f"{ESC}7"] # save cursor
+    while changed:
+      low = changed & -changed
+      index = low.bit_length() - 1
+      row, column = divmod(index, self._size)
+      parts.append(f"{ESC}[{row + 2};{ROW_LABEL_WIDTH + column * CELL_WIDTH + 1}H")
+      parts.append(self._cell(board, black, white, low))
+      changed ^= low
+      cells += 1
+    parts.append(f"{ESC}8") # restore cursor
+
+    if cells:
+      self._stream.write("".join(parts))
+      self._stream.flush()
+    self._black = black
+    self._white = white
+    return cells
+
+  def close(self) -> None:
+    """Releases the scroll region so the terminal behaves normally again
+    """
+    if self._size:
+      self._stream.write(f"{ESC}[r")
+      self._stream.flush()
+    self._size = 0
+
+  def _draw_full(self, board: "Othello", black: int, white: int) -> None:
+    """Clears the screen and draws the whole board, then sets the scroll region below it
+
+    :param Othello board: Board to draw
+    :param int black: Black bitboard
+    :param int white: White bitboard
+    """
+    size = board.size
+    lines = [" " * ROW_LABEL_WIDTH + "".join(f"{chr(65 + column):<{CELL_WIDTH}}" for column in range(size))]
+    for row in range(size):
+      cells = " ".join(self._cell(board, black, white, 1 << (row * size + column)) for column in range(size))
+      lines.append(f"{row + 1:>{ROW_LABEL_WIDTH - 1}} {cells}")
+
+    height = shutil.get_terminal_size().lines
+    first_free_line = size + 3
+    self._stream.write(f"{ESC}[2J{ESC}[H" + "\n".join(lines) + "\n")
+    if height > first_free_line:
+      self._stream.write(f"{ESC}[{first_free_line};{height}r{ESC}[{first_free_line};1H")
+    self._stream.flush()
+    self._size = size
+    self._black = black
+    self._white = white
+
+  @staticmethod
+  def _cell(board: "Othello", black: int, white: int, bit: int) -> str:
+    """Returns the text for one cell
+
+    :param Othello board: Board being drawn
+    :param int black: Black bitboard
+    :param int white: White bitboard
+    :param int bit: Bit of the cell
+    :return str: Disc emoji or the empty cell marker
+    """
+    if black & bit:
+      return board.Color.BLACK.value
+    if white & bit:
+      return board.Color.WHITE.value
+    return EMPTY_CELL
@@ -0,0 +1,472 @@
+import argparse
+import asyncio
+import inspect
+import itertools
+import logging
+import os
+import random
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from time import monotonic, perf_counter
+from typing import NamedTuple, Union
+from Othello.othello import Othello, SIZE
+from Othello.ai import make_player
+from Othello.engine import BOARD_CHARACTERS, EMPTY_CHARACTER, ProtocolError
+from Othello.tournament import parse_player_spec
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7070
+IDLE_TIMEOUT = 300.0 # Seconds a connection or session may go without a command before it is dropped
+SWEEP_INTERVAL = 5.0 # Seconds between checks for idle sessions
+LATENCY_SAMPLES = 10_000 # Most recent move latencies kept for the percentiles
+HUMAN = "human"
+
+_log = logging.getLogger(__name__)
+
+BLACK = 0 # Seat numbers, matching the order of Othello.bitboards
+WHITE = 1
+SEAT_NAMES = ("black", "white")
+SEAT_COLORS = (Othello.Color.BLACK, Othello.Color.WHITE)
+
+class ServerStats(NamedTuple):
+  """What the server has done since it started"""
+  sessions_served: int # Sessions ever created
+  active_sessions: int
+  connections: int # Clients connected right now
+  moves: int # Moves played by humans and bots
+  p50_ms: float # Median time from receiving a play command to answering it, bot replies included
+  p99_ms: float
+
+  def __str__(self) -> str:
+    return (f"{self.sessions_served:,} sessions served, {self.active_sessions:,} active, {self.connections:,} connections, "
+      f"{self.moves:,} moves, move latency p50 {self.p50_ms:.2f} ms, p99 {self.p99_ms:.2f} ms")
+
+def percentile(samples: list[float], fraction: float) -> float:
+  """Returns the nearest-rank percentile of some samples
+
+  :param list[float] samples: Values, in any order
+  :param float fraction: Between 0 and 1, e.g. 0.99
+  :return float: The value at that rank, 0.0 if there are no samples
+  """
+  if not samples:
+    return 0.0
+  ordered = sorted(samples)
+  return ordered[min(len(ordered) - 1, max(0, int(fraction * len(ordered) + 0.5) - 1))]
+
+class _Rules:
+  """One untouched board per size, used only for its bitboard helpers so sessions don't need boards of their own"""
+  _cache: dict[int, Othello] = {}
+
+  @classmethod
+  def for_size(cls, size: int) -> Othello:
+    board = cls._cache.get(size)
+    if board is None:
+      board = cls._cache[size] = Othello(size, errors="raise")
+    return board
+
+class Session:
+  """One game. Only the discs are kept, as two bitboards, so thousands of idle sessions stay small."""
+  __slots__ = ("id", "size", "discs", "turn", "bot", "seats", "last_active", "moves")
+
+  id: int
+  size: int
+  discs: list[int] # Black and white bitboards
+  turn: int # BLACK or WHITE, the seat to move
+  bot: Union[str, None] # Player spec of the bot sitting in the white seat, None when two humans play
+  seats: list[Union["Connection", None]] # Who sits in each seat
+  last_active: float # monotonic() time of the last command
+  moves: int
+
+  def __init__(self, session_id: int, size: int, bot: Union[str, None]):
+    self.id = session_id
+    self.size = size
+    self.discs = list(_Rules.for_size(size).bitboards())
+    self.turn = BLACK
+    self.bot = bot
+    self.seats = [None, None]
+    self.last_active = monotonic()
+    self.moves = 0
+
+  def legal(self, seat: int) -> int:
+    return _Rules.for_size(self.size).legal_mask(self.discs[seat], self.discs[1 - seat])
+
+  @property
+  def over(self) -> bool:
+    return not self.legal(BLACK) and not self.legal(WHITE)
+
+  def play(self, seat: int, index: int) -> bool:
+    """Plays a move for a seat, then passes the turn on, skipping a seat that has no valid move
+
+    :param int seat: BLACK or WHITE
+    :param int index: Bit position of the move
+    :return bool: False if the move isn't legal
+    """
+    if not self.legal(seat) >> index & 1:
+      return False
+    flips = _Rules.for_size(self.size).flip_mask(index, self.discs[seat], self.discs[1 - seat])
+    self.discs[seat] |= flips | (1 << index)
+    self.discs[1 - seat] &= ~flips
+    self.moves += 1
+    if self.legal(1 - seat):
+      self.turn = 1 - seat
+    return True
+
+  def board_rows(self) -> list[str]:
+    black, white = self.discs
+    rows = []
+    for row in range(self.size):
+      cells = []
+      for index in range(row * self.size, (row + 1) * self.size):
+        color = SEAT_COLORS[BLACK] if black >> index & 1 else SEAT_COLORS[WHITE] if white >> index & 1 else None
+        cells.append(BOARD_CHARACTERS[color.value] if color else EMPTY_CHARACTER)
+      rows.append("".join(cells))
+    return rows
+
+class Connection:
+  """A connected client and the seat it holds, if any"""
+  __slots__ = ("writer", "session", "seat")
+
+  writer: asyncio.StreamWriter
+  session: Union[Session, None]
+  seat: int
+
+  def __init__(self, writer: asyncio.StreamWriter):
+    self.writer = writer
+    self.session = None
+    self.seat = BLACK
+
+  def send(self, text: str) -> None:
+    if not self.writer.is_closing():
+      self.writer.write(text.encode())
+
+# Players made so far in this worker process, by spec and board size
+_bot_players: dict[tuple[str, int], object] = {}
+
+def _bot_move(spec: str, size: int, black: int, white: int, seat: int, seed: int) -> Union[int, None]:
+  """Chooses a bot's move. Runs in an executor, so it must only take and return plain values.
+
+  :return Union[int, None]: Bit position of the move, None to pass
+  """
+  player = _bot_players.get((spec, size))
+  if player is None:
+    name, time_limit = parse_player_spec(spec)
+    player = _bot_players[spec, size] = make_player(name, time_limit, size=size)
+  if hasattr(player, "seed"):
+    player.seed(seed)
+  board = Othello.from_bitboards(black, white, size, errors="raise")
+  square = player.choose_move(board, SEAT_COLORS[seat])
+  return None if square is None else board.square_index(square)
+
+class GameServer:
+  """Hosts many Othello sessions over a line protocol on a TCP socket, all on one event loop.
+
+  Like the engine protocol, each command is one line and each response starts with "=" on
+  success or "?" on failure and ends with an empty line. Lines starting with "!" can arrive
+  at any time, telling a client what its opponent did.
+
+    new [size] [opponent]    start a session and take the black seat. The opponent is "human"
+                             (the default, someone joins with the session id) or a player spec
+                             such as alphabeta:0.5. Responds with the session id.
+    join <id>                take the white seat of a session waiting for a human
+    play <square>            move in your session. Responds with any moves the bot made in reply.
+    board                    the board, one row per line as in the engine protocol
+    status                   whose turn it is ("black", "white" or "over") and the disc counts
+    valid                    your valid moves
+    leave                    give up your seat
+    stats                    sessions served, active sessions and move latency
+    quit                     close the connection
+
+  Bot moves are chosen in an executor (a process pool by default), so searches never stall the
+  loop. Connections that send nothing for idle_timeout seconds are closed, and sessions nobody
+  has played in for that long are dropped.
+  """
+  host: str
+  port: int
+  idle_timeout: float
+  sessions: dict[int, Session]
+  sessions_served: int
+  moves: int
+
+  def __init__(self, host: str=DEFAULT_HOST, port: int=DEFAULT_PORT, idle_timeout: float=IDLE_TIMEOUT,
+      executor: Union[Executor, None]=None, workers: int=1, seed: Union[int, None]=None):
+    """Sets up a server, which doesn't listen until start is awaited
+
+    :param str host: Address to listen on
+    :param int port: Port to listen on, 0 for any free port (see port once started)
+    :param float idle_timeout: Seconds without a command before a connection or session is dropped
+    :param Union[Executor, None] executor: Where bot moves are chosen, a new process pool if None
+    :param int workers: Processes in that pool, 0 for one per CPU
+    :param Union[int, None] seed: Seed for bots that make random choices
+    """
+    self.host = host
+    self.port = port
+    self.idle_timeout = idle_timeout
+    self.sessions = {}
+    self.sessions_served = 0
+    self.moves = 0
+    self._executor = executor
+    self._owns_executor = executor is None
+    self._workers = workers if workers > 0 else os.cpu_count() or 1
+    self._random = random.Random(seed)
+    self._ids = itertools.count(1)
+    self._connections: set[Connection] = set()
+    self._tasks: set[asyncio.Task] = set() # One per connection, serving it
+    self._latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+    self._server: Union[asyncio.AbstractServer, None] = None
+    self._sweeper: Union[asyncio.Task, None] = None
+
+  async def start(self) -> None:
+    """Starts listening, and sweeping idle sessions
+    """
+    if self._executor is None:
+      self._executor = ProcessPoolExecutor(max_workers=self._workers)
+    self._server = await asyncio.start_server(self._serve, self.host, self.port, limit=4096)
+    self.port = self._server.sockets[0].getsockname()[1]
+    self._sweeper = asyncio.create_task(self._sweep())
+
+  async def serve_forever(self) -> None:
+    """Serves until cancelled, starting first if needed
+    """
+    if self._server is None:
+      await self.start()
+    await self._server.serve_forever()
+
+  async def close(self) -> None:
+    """Stops listening and disconnects every client
+    """
+    if self._sweeper is not None:
+      self._sweeper.cancel()
+    if self._server is not None:
+      self._server.close()
+    for connection in list(self._connections):
+      connection.writer.close()
+    if self._tasks: # closing the writers ends every handler at its next read
+      await asyncio.wait(self._tasks, timeout=1.0)
+    if self._server is not None:
+      await self._server.wait_closed()
+    if self._owns_executor and self._executor is not None:
+      self._executor.shutdown(wait=False, cancel_futures=True)
+      self._executor = None
+
+  def stats(self) -> ServerStats:
+    latencies = list(self._latencies)
+    return ServerStats(self.sessions_served, len(self.sessions), len(self._connections), self.moves,
+      percentile(latencies, 0.5) * 1000, percentile(latencies, 0.99) * 1000)
+
+  async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    connection = Connection(writer)
+    self._connections.add(connection)
+    task = asyncio.current_task()
+    self._tasks.add(task)
+    try:
+      while True:
+        try:
+          line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+        except asyncio.TimeoutError:
+          connection.send("! idle timeout\n\n")
+          break
+        except (ConnectionError, ValueError): # ValueError is a line over the stream limit
+          break
+        if not line:
+          break
+        command = line.decode(errors="replace").strip()
+        try:
+          response = await self.handle(connection, command)
+        except Exception: # A broken bot pool or a bug in one session must not end the connection silently
+          _log.exception("Command %r failed", command)
+          connection.send("? internal error, closing the connection\n\n")
+          await writer.drain()
+          break
+        if response is None:
+          break
+        connection.send(response)
+        await writer.drain()
+    except ConnectionError:
+      pass
+    finally:
+      self._leave(connection)
+      self._connections.discard(connection)
+      self._tasks.discard(task)
+      writer.close()
+
+  async def handle(self, connection: Connection, line: str) -> Union[str, None]:
+    """Runs one command for a client
+
+    :param Connection connection: Who sent it
+    :param str line: The command line, without its line ending
+    :return Union[str, None]: The full response, "" for a blank line, None once the client quits
+    """
+    words = line.split()
+    if not words:
+      return ""
+    command, arguments = words[0].lower(), words[1:]
+    if command == "quit":
+      return None
+    handler = getattr(self, f"_command_{command}", None)
+    if handler is None:
+      return f"? unknown command: {command}\n\n"
+    try:
+      inspect.signature(handler).bind(connection, *arguments)
+    except TypeError:
+      return f"? wrong number of arguments for {command}\n\n"
+    start = perf_counter()
+    try:
+      result = await handler(connection, *arguments)
+    except ProtocolError as error:
+      return f"? {error}\n\n"
+    if connection.session is not None:
+      connection.session.last_active = monotonic()
+    if command == "play":
+      self._latencies.append(perf_counter() - start)
+    return f"= {result}\n\n" if result else "=\n\n"
+
+  def _seated(self, connection: Connection) -> Session:
+    if connection.session is None:
+      raise ProtocolError("not in a session")
+    return connection.session
+
+  def _leave(self, connection: Connection) -> None:
+    session = connection.session
+    if session is None:
+      return
+    session.seats[connection.seat] = None
+    connection.session = None
+    opponent = session.seats[1 - connection.seat]
+    if opponent is not None:
+      opponent.send(f"! left {SEAT_NAMES[connection.seat]}\n\n")
+    if session.seats == [None, None]:
+      self.sessions.pop(session.id, None)
+
+  async def _sweep(self) -> None:
+    while True:
+      await asyncio.sleep(min(SWEEP_INTERVAL, self.idle_timeout))
+      cutoff = monotonic() - self.idle_timeout
+      for session in [session for session in self.sessions.values() if session.last_active < cutoff]:
+        for connection in session.seats:
+          if connection is not None:
+            connection.send("! session closed, idle timeout\n\n")
+            connection.session = None
+        del self.sessions[session.id]
+
+  async def _command_new(self, connection: Connection, size: str=str(SIZE), opponent: str=HUMAN) -> str:
+    try:
+      size_value = int(size)
+      _Rules.for_size(size_value)
+    except ValueError:
+      raise ProtocolError(f"invalid size: {size}")
+    bot = None
+    if opponent != HUMAN:
+      try:
+        name, time_limit = parse_player_spec(opponent)
+        make_player(name, time_limit, size=size_value) # Fails now, not on the bot's first move, if it cannot play this size
+      except (ValueError, FileNotFoundError) as error:
+        raise ProtocolError(str(error))
+      bot = opponent
+    self._leave(connection)
+    session = Session(next(self._ids), size_value, bot)
+    session.seats[BLACK] = connection
+    connection.session, connection.seat = session, BLACK
+    self.sessions[session.id] = session
+    self.sessions_served += 1
+    return str(session.id)
+
+  async def _command_join(self, connection: Connection, session_id: str) -> str:
+    session = self.sessions.get(int(session_id)) if session_id.isdigit() else None
+    if session is None:
+      raise ProtocolError(f"no session {session_id}")
+    if session.bot is not None or session.seats[WHITE] is not None:
+      raise ProtocolError(f"session {session_id} is full")
+    self._leave(connection)
+    session.seats[WHITE] = connection
+    connection.session, connection.seat = session, WHITE
+    if session.seats[BLACK] is not None:
+      session.seats[BLACK].send("! joined white\n\n")
+    return SEAT_NAMES[WHITE]
+
+  async def _command_play(self, connection: Connection, square: str) -> str:
+    session = self._seated(connection)
+    if session.over:
+      raise ProtocolError("the game is over")
+    if session.turn != connection.seat:
+      raise ProtocolError("not your turn")
+    index = _Rules.for_size(session.size).square_index(square)
+    if index is None or not session.play(connection.seat, index):
+      raise ProtocolError(f"illegal move: {square}")
+    self.moves += 1
+    opponent = session.seats[1 - connection.seat]
+    if opponent is not None:
+      opponent.send(f"! play {SEAT_NAMES[connection.seat]} {square.upper()}\n\n")
+    replies = []
+    while session.bot is not None and session.turn == WHITE and not session.over:
+      replies.append(await self._bot_reply(session))
+    return " ".join(replies)
+
+  async def _bot_reply(self, session: Session) -> str:
+    black, white = session.discs
+    loop = asyncio.get_running_loop()
+    index = await loop.run_in_executor(self._executor, _bot_move, session.bot, session.size, black, white, WHITE,
+      self._random.getrandbits(32))
+    if session.discs != [black, white] or session.id not in self.sessions:
+      raise ProtocolError("the session changed while the bot was thinking")
+    if index is None or not session.play(WHITE, index):
+      raise ProtocolError("the bot could not move") # only possible if the bot misbehaves
+    self.moves += 1
+    return _Rules.for_size(session.size).square_name(index)
+
+  async def _command_board(self, connection: Connection) -> str:
+    return "\n".join(self._seated(connection).board_rows())
+
+  async def _command_status(self, connection: Connection) -> str:
+    session = self._seated(connection)
+    state = "over" if session.over else SEAT_NAMES[session.turn]
+    return f"{state} {session.discs[BLACK].bit_count()} {session.discs[WHITE].bit_count()}"
+
+  async def _command_valid(self, connection: Connection) -> str:
+    session = self._seated(connection)
+    rules = _Rules.for_size(session.size)
+    legal = session.legal(connection.seat)
+    return " ".join(rules.square_name(index) for index in range(session.size ** 2) if legal >> index & 1)
+
+  async def _command_leave(self, connection: Connection) -> str:
+    self._seated(connection)
+    self._leave(connection)
+    return ""
+
+  async def _command_stats(self, connection: Connection) -> str:
+    return str(self.stats())
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+  """Parses the command line arguments for the server
+
+  :param list[str] argv: Arguments, not including the script name
+  :return argparse.Namespace: The parsed arguments
+  """
+  parser = argparse.ArgumentParser(description="Host many Othello games over a line protocol on a TCP socket.")
+  parser.add_argument("--host", default=DEFAULT_HOST, help="Address to listen on")
+  parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+  parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT, help="Seconds before an idle connection or session is dropped")
+  parser.add_argument("--workers", type=int, default=1, help="Processes that choose bot moves, 0 for one per CPU")
+  parser.add_argument("--seed", type=int, default=None, help="Seed for bots that make random choices")
+  return parser.parse_args(argv)
+
+def main(argv: Union[list[str], None]=None) -> None:
+  args = parse_args(sys.argv[1:] if argv is None else argv)
+  server = GameServer(args.host, args.port, args.idle_timeout, workers=args.workers, seed=args.seed)
+
+  async def run() -> None:
+    await server.start()
+    print(f"Serving Othello on {server.host}:{server.port}", flush=True)
+    try:
+      await server.serve_forever()
+    finally:
+      await server.close()
+
+  try:
+    asyncio.run(run())
+  except KeyboardInterrupt:
+    pass
+  print(server.stats())
+
+if __name__ == "__main__":
+  main()
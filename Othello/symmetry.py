@@ -0,0 +1,148 @@
+from typing import NamedTuple
+
+# The eight symmetries of a square board. Each maps the square at (row, column) somewhere else.
+IDENTITY = 0
+ROTATE_90 = 1 # Clockwise
+ROTATE_180 = 2
+ROTATE_270 = 3
+MIRROR = 4 # Columns reversed, (row, column) -> (row, size - 1 - column)
+FLIP = 5 # Rows reversed, (row, column) -> (size - 1 - row, column)
+TRANSPOSE = 6 # (row, column) -> (column, row)
+ANTI_TRANSPOSE = 7 # (row, column) -> (size - 1 - column, size - 1 - row)
+TRANSFORMS = (IDENTITY, ROTATE_90, ROTATE_180, ROTATE_270, MIRROR, FLIP, TRANSPOSE, ANTI_TRANSPOSE)
+
+# Undoing a rotation needs the opposite rotation; every other transform undoes itself
+INVERSE = (IDENTITY, ROTATE_270, ROTATE_180, ROTATE_90, MIRROR, FLIP, TRANSPOSE, ANTI_TRANSPOSE)
+
+class CanonicalPosition(NamedTuple):
+  """A position mapped to its canonical form"""
+  black: int
+  white: int
+  transform: int # Applied to the original position to get this one, see INVERSE to map moves back
+
+def _map_square(row: int, column: int, size: int, transform: int) -> tuple[int, int]:
+  last = size - 1
+  return (
+    (row, column),
+    (column, last - row),
+    (last - row, last - column),
+    (last - column, row),
+    (row, last - column),
+    (last - row, column),
+    (column, row),
+    (last - column, last - row),
+  )[transform]
+
+class _SquareMaps:
+  """Where every square goes under each transform, for one board size"""
+  _cache: dict[int, tuple[tuple[int, ...], ...]] = {}
+
+  @classmethod
+  def for_size(cls, size: int) -> tuple[tuple[int, ...], ...]:
+    maps = cls._cache.get(size)
+    if maps is None:
+      maps = cls._cache[size] = tuple(
+        tuple(
+          row * size + column
+          for row, column in (_map_square(index // size, index % size, size, transform) for index in range(size * size))
+        )
+        for transform in TRANSFORMS
+      )
+    return maps
+
+def transform_square(index: int, transform: int, size: int) -> int:
+  """Returns where a square ends up under a transform
+
+  :param int index: Bit position of the square, see Othello.bitboards
+  :param int transform: One of TRANSFORMS
+  :param int size: Size of the board
+  :return int: Bit position of the transformed square
+  """
+  return _SquareMaps.for_size(size)[transform][index]
+
+def untransform_square(index: int, transform: int, size: int) -> int:
+  """Maps a square of a transformed position back to the original position, e.g. a move found in a canonical position
+
+  :param int index: Bit position in the transformed position
+  :param int transform: The transform that produced that position
+  :param int size: Size of the board
+  :return int: Bit position in the original position
+  """
+  return _SquareMaps.for_size(size)[INVERSE[transform]][index]
+
+# Bit-reversed value of every byte, for mirroring the rows of an 8x8 board
+_REVERSED_BYTES = bytes(int(f"{value:08b}"[::-1], 2) for value in range(256))
+
+def _transpose_8x8(bitboard: int) -> int:
+  """Transposes a 64-bit board with three delta swaps, each exchanging bits across the diagonal"""
+  for shift, mask in ((7, 0x00AA00AA00AA00AA), (14, 0x0000CCCC0000CCCC), (28, 0x00000000F0F0F0F0)):
+    swap = (bitboard ^ (bitboard >> shift)) & mask
+    bitboard ^= swap ^ (swap << shift)
+  return bitboard
+
+def _transform_8x8(bitboard: int, transform: int) -> int:
+  """Transforms an 8x8 board with byte operations, one byte per row"""
+  if transform == IDENTITY:
+    return bitboard
+  if transform in (TRANSPOSE, ROTATE_90, ROTATE_270, ANTI_TRANSPOSE):
+    bitboard = _transpose_8x8(bitboard)
+    transform = {TRANSPOSE: IDENTITY, ROTATE_90: MIRROR, ROTATE_270: FLIP, ANTI_TRANSPOSE: ROTATE_180}[transform]
+    if transform == IDENTITY:
+      return bitboard
+  rows = bitboard.to_bytes(8, "little")
+  if transform == MIRROR:
+    return int.from_bytes(rows.translate(_REVERSED_BYTES), "little")
+  if transform == FLIP:
+    return int.from_bytes(rows, "big")
+  return int.from_bytes(rows.translate(_REVERSED_BYTES), "big") # ROTATE_180
+
+def _transform_any(bitboard: int, transform: int, size: int) -> int:
+  """Transforms a board of any size by slicing its binary digits into rows"""
+  if transform == IDENTITY:
+    return bitboard
+  squares = size * size
+  bits = format(bitboard, f"0{squares}b")[::-1] # bits[i] is square i
+  if transform == ROTATE_180:
+    return int(bits, 2)
+  rows = [bits[start:start + size] for start in range(0, squares, size)]
+  if transform in (TRANSPOSE, ROTATE_90, ROTATE_270, ANTI_TRANSPOSE):
+    rows = ["".join(column) for column in zip(*rows)]
+    transform = {TRANSPOSE: IDENTITY, ROTATE_90: MIRROR, ROTATE_270: FLIP, ANTI_TRANSPOSE: ROTATE_180}[transform]
+  if transform == MIRROR:
+    rows = [row[::-1] for row in rows]
+  elif transform == FLIP:
+    rows.reverse()
+  elif transform == ROTATE_180:
+    rows = [row[::-1] for row in reversed(rows)]
+  return int("".join(rows)[::-1], 2)
+
+def transform_bitboard(bitboard: int, transform: int, size: int) -> int:
+  """Applies a symmetry to a bitboard
+
+  :param int bitboard: Discs, see Othello.bitboards for the numbering
+  :param int transform: One of TRANSFORMS
+  :param int size: Size of the board
+  :return int: The transformed discs
+  """
+  if size == 8:
+    return _transform_8x8(bitboard, transform)
+  return _transform_any(bitboard, transform, size)
+
+def canonicalize(black: int, white: int, size: int) -> CanonicalPosition:
+  """Maps a position to the one of its eight symmetric forms with the smallest (black, white) pair.
+  Symmetric positions always give the same canonical form, so it can key tables and books.
+
+  :param int black: Bitboard of black discs
+  :param int white: Bitboard of white discs
+  :param int size: Size of the board
+  :return CanonicalPosition: The canonical discs and the transform that produced them
+  """
+  best = CanonicalPosition(black, white, IDENTITY)
+  for transform in TRANSFORMS[1:]:
+    transformed_black = transform_bitboard(black, transform, size)
+    if transformed_black > best.black:
+      continue
+    transformed_white = transform_bitboard(white, transform, size)
+    if (transformed_black, transformed_white) < (best.black, best.white):
+      best = CanonicalPosition(transformed_black, transformed_white, transform)
+  return best
@@ -0,0 +1,28 @@
+from Othello.othello import Othello
+from Othello.ai import AlphaBetaPlayer, make_player
+
+def test_choose_move_leaves_board_unchanged():
+  test_board = Othello(8)
+  before = test_board._board_dict
+  player = AlphaBetaPlayer(time_limit=0.2)
+  move = player.choose_move(test_board, Othello.Color.BLACK)
+  assert move in test_board.all_valid_moves(Othello.Color.BLACK)[1]
+  assert test_board._board_dict == before
+  assert player.last_stats.depth >= 1
+  assert player.last_stats.nodes > 0
+
+def test_choose_move_takes_corner():
+  test_board = Othello(6)
+  test_board.set_squares(['B2', 'C3'], Othello.Color.WHITE)
+  test_board.set_squares(['D4'], Othello.Color.BLACK)
+  player = AlphaBetaPlayer(time_limit=0.2, max_depth=2)
+  assert player.choose_move(test_board, Othello.Color.BLACK) == 'A1'
+
+def test_choose_move_without_valid_moves():
+  test_board = Othello(6)
+  test_board.set_squares(['B2', 'C2', 'D2', 'D3', 'C4', 'D4', 'B4', 'B3'], Othello.Color.BLACK)
+  assert AlphaBetaPlayer(time_limit=0.1).choose_move(test_board, Othello.Color.BLACK) is None
+
+def test_make_player():
+  assert make_player("human") is None
+  assert make_player("alphabeta", 0.5).time_limit == 0.5
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from Othello.othello import Othello
+from Othello.batch import PASS, BatchOthello
+
+@pytest.mark.parametrize("size", [6, 8, 14])
+def test_batch_matches_check_move(size):
+  batch = BatchOthello(8, size)
+  games = [Othello(size) for _ in range(len(batch))]
+  turns = [Othello.Color.BLACK] * len(batch)
+  generator = np.random.default_rng(size)
+
+  while not batch.finished().all():
+    legal = batch.legal_moves().reshape(len(batch), -1)
+    for game, turn, moves in zip(games, turns, legal):
+      expected = [game.check_move(key, turn)[0] for key in game._geometry.keys]
+      assert moves.tolist() == expected
+
+    moves = batch.random_moves(generator)
+    flipped = batch.play(moves).reshape(len(batch), -1)
+    for i, move in enumerate(moves):
+      if move != PASS:
+        is_valid, spaces_to_flip = games[i].check_move(games[i].square_name(move), turns[i])
+        assert is_valid
+        assert sorted(games[i].square_name(square) for square in np.flatnonzero(flipped[i])) == sorted(spaces_to_flip)
+        games[i].make_move(int(move), turns[i])
+      turns[i] = Othello.Color.WHITE if turns[i] == Othello.Color.BLACK else Othello.Color.BLACK
+      assert batch.to_game(i).bitboards() == games[i].bitboards()
+
+  black, white = batch.disc_counts()
+  assert black.tolist() == [game.count_discs(Othello.Color.BLACK) for game in games]
+  assert white.tolist() == [game.count_discs(Othello.Color.WHITE) for game in games]
+
+def test_play_rejects_illegal_moves():
+  batch = BatchOthello(2, 6)
+  with pytest.raises(ValueError):
+    batch.play(np.array([0, 0]))
+  with pytest.raises(ValueError):
+    batch.play(np.array([PASS, PASS]))
+  with pytest.raises(ValueError):
+    batch.play(np.array([PASS]))
+
+def test_from_games_round_trip():
+  game = Othello(8)
+  game.make_move('D3', Othello.Color.BLACK)
+  batch = BatchOthello.from_games([Othello(8), game], black_to_move=[True, False])
+  assert batch.to_game(1).bitboards() == game.bitboards()
+  assert batch.to_game(0).bitboards() == Othello(8).bitboards()
+  assert batch.black_to_move.tolist() == [True, False]
+  with pytest.raises(ValueError):
+    BatchOthello.from_games([Othello(8), Othello(6)])
@@ -0,0 +1,39 @@
+import json
+from Othello.benchmark import compare, main, random_game, results_to_json, run_benchmarks, PASS
+
+def test_random_game_is_reproducible():
+  moves = random_game(6, 3)
+  assert moves == random_game(6, 3)
+  assert moves[-1] != PASS
+
+def test_run_benchmarks():
+  results = run_benchmarks([6, 8], games=1, perft_depth=3, repeat=1)
+  names = {(result.size, result.name) for result in results}
+  assert (6, "check_move") in names
+  assert (8, "perft_3") in names
+  assert all(result.operations > 0 for result in results)
+  assert [r.operations for r in results if r.name == "perft_3"][1] == 56
+
+def test_compare_flags_regressions_and_mismatches():
+  baseline = {"results": [
+    {"size": 8, "name": "perft_3", "operations": 56, "seconds": 1.0, "operations_per_second": 56.0},
+    {"size": 8, "name": "check_move", "operations": 100, "seconds": 1.0, "operations_per_second": 100.0},
+  ]}
+  current = {"results": [
+    {"size": 8, "name": "perft_3", "operations": 57, "seconds": 0.5, "operations_per_second": 114.0},
+    {"size": 8, "name": "check_move", "operations": 100, "seconds": 2.0, "operations_per_second": 50.0},
+    {"size": 10, "name": "check_move", "operations": 100, "seconds": 1.0, "operations_per_second": 100.0},
+  ]}
+  rows = compare(baseline, current, tolerance=0.1)
+  assert len(rows) == 2
+  assert rows[0]["mismatch"] and not rows[0]["regression"]
+  assert rows[1]["regression"] and rows[1]["ratio"] == 0.5
+
+def test_main_writes_and_compares(tmp_path):
+  output = tmp_path / "results.json"
+  arguments = ["--sizes", "6", "--games", "1", "--perft-depth", "2", "--repeat", "1"]
+  assert main(arguments + ["--output", str(output)]) == 0
+  saved = json.loads(output.read_text())
+  assert saved["version"] == 1
+  assert len(saved["results"]) == 5
+  assert main(arguments + ["--compare", str(output), "--tolerance", "1"]) == 0
@@ -0,0 +1,83 @@
+import pytest
+from Othello.othello import Othello
+from Othello.book import BookPlayer, OpeningBook, collect_book_moves, main, write_book, HEADER
+from Othello.records import GameRecord
+from Othello.ai import RandomPlayer
+
+def _game(moves):
+  return GameRecord(6, 0.0, "a", "b", tuple(moves))
+
+def _play_out(size, seed):
+  board = Othello(size)
+  player = RandomPlayer(seed=seed)
+  moves = []
+  turn, other = Othello.Color.BLACK, Othello.Color.WHITE
+  passes = 0
+  while passes < 2:
+    space = player.choose_move(board, turn)
+    if space is None:
+      passes += 1
+      moves.append(-1)
+    else:
+      passes = 0
+      moves.append(board.make_move(space, turn).square)
+    turn, other = other, turn
+  return moves
+
+def test_collect_picks_moves_seen_often_enough():
+  games = [_game(_play_out(6, seed)) for seed in range(6)]
+  book = collect_book_moves(games, 6, plies=4, min_games=2)
+  start = Othello(6)
+  entry = book[start.zobrist_hash(Othello.Color.BLACK)]
+  assert entry.games >= 2
+  assert start.valid_moves_mask(Othello.Color.BLACK) >> entry.move & 1
+  assert collect_book_moves(games, 8) == {}
+  assert collect_book_moves(games[:1], 6, min_games=2) == {}
+
+def test_write_and_lookup(tmp_path):
+  games = [_game(_play_out(6, seed)) for seed in range(10)]
+  book = collect_book_moves(games, 6, plies=6, min_games=1)
+  path = str(tmp_path / "book.bin")
+  write_book(path, 6, book)
+  reader = OpeningBook(path)
+  try:
+    assert len(reader) == len(book)
+    assert reader.size == 6
+    for key, entry in book.items():
+      found = reader.probe(key)
+      assert (found.move, found.games) == (entry.move, entry.games)
+    assert reader.probe(12345) is None
+    entry = reader.lookup(Othello(6), Othello.Color.BLACK)
+    assert entry.move == book[Othello(6).zobrist_hash(Othello.Color.BLACK)].move
+    assert reader.lookup(Othello(8), Othello.Color.BLACK) is None
+  finally:
+    reader.close()
+
+def test_rejects_bad_files(tmp_path):
+  path = tmp_path / "bad.bin"
+  path.write_bytes(b"NOPE" + bytes(HEADER.size))
+  with pytest.raises(ValueError):
+    OpeningBook(str(path))
+  write_book(str(path), 6, {})
+  path.write_bytes(path.read_bytes()[:-1] + b"\x01") # claims a position that isn't there
+  with pytest.raises(ValueError):
+    OpeningBook(str(path))
+
+def test_book_player_falls_back_to_search(tmp_path):
+  start = Othello(6)
+  path = str(tmp_path / "book.bin")
+  write_book(path, 6, collect_book_moves([_game([start.square_index('C2')])] * 2, 6))
+  player = BookPlayer(RandomPlayer(seed=1), OpeningBook(path))
+  assert player.choose_move(start, Othello.Color.BLACK) == 'C2'
+  assert "book move" in str(player.last_stats)
+  start.make_move('C2', Othello.Color.BLACK)
+  assert player.choose_move(start, Othello.Color.WHITE) in start.all_valid_moves(Othello.Color.WHITE)[1]
+  assert player.book.hits == 1
+  player.close()
+
+def test_main_builds_book_from_self_play(tmp_path):
+  path = str(tmp_path / "book_6.bin")
+  assert main(["6", "--games", "4", "--workers", "1", "--min-games", "1", "--output", path]) == path
+  reader = OpeningBook(path)
+  assert len(reader) > 0
+  reader.close()
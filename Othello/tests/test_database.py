@@ -0,0 +1,116 @@
+import pytest
+from Othello.othello import Othello
+from Othello.benchmark import random_game
+from Othello.database import (BLACK_TO_MOVE, WHITE_TO_MOVE, PositionDatabase, PositionStats, build_database,
+  game_positions, main, position_key)
+from Othello.records import PASS, GameRecord, GameRecordWriter
+from Othello.tournament import play_game
+
+def _write_games(path, size, seeds):
+  records = [GameRecord(size, 0.0, "a", "b", tuple(random_game(size, seed))) for seed in seeds]
+  with GameRecordWriter(str(path)) as writer:
+    for record in records:
+      writer.write_game(record)
+  return records
+
+def _expected(records):
+  """Aggregates every position by brute force, the way the database should"""
+  expected = {}
+  for record in records:
+    keys, difference = game_positions(record)
+    result = (difference > 0) - (difference < 0)
+    for key in keys:
+      games, black, white, draws, total = expected.get(key, (0, 0, 0, 0, 0))
+      expected[key] = (games + 1, black + (result == 1), white + (result == -1), draws + (result == 0), total + difference)
+  return expected
+
+@pytest.fixture
+def database(tmp_path):
+  records = _write_games(tmp_path / "a.bin", 6, range(20)) + _write_games(tmp_path / "b.bin", 6, range(20, 40))
+  _write_games(tmp_path / "other.bin", 8, range(3))
+  path = str(tmp_path / "positions.db")
+  stats = build_database(path, [str(tmp_path / name) for name in ("a.bin", "b.bin", "other.bin")], size=6,
+    partition_bits=3, temporary_directory=str(tmp_path))
+  with PositionDatabase(path) as db:
+    yield db, records, stats
+
+def test_build_stats(database):
+  db, records, stats = database
+  expected = _expected(records)
+  assert (stats.files, stats.games, stats.skipped) == (3, 40, 3)
+  assert stats.occurrences == sum(len(record.moves) + 1 for record in records)
+  assert stats.positions == len(db) == len(expected)
+  assert db.games == 40 and db.size == 6
+
+def test_every_position_matches(database):
+  db, records, _ = database
+  for key, values in _expected(records).items():
+    assert db.probe(key) == PositionStats(*values)
+
+def test_lookup_symmetric_positions(database):
+  db, _, _ = database
+  start = db.lookup(Othello(6), Othello.Color.BLACK)
+  assert start.games == 40
+  assert start.black_wins + start.white_wins + start.draws == 40
+  # All four first moves are the same position turned around, so they share one entry
+  firsts = []
+  for square in ("C2", "B3", "E4", "D5"):
+    board = Othello(6)
+    assert board.make_move(square, Othello.Color.BLACK)
+    firsts.append(db.lookup(board, Othello.Color.WHITE))
+  assert firsts[0] is not None and firsts.count(firsts[0]) == 4 and firsts[0].games == 40
+
+def test_misses(database):
+  db, _, _ = database
+  assert db.lookup(Othello(6), Othello.Color.WHITE) is None
+  assert db.lookup(Othello(8), Othello.Color.BLACK) is None
+  assert db.probe(position_key(0b111, 0, BLACK_TO_MOVE, 6)) is None
+
+def test_parallel_build_matches(tmp_path):
+  paths = []
+  for number in range(3):
+    _write_games(tmp_path / f"{number}.bin", 6, range(number * 10, number * 10 + 10))
+    paths.append(str(tmp_path / f"{number}.bin"))
+  build_database(str(tmp_path / "one.db"), paths, size=6, partition_bits=2)
+  build_database(str(tmp_path / "two.db"), paths, size=6, workers=2, partition_bits=2)
+  assert (tmp_path / "one.db").read_bytes() == (tmp_path / "two.db").read_bytes()
+
+def test_game_positions_rejects_illegal_moves():
+  with pytest.raises(ValueError):
+    game_positions(GameRecord(6, 0.0, "a", "b", (0,)))
+  keys, difference = game_positions(GameRecord(6, 0.0, "a", "b", (PASS,)))
+  assert keys[0][:-1] == keys[1][:-1] and keys[0][-1] == BLACK_TO_MOVE and keys[1][-1] == WHITE_TO_MOVE
+  assert difference == 0
+
+def test_final_position_counted_once(tmp_path):
+  result = play_game(6, "greedy", "random", 5)
+  assert result.move_list[-2:] == (PASS, PASS)
+  record = GameRecord(6, 0.0, "a", "b", tuple(result.move_list)) # Kept the passes, like older records
+  keys, _ = game_positions(record)
+  assert len(keys) == len(set(keys)) == len(result.move_list) - 1
+  with GameRecordWriter(str(tmp_path / "games.bin")) as writer:
+    writer.write_game(record)
+  path = str(tmp_path / "positions.db")
+  build_database(path, [str(tmp_path / "games.bin")], size=6, partition_bits=2)
+  with PositionDatabase(path) as db:
+    final = Othello.from_bitboards(*record.replay().bitboards(), 6)
+    color = Othello.Color.BLACK if len(result.move_list) % 2 == 0 else Othello.Color.WHITE
+    assert db.lookup(final, color).games == 1
+
+def test_rejects_other_files(tmp_path):
+  path = tmp_path / "junk.db"
+  path.write_bytes(b"not a database at all, not even close")
+  with pytest.raises(ValueError):
+    PositionDatabase(str(path))
+
+def test_cli(tmp_path, capsys):
+  _write_games(tmp_path / "games.bin", 6, range(5))
+  path = str(tmp_path / "positions.db")
+  main(["build", path, str(tmp_path / "games.bin"), "--size", "6", "--partition-bits", "2"])
+  assert "5 games from 1 file(s)" in capsys.readouterr().out
+  main(["query", path])
+  assert "5 games" in capsys.readouterr().out
+  main(["query", path, "pass"])
+  assert "No recorded game" in capsys.readouterr().out
+  with pytest.raises(SystemExit):
+    main(["query", path, "A1"])
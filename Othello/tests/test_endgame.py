@@ -0,0 +1,82 @@
+import random
+import pytest
+from Othello.othello import Othello
+from Othello.ai import OPPONENT, AlphaBetaPlayer
+from Othello.endgame import EndgameSolver, solve
+
+def _random_position(size, empties, seed):
+  """Plays random moves until only the given number of squares are empty and the side to move can play"""
+  generator = random.Random(seed)
+  while True:
+    board = Othello(size)
+    turn = Othello.Color.BLACK
+    passes = 0
+    while size * size - sum(discs.bit_count() for discs in board.bitboards()) > empties and passes < 2:
+      moves = board.all_valid_moves(turn)[1]
+      if moves:
+        board.make_move(generator.choice(moves), turn)
+        passes = 0
+      else:
+        passes += 1
+      turn = OPPONENT[turn]
+    if passes < 2 and board.any_valid_move(turn):
+      return board, turn
+
+def _minimax(board, color, passed=False):
+  moves = board.all_valid_moves(color)[1]
+  if not moves:
+    if passed:
+      return board.count_discs(color) - board.count_discs(OPPONENT[color])
+    return -_minimax(board, OPPONENT[color], True)
+  best = None
+  for move in moves:
+    delta = board.make_move(move, color)
+    score = -_minimax(board, OPPONENT[color])
+    board.unmake_move(delta)
+    best = score if best is None else max(best, score)
+  return best
+
+@pytest.mark.parametrize("size,empties", [(6, 6), (6, 8), (8, 7), (8, 9)])
+def test_solve_matches_minimax(size, empties):
+  for seed in range(4):
+    board, color = _random_position(size, empties, seed)
+    before = board.bitboards()
+    result = solve(board, color)
+    assert board.bitboards() == before
+    assert result.empties == empties
+    assert result.score == _minimax(board, color)
+    delta = board.make_move(result.move, color)
+    assert -_minimax(board, OPPONENT[color]) == result.score
+    board.unmake_move(delta)
+
+def test_solve_pass_and_finished_game():
+  # Only A1 is empty and black can't flank anything from it, so black passes and white takes it
+  black = sum(1 << Othello(6).square_index(key) for key in ['B1', 'A2', 'B2'])
+  full = (1 << 36) - 1
+  test_board = Othello.from_bitboards(black, full & ~black & ~1, 6)
+  result = solve(test_board, Othello.Color.BLACK)
+  assert result.move is None
+  assert result.score == -36
+  assert solve(test_board, Othello.Color.WHITE).move == 0
+
+  test_board.make_move(0, Othello.Color.WHITE)
+  result = solve(test_board, Othello.Color.BLACK)
+  assert (result.move, result.score, result.empties) == (None, -36, 0)
+
+def test_solver_reports_stats_and_times_out():
+  board, color = _random_position(8, 10, 1)
+  result = EndgameSolver().solve(board, color)
+  assert result.nodes > 0
+  assert "10 empties" in str(result)
+  board, color = _random_position(8, 24, 1)
+  with pytest.raises(TimeoutError):
+    EndgameSolver().solve(board, color, time_limit=0.05)
+
+def test_alphabeta_plays_solved_move_near_the_end():
+  board, color = _random_position(8, 8, 2)
+  player = AlphaBetaPlayer(time_limit=5)
+  move = player.choose_move(board, color)
+  assert player.last_stats.depth == 8
+  assert player.last_stats.score == solve(board, color).score
+  delta = board.make_move(move, color)
+  assert -_minimax(board, OPPONENT[color]) == player.last_stats.score
@@ -0,0 +1,62 @@
+import io
+import pytest
+from Othello import patterns
+from Othello.engine import Engine, main
+
+def test_play_undo_and_board():
+  engine = Engine("random", size=6, seed=1)
+  assert engine.handle("board") == "= ......\n......\n..OX..\n..XO..\n......\n......\n\n"
+  assert engine.handle("valid black") == "= C2 B3 E4 D5\n\n"
+  assert engine.handle("play black c2") == "=\n\n"
+  assert engine.handle("score") == "= 4 1\n\n"
+  assert engine.handle("undo") == "=\n\n"
+  assert engine.handle("score") == "= 2 2\n\n"
+  assert engine.handle("undo") == "? no moves to undo\n\n"
+  assert engine.handle("") == ""
+
+def test_errors_are_reported_not_printed(capsys):
+  engine = Engine("random", size=6)
+  assert engine.handle("play black z9") == "? Invalid square. Not in board.\n\n"
+  assert engine.handle("play black a1") == "? illegal move: a1\n\n"
+  assert engine.handle("play purple c2") == "? invalid color: purple\n\n"
+  assert engine.handle("play black pass") == "? illegal pass, a valid move is available\n\n"
+  assert engine.handle("play black") == "? wrong number of arguments for play\n\n"
+  assert engine.handle("dance") == "? unknown command: dance\n\n"
+  assert engine.handle("newgame 7").startswith("? Invalid size: 7")
+  assert capsys.readouterr().out == ""
+
+def test_genmove_plays_a_valid_move():
+  engine = Engine("greedy", size=8, seed=2)
+  response = engine.handle("genmove black")
+  move = response[2:].strip()
+  assert move in ["D3", "C4", "F5", "E6"]
+  assert engine.handle("score") == "= 4 1\n\n"
+  assert engine.handle("newgame 10") == "=\n\n"
+  assert engine.board.size == 10
+  assert engine.history == []
+
+def test_run_reads_until_quit():
+  commands = io.StringIO("newgame 6\nplay b c2\ngenmove w\nquit\nboard\n")
+  output = io.StringIO()
+  engine = Engine("greedy", size=8)
+  engine.run(commands, output)
+  responses = output.getvalue().split("\n\n")
+  assert responses[:2] == ["=", "="]
+  assert responses[2].startswith("= ")
+  assert responses[3] == "="
+  assert responses[4] == "" # nothing after quit
+  assert not engine.running
+
+def test_missing_pattern_weights(tmp_path, monkeypatch):
+  from Othello.training import train
+
+  monkeypatch.setattr(patterns, "WEIGHTS_DIRECTORY", str(tmp_path))
+  with pytest.raises(SystemExit, match="No pattern weights"):
+    main(["--player", "pattern", "--size", "6"])
+  weights, _ = train(6, games=4, iterations=2)
+  weights.save(patterns.weights_path(6, str(tmp_path)))
+  engine = Engine("pattern", size=6)
+  assert engine.handle("play black c2") == "=\n\n"
+  assert engine.handle("newgame 8").startswith("? No pattern weights")
+  assert engine.board.size == 6 and len(engine.history) == 1 # The game in progress is kept
+  assert engine.handle("newgame 6") == "=\n\n"
@@ -0,0 +1,59 @@
+import io
+import pstats
+from Othello.othello import Othello
+from Othello import instrument
+
+def test_enable_counts_calls_and_disable_restores():
+  original = Othello.check_move
+  instrument.reset()
+  instrument.enable()
+  try:
+    assert instrument.is_enabled()
+    assert Othello.check_move is not original
+    test_board = Othello(8)
+    test_board.check_move('D3', Othello.Color.BLACK)
+    test_board.check_move('A1', Othello.Color.BLACK)
+    test_board.all_valid_moves(Othello.Color.BLACK)
+    test_board.make_move('D3', Othello.Color.BLACK)
+    test_board.unmake_move()
+    test_board.get_next_space('D3', 'up')
+    test_board._board_table # renders the table, which is only built when asked for
+    test_board._board_table
+    totals = instrument.stats()
+  finally:
+    instrument.disable()
+  assert Othello.check_move is original
+  assert not instrument.is_enabled()
+  assert totals["check_move"].calls == 2
+  assert totals["all_valid_moves"].calls == 1
+  assert totals["make_move"].calls == 1
+  assert totals["unmake_move"].calls == 1
+  assert totals["get_next_space"].calls == 1
+  assert totals["update_board_table"].calls == 1
+  assert totals["check_move"].seconds > 0
+
+  # Nothing is counted while instrumentation is off
+  Othello(8).check_move('D3', Othello.Color.BLACK)
+  assert instrument.stats()["check_move"].calls == 2
+  instrument.reset()
+  assert instrument.stats()["check_move"] == instrument.CallStats(0, 0.0)
+
+def test_print_stats():
+  instrument.reset()
+  instrument.enable(("check_move",))
+  try:
+    Othello(6).check_move('C2', Othello.Color.BLACK)
+  finally:
+    instrument.disable()
+  output = io.StringIO()
+  instrument.print_stats(output)
+  assert "check_move" in output.getvalue()
+
+def test_profile_session(tmp_path):
+  path = str(tmp_path / "game.prof")
+  output = io.StringIO()
+  with instrument.profile_session(path, lines=5, stream=output):
+    Othello(8).all_valid_moves(Othello.Color.BLACK)
+  functions = {name for (_, _, name) in pstats.Stats(path).stats}
+  assert "all_valid_moves" in functions
+  assert "cumulative" in output.getvalue()
@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import sys
+import main
+from Othello import play_othello
+
+def loaded_modules(statement: str) -> set[str]:
+  code = f"import sys; {statement}; print(' '.join(sys.modules))"
+  result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+    cwd=os.path.dirname(os.path.abspath(main.__file__)))
+  return set(result.stdout.split())
+
+def test_headless_imports_skip_rendering_and_numpy():
+  for statement in ["import Othello.othello", "import Othello.tournament", "import main"]:
+    modules = loaded_modules(statement)
+    assert "prettytable" not in modules
+    assert "numpy" not in modules
+
+def test_board_table_still_renders():
+  from Othello.othello import Othello
+  assert "A" in str(Othello(6)._board_table)
+
+def test_play_othello_imports_without_starting_a_game():
+  assert callable(play_othello.run_game)
+
+def test_launcher_runs_subcommands(capsys):
+  main.main(["--import-time", "perft", "2", "--size", "6"])
+  captured = capsys.readouterr()
+  assert "perft(2) = 12" in captured.out
+  assert "Othello.perft imported in" in captured.err
+
+def test_launcher_lists_every_command(capsys):
+  try:
+    main.main(["--help"])
+  except SystemExit:
+    pass
+  output = capsys.readouterr().out
+  for name in main.COMMANDS:
+    assert name in output
+
+def test_launcher_passes_on_the_exit_status(tmp_path):
+  baseline = tmp_path / "baseline.json"
+  arguments = ["benchmark", "--sizes", "6", "--games", "1", "--perft-depth", "0", "--repeat", "1"]
+  assert main.main(arguments + ["--output", str(baseline)]) == 0
+  results = json.loads(baseline.read_text())
+  for result in results["results"]:
+    result["operations"] += 1 # Counts that no longer match fail the comparison
+  baseline.write_text(json.dumps(results))
+  assert main.main(arguments + ["--compare", str(baseline)]) == 1
+  command = [sys.executable, "main.py"] + arguments + ["--compare", str(baseline)]
+  finished = subprocess.run(command, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(main.__file__)))
+  assert finished.returncode == 1
+  assert "COUNT MISMATCH" in finished.stdout
+  assert main.main(["perft", "1", "--size", "6"]) == 0 # Returns its counts, which aren't a status
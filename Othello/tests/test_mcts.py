@@ -0,0 +1,67 @@
+import pytest
+from Othello.othello import Othello
+from Othello import play_othello
+from Othello.ai import make_player
+from Othello.mcts import MCTSPlayer, search
+
+def test_choose_move_leaves_board_unchanged():
+  test_board = Othello(8)
+  before = test_board._board_dict
+  hash_before = test_board.zobrist_hash()
+  player = MCTSPlayer(playouts=200, seed=1)
+  move = player.choose_move(test_board, Othello.Color.BLACK)
+  assert move in test_board.all_valid_moves(Othello.Color.BLACK)[1]
+  assert test_board._board_dict == before
+  assert test_board.zobrist_hash() == hash_before
+  assert player.last_stats.playouts == 200
+
+def test_search_runs_requested_playouts():
+  test_board = Othello(6)
+  visits, playouts = search(test_board, Othello.Color.BLACK, playouts=150, seed=3)
+  assert playouts == 150
+  assert sum(visits.values()) == 150
+  assert set(visits) == set(test_board.square_index(key) for key in test_board.all_valid_moves(Othello.Color.BLACK)[1])
+
+def test_search_is_reproducible_with_seed():
+  first = search(Othello(8), Othello.Color.BLACK, playouts=100, seed=7)
+  second = search(Othello(8), Othello.Color.BLACK, playouts=100, seed=7)
+  assert first == second
+
+def test_single_and_no_valid_moves():
+  test_board = Othello(6)
+  test_board.set_squares(['B2', 'C2', 'D2', 'D3', 'C4', 'D4', 'B4', 'B3'], Othello.Color.BLACK)
+  assert MCTSPlayer(playouts=50).choose_move(test_board, Othello.Color.BLACK) is None
+
+  test_board = Othello(6)
+  test_board.set_squares(['C3', 'D3', 'C4', 'D4'], Othello.Color.BLACK)
+  test_board.set_squares(['B2'], Othello.Color.WHITE)
+  player = MCTSPlayer(playouts=50)
+  assert player.choose_move(test_board, Othello.Color.WHITE) == 'E5'
+  assert player.last_stats.playouts == 0
+
+def test_expired_time_limit_still_picks_a_move():
+  test_board = Othello(6)
+  player = MCTSPlayer(time_limit=0.0, seed=2)
+  assert player.choose_move(test_board, Othello.Color.BLACK) in test_board.all_valid_moves(Othello.Color.BLACK)[1]
+  assert player.last_stats.playouts >= 1
+  with pytest.raises(ValueError):
+    MCTSPlayer(playouts=0)
+  with pytest.raises(SystemExit):
+    play_othello.parse_args(["6", "--playouts", "0"])
+
+def test_root_parallel_workers():
+  test_board = Othello(6)
+  player = MCTSPlayer(playouts=100, workers=2, seed=5)
+  try:
+    move = player.choose_move(test_board, Othello.Color.BLACK)
+  finally:
+    player.close()
+  assert move in test_board.all_valid_moves(Othello.Color.BLACK)[1]
+  assert player.last_stats.playouts == 100
+  assert player.last_stats.workers == 2
+  assert player._executor is None
+
+def test_make_player_options():
+  player = make_player("mcts", 0.5, seed=1, playouts=40, workers=1)
+  assert isinstance(player, MCTSPlayer)
+  assert player.playouts == 40
@@ -1,5 +1,5 @@
 import pytest
-from Othello.othello import Othello, DEFAULT, SIZE
+from Othello.othello import Othello, DEFAULT, SIZE, InvalidColumnError, InvalidDirectionError, InvalidRowError, InvalidSizeError, InvalidSquareError, OthelloError
 from prettytable import PrettyTable
 
 default_board_dict = {
@@ -80,8 +80,8 @@ def test_board_size(provided_size, actual_size):
 
 def test_initialize_board_dict():
   test_board = Othello(6)
-  test_board._board_dict = {}
-  assert test_board._board_dict == {}
+  test_board.set_squares(list(default_board_dict.keys()), Othello.Color.BLACK)
+  assert test_board.get_square("C3") == Othello.Color.BLACK.value
 
   test_board.initialize_board_dict()
   assert test_board._board_dict == default_board_dict
@@ -256,6 +256,52 @@ def test_get_next_space(square, direction, next_space):
   test_board = Othello(6)
   assert test_board.get_next_space(square, direction) == next_space
 
+def test_invalid_input_prints_by_default(capsys):
+  test_board = Othello(6)
+  assert test_board.get_square("Z9") is None
+  assert test_board.get_next_space("B2", "sideways") is None
+  assert test_board.get_next_space("G2", "up") is None
+  output = capsys.readouterr().out
+  assert "Invalid square. Not in board." in output
+  assert "Error!: Invalid direction: sideways" in output
+  assert "Column must be in" in output
+
+def test_quiet_boards_return_sentinels_silently(capsys):
+  test_board = Othello(6, errors="ignore")
+  assert test_board.get_square("Z9") is None
+  assert test_board.get_row(9) == []
+  assert test_board.get_column("Q") == []
+  assert test_board.get_next_space("B2", "upanddown") is None
+  assert test_board.get_next_space("A9", "up") is None
+  assert test_board.check_move("Z26", Othello.Color.BLACK) == (False, [])
+  assert Othello(7, errors="ignore").size == SIZE
+  assert capsys.readouterr().out == ""
+
+@pytest.mark.parametrize(
+  "call, error",
+  [
+    (lambda board: board.get_square("Z9"), InvalidSquareError),
+    (lambda board: board.get_row("x"), InvalidRowError),
+    (lambda board: board.get_row(0), InvalidRowError),
+    (lambda board: board.get_column("Q"), InvalidColumnError),
+    (lambda board: board.get_next_space("B2", "leftright"), InvalidDirectionError),
+    (lambda board: board.get_next_space("AZ", "up"), InvalidSquareError),
+  ]
+)
+def test_raising_boards_raise_typed_errors(call, error, capsys):
+  test_board = Othello(6, errors="raise")
+  with pytest.raises(error):
+    call(test_board)
+  assert issubclass(error, OthelloError) and issubclass(error, ValueError)
+  assert capsys.readouterr().out == ""
+
+def test_error_mode_on_construction():
+  with pytest.raises(InvalidSizeError):
+    Othello(7, errors="raise")
+  with pytest.raises(ValueError):
+    Othello(8, errors="loud")
+  assert Othello.from_bitboards(0, 0, 6, errors="raise").errors == "raise"
+
 @pytest.mark.parametrize(
   "square, color, expected_valid, expected_spaces_to_flip",
   [
@@ -309,3 +355,126 @@ def test_all_valid_moves():
   is_valid, valid_spaces = test_board.all_valid_moves(Othello.Color.WHITE)
   assert is_valid == True
   assert sorted(valid_spaces) == sorted(['A1', 'C1', 'E1', 'E3', 'E5', 'C5', 'A5', 'A3'])
+
+def test_count_discs():
+  test_board = Othello(6)
+  assert test_board.count_discs(Othello.Color.BLACK) == 2
+  assert test_board.count_discs(Othello.Color.WHITE) == 2
+
+  test_board.set_squares(['C3', 'A1'], Othello.Color.BLACK)
+  assert test_board.count_discs(Othello.Color.BLACK) == 4
+  assert test_board.count_discs(Othello.Color.WHITE) == 1
+
+@pytest.mark.parametrize(
+  "square, color, expected_valid, expected_spaces_to_flip",
+  [
+    ('V1', Othello.Color.BLACK, True, ['W1', 'X1']),
+    ('A2', Othello.Color.BLACK, False, []),
+    ('A26', Othello.Color.WHITE, True, ['B25']),
+    ('Z26', Othello.Color.WHITE, False, []),
+  ]
+)
+def test_check_move_does_not_wrap_edges(square, color, expected_valid, expected_spaces_to_flip):
+  test_board = Othello(26)
+  test_board.set_squares(['Y1', 'B25'], Othello.Color.BLACK)
+  test_board.set_squares(['W1', 'X1', 'Z1', 'C24', 'Y25'], Othello.Color.WHITE)
+  actual_valid, actual_spaces_to_flip = test_board.check_move(square, color)
+  assert actual_valid == expected_valid
+  assert sorted(actual_spaces_to_flip) == sorted(expected_spaces_to_flip)
+
+def test_lookup_tables_shared_per_size():
+  assert Othello(8)._geometry is Othello(8)._geometry
+  assert Othello(8)._geometry is not Othello(10)._geometry
+
+  rays = Othello(6)._geometry.rays[0] # A1 can only flank to the right, down and down-right
+  assert len(rays) == 3
+  assert all(len(ray) == 5 for ray in rays)
+
+def test_incremental_move_tracking_matches_full_scan():
+  test_board = Othello(8)
+  turn = Othello.Color.BLACK
+  other = Othello.Color.WHITE
+  for _ in range(60):
+    for color in (turn, other):
+      player = test_board._COLOR_INDEX[color]
+      expected = test_board.legal_mask(test_board._discs[player], test_board._discs[1 - player])
+      assert test_board._legal_moves(player) == expected
+
+    occupied = test_board._discs[0] | test_board._discs[1]
+    assert test_board._frontier == test_board._geometry.full & ~occupied & test_board.adjacent_mask(occupied)
+
+    is_valid, valid_spaces = test_board.all_valid_moves(turn)
+    if is_valid:
+      space = valid_spaces[len(valid_spaces) // 2]
+      spaces_to_flip = test_board.check_move(space, turn)[1]
+      test_board.set_square(space, turn)
+      test_board.set_squares(spaces_to_flip, turn)
+    turn, other = other, turn
+
+def test_make_move():
+  test_board = Othello(6)
+  delta = test_board.make_move('b3', Othello.Color.BLACK)
+  assert test_board.move_squares(delta) == ('B3', ['C3'])
+  assert test_board.get_row(3) == [DEFAULT] + [Othello.Color.BLACK.value] * 3 + [DEFAULT] * 2
+  assert test_board.count_discs(Othello.Color.BLACK) == 4
+
+  assert test_board.make_move('B3', Othello.Color.WHITE) is None
+  assert test_board.make_move('A1', Othello.Color.WHITE) is None
+  assert test_board.make_move('Z26', Othello.Color.WHITE) is None
+
+def test_unmake_move():
+  test_board = Othello(8)
+  start_board = test_board._board_dict
+  turn = Othello.Color.BLACK
+  deltas = []
+  snapshots = []
+  for _ in range(20):
+    is_valid, valid_spaces = test_board.all_valid_moves(turn)
+    if is_valid:
+      snapshots.append(test_board._board_dict)
+      deltas.append(test_board.make_move(valid_spaces[0], turn))
+    turn = Othello.Color.WHITE if turn == Othello.Color.BLACK else Othello.Color.BLACK
+
+  with pytest.raises(ValueError):
+    test_board.unmake_move(deltas[0])
+
+  for delta, snapshot in zip(reversed(deltas), reversed(snapshots)):
+    assert test_board.unmake_move(delta) == delta
+    assert test_board._board_dict == snapshot
+  assert test_board._board_dict == start_board
+  assert test_board.unmake_move() is None
+  assert sorted(test_board.all_valid_moves(Othello.Color.BLACK)[1]) == sorted(['D3', 'C4', 'F5', 'E6'])
+
+def test_board_table_is_built_lazily():
+  test_board = Othello(6)
+  assert test_board._table is None
+
+  test_board.make_move('B3', Othello.Color.BLACK)
+  test_board.set_square('A1', Othello.Color.WHITE)
+  assert test_board._table is None
+
+  builds = []
+  update = test_board.update_board_table
+  test_board.update_board_table = lambda: (builds.append(1), update())[1]
+
+  table = test_board._board_table
+  rows = table.get_string().splitlines()
+  assert rows[1].split("|")[1:-1] == ["   ", " A  ", " B  ", " C  ", " D  ", " E ", " F "]
+  assert [cell.strip() for cell in rows[3].split("|")[2:-1]] == ["⚪", "", "", "", "", ""]
+  assert [cell.strip() for cell in rows[7].split("|")[2:-1]] == ["", "⚫", "⚫", "⚫", "", ""]
+  assert table.rows[2] == [3, DEFAULT, "⚫", "⚫", "⚫", DEFAULT, DEFAULT]
+  assert test_board._table_dirty == False
+  assert len(builds) == 1
+
+  # Reading it again without a change reuses the table
+  assert test_board._board_table.get_string() == "\n".join(rows)
+  assert len(builds) == 1
+
+  test_board.set_square('F6', Othello.Color.BLACK)
+  assert test_board._table_dirty == True
+  assert test_board._board_table.rows[5][-1] == "⚫"
+  assert len(builds) == 2
+  test_board.toggle_guides()
+  assert test_board._table_dirty == True
+  assert test_board._board_table.rows[5] == [DEFAULT] * 5 + ["⚫"]
+  assert len(builds) == 3
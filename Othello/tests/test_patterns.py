@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from Othello.othello import Othello
+from Othello.benchmark import random_game
+from Othello.patterns import (PatternCodes, PatternEvaluator, PatternSet, PatternWeights, STAGES, stage_of, weights_path)
+from Othello.symmetry import TRANSFORMS, transform_bitboard
+
+OPPONENT = {Othello.Color.BLACK: Othello.Color.WHITE, Othello.Color.WHITE: Othello.Color.BLACK}
+
+def _positions(size, seed):
+  """Yields the board, the color to move and the move played, through a whole random game"""
+  board = Othello(size)
+  color = Othello.Color.BLACK
+  for move in random_game(size, seed):
+    if move >= 0:
+      yield board, color, move
+      board.make_move(move, color)
+    color = OPPONENT[color]
+
+def _random_evaluator(size, seed=0):
+  generator = np.random.default_rng(seed)
+  weights = PatternWeights(size)
+  weights.table = generator.normal(size=weights.table.shape).astype(np.float32)
+  return PatternEvaluator(weights)
+
+@pytest.mark.parametrize("size", [6, 8, 10])
+def test_pattern_set(size):
+  patterns = PatternSet.for_size(size)
+  assert patterns is PatternSet.for_size(size)
+  assert [patterns.shape_of.count(shape) for shape in range(len(patterns.names))] == [8, 8, 4]
+  assert patterns.names == ("edge", "corner", "diagonal")
+  assert all(len(squares) == min(size, 8) for squares, shape in zip(patterns.instances, patterns.shape_of) if shape != 1)
+  assert (patterns.swap[patterns.swap] == np.arange(patterns.features)).all()
+  assert patterns.width == patterns.features + 2 and patterns.bias == patterns.mobility + 1
+  for square, terms in enumerate(patterns.terms):
+    for instance, power in terms:
+      assert patterns.instances[instance][round(np.log(power) / np.log(3))] == square
+
+@pytest.mark.parametrize("size", [6, 8])
+def test_incremental_codes_match_scratch(size):
+  board = Othello(size)
+  codes = PatternCodes.from_board(board)
+  patterns = codes.patterns
+  color = Othello.Color.BLACK
+  deltas = []
+  for move in random_game(size, 7):
+    if move >= 0:
+      delta = board.make_move(move, color)
+      codes.play(delta)
+      deltas.append(delta)
+      assert codes.codes == patterns.codes(*board.bitboards())
+    color = OPPONENT[color]
+  cells = np.frombuffer(bytes(board.to_position().cells), dtype=np.uint8)[None]
+  assert patterns.batch_codes(cells)[0].tolist() == codes.codes
+  for delta in reversed(deltas):
+    board.unmake_move(delta)
+    codes.undo(delta)
+  assert codes.codes == patterns.codes(*Othello(size).bitboards())
+
+def test_batch_codes_match_scratch():
+  patterns = PatternSet.for_size(8)
+  boards = [board.to_position() for board, _, _ in _positions(8, 3)]
+  cells = np.frombuffer(b"".join(bytes(position.cells) for position in boards), dtype=np.uint8).reshape(len(boards), 64)
+  batch = patterns.batch_codes(cells)
+  for row, position in zip(batch, boards):
+    assert row.tolist() == patterns.codes(*position.bitboards())
+
+def test_evaluation_is_symmetric():
+  evaluator = _random_evaluator(8)
+  for board, color, _ in list(_positions(8, 11))[::7]:
+    black, white = board.bitboards()
+    score = evaluator.evaluate_board(board, color)
+    for transform in TRANSFORMS:
+      turned = Othello.from_bitboards(transform_bitboard(black, transform, 8), transform_bitboard(white, transform, 8), 8)
+      assert evaluator.evaluate_board(turned, color) == score
+    # The same position with the colors swapped is the same for the other side
+    swapped = Othello.from_bitboards(white, black, 8)
+    assert evaluator.evaluate_board(swapped, OPPONENT[color]) == score
+
+def test_evaluation_uses_the_stage_weights():
+  weights = PatternWeights(6, stages=2)
+  patterns = PatternSet.for_size(6)
+  weights.table[patterns.width + patterns.bias] = 1.5 # Late game bias only
+  weights.table[patterns.mobility] = 0.25
+  evaluator = PatternEvaluator(weights)
+  codes = patterns.codes(*Othello(6).bitboards())
+  assert evaluator.evaluate(codes, Othello.Color.BLACK, 4, 2) == 50
+  assert evaluator.evaluate(codes, Othello.Color.BLACK, 36, 2) == 150
+  assert evaluator.evaluate_board(Othello(6), Othello.Color.WHITE) == 0
+
+def test_stage_of():
+  assert [stage_of(discs, 8, 4) for discs in (4, 18, 19, 34, 49, 64)] == [0, 0, 1, 2, 3, 3]
+  assert stage_of(0, 6, STAGES) == 0
+
+def test_weights_round_trip(tmp_path):
+  evaluator = _random_evaluator(6, seed=4)
+  path = weights_path(6, str(tmp_path))
+  evaluator.weights.save(path)
+  loaded = PatternWeights.load(path)
+  assert (loaded.size, loaded.stages) == (6, STAGES)
+  assert np.array_equal(loaded.table, evaluator.weights.table)
+  assert PatternEvaluator.for_size(6, str(tmp_path)) is PatternEvaluator.for_size(6, str(tmp_path))
+  with pytest.raises(FileNotFoundError):
+    PatternEvaluator.for_size(8, str(tmp_path))
+  with pytest.raises(ValueError):
+    PatternWeights(6, 2, np.zeros(10, dtype=np.float32))
+  np.savez(str(tmp_path / "other.npz"), table=np.zeros(3))
+  with pytest.raises(ValueError):
+    PatternWeights.load(str(tmp_path / "other.npz"))
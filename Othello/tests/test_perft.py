@@ -0,0 +1,34 @@
+import pytest
+from Othello.othello import Othello
+from Othello.perft import perft, perft_divide
+
+# Standard 8x8 counts, with a forced pass counted as a ply
+KNOWN_8X8 = [1, 4, 12, 56, 244, 1396, 8200]
+
+@pytest.mark.parametrize("depth,count", list(enumerate(KNOWN_8X8)))
+def test_perft_matches_known_counts(depth, count):
+  assert perft(Othello(8), Othello.Color.BLACK, depth) == count
+
+@pytest.mark.parametrize("size", range(6, 27, 2))
+def test_perft_every_size(size):
+  test_board = Othello(size)
+  before = test_board.bitboards()
+  assert perft(test_board, Othello.Color.BLACK, 1) == 4
+  assert perft(test_board, Othello.Color.BLACK, 2) == 12
+  assert test_board.bitboards() == before
+
+def test_perft_divide_sums_to_perft():
+  test_board = Othello(8)
+  counts = perft_divide(test_board, Othello.Color.BLACK, 5)
+  assert sorted(counts) == sorted(test_board.all_valid_moves(Othello.Color.BLACK)[1])
+  assert sum(counts.values()) == 1396
+
+def test_perft_passes_and_finished_games():
+  # Black can't move but white can take A1
+  black = sum(1 << Othello(6).square_index(key) for key in ['B1', 'A2', 'B2'])
+  full = (1 << 36) - 1
+  test_board = Othello.from_bitboards(black, full & ~black & ~1, 6)
+  assert perft_divide(test_board, Othello.Color.BLACK, 2) == {"pass": 1}
+  assert perft(test_board, Othello.Color.BLACK, 1) == 1
+  # After white's move the board is full, so the game is over at any depth
+  assert perft(test_board, Othello.Color.BLACK, 5) == 1
@@ -0,0 +1,86 @@
+import copy
+import sys
+import pytest
+from Othello.othello import Othello
+from Othello.position import Position, EMPTY, BLACK, WHITE
+
+def played_board(size: int=8) -> Othello:
+  test_board = Othello(size)
+  test_board.make_move('D3', Othello.Color.BLACK)
+  test_board.make_move('C3', Othello.Color.WHITE)
+  return test_board
+
+@pytest.mark.parametrize("size", [6, 8, 20, 26])
+def test_bitboard_round_trip(size):
+  test_board = Othello(size)
+  position = test_board.to_position()
+  assert position.bitboards() == test_board.bitboards()
+  assert position.count(BLACK) == 2 and position.count(WHITE) == 2
+  assert position.count(EMPTY) == size * size - 4
+
+def test_cells_match_squares():
+  test_board = played_board()
+  position = test_board.to_position()
+  for index in range(64):
+    value = test_board.get_square(test_board.square_name(index))
+    expected = {Othello.Color.BLACK.value: BLACK, Othello.Color.WHITE.value: WHITE}.get(value, EMPTY)
+    assert position[index] == expected
+
+def test_othello_from_position():
+  test_board = played_board()
+  rebuilt = Othello.from_position(test_board.to_position())
+  assert rebuilt.bitboards() == test_board.bitboards()
+  assert rebuilt._table is None # nothing rendered
+  assert rebuilt.all_valid_moves(Othello.Color.BLACK) == test_board.all_valid_moves(Othello.Color.BLACK)
+
+def test_to_bytes_is_a_snapshot():
+  position = played_board().to_position()
+  snapshot = position.to_bytes()
+  assert isinstance(snapshot, bytes)
+  position[0] = BLACK
+  assert snapshot[0] == EMPTY
+  assert Position.from_bytes(snapshot) != position
+
+def test_from_bytes_shares_writable_buffers():
+  buffer = bytearray(3 * 36)
+  positions = [Position.from_bytes(memoryview(buffer)[i * 36:(i + 1) * 36]) for i in range(3)]
+  positions[1][5] = WHITE
+  assert buffer[36 + 5] == WHITE
+  assert positions[1].size == 6
+
+def test_read_only_buffers_are_copied_on_write():
+  buffer = bytes(2 * 36)
+  view = memoryview(buffer)
+  first, second = Position.from_bytes(view[:36]), Position.from_bytes(view[36:])
+  assert first.cells.obj is buffer and second.cells.obj is buffer # No copy to read
+  assert first == second and first.count(EMPTY) == 36
+  first[0] = BLACK
+  assert isinstance(first.cells, bytearray) and first.count(BLACK) == 1
+  assert buffer == bytes(2 * 36) and second.cells.obj is buffer
+  again = Position.from_bytes(first.to_bytes())
+  again[1] = WHITE
+  assert first[1] == EMPTY and again[0] == BLACK
+
+def test_from_bytes_rejects_bad_data():
+  for data in [bytes(35), bytes(16), bytes(49), bytes([3]) + bytes(35)]:
+    with pytest.raises(ValueError):
+      Position.from_bytes(data)
+  with pytest.raises(ValueError):
+    Position.from_bitboards(1, 1, 6)
+  with pytest.raises(ValueError):
+    Position(6, bytearray(10))
+
+def test_copy_is_independent():
+  position = played_board().to_position()
+  for clone in (position.copy(), copy.copy(position)):
+    assert clone == position
+    clone[0] = WHITE
+    assert clone != position
+
+def test_positions_are_small():
+  position = Othello(8).to_position()
+  assert not hasattr(position, "__dict__")
+  assert sys.getsizeof(position) + sys.getsizeof(position.cells) < 300
+  assert "black=2" in repr(position)
+  with pytest.raises(TypeError):
+    hash(position)
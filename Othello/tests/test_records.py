@@ -0,0 +1,60 @@
+import io
+import pytest
+from Othello.othello import Othello
+from Othello.records import (HEADER, PASS, GameRecord, GameRecordWriter, encode_game, finished_moves, iter_games,
+  read_games)
+from Othello.tournament import play_game
+
+@pytest.mark.parametrize("size", [6, 14, 16, 26])
+def test_round_trip(tmp_path, size):
+  games = []
+  for seed in range(3):
+    result = play_game(size, "greedy", "random", seed)
+    games.append(GameRecord(size, result.started, "greedy", "random", finished_moves(result.move_list)))
+
+  path = str(tmp_path / "games.bin")
+  with GameRecordWriter(path) as writer:
+    writer.write_game(games[0])
+  with GameRecordWriter(path) as writer: # appending to an existing file
+    writer.write_game(games[1])
+    writer.write_game(games[2])
+
+  read_back = list(read_games(path))
+  assert [game.moves for game in read_back] == [game.moves for game in games]
+  assert read_back[0].started == pytest.approx(games[0].started)
+  final = read_back[0].replay()
+  assert final.count_discs(Othello.Color.BLACK) == play_game(size, "greedy", "random", 0).black_discs
+
+def test_finished_moves():
+  assert finished_moves([19, 18, PASS, PASS]) == (19, 18)
+  assert finished_moves((19, PASS, 18, PASS)) == (19, PASS, 18, PASS)
+  assert finished_moves((PASS,)) == (PASS,)
+
+def test_move_width():
+  record = GameRecord(14, 0.0, "a", "b", (19, PASS))
+  assert len(encode_game(record)) == HEADER.size + 2 + 2
+  assert len(encode_game(record._replace(size=16))) == HEADER.size + 2 + 4
+
+def test_long_non_ascii_names_round_trip(tmp_path):
+  black = "é" * 200 # 400 bytes, so the 255 byte limit falls in the middle of a character
+  white = "名" * 100
+  path = str(tmp_path / "games.bin")
+  with GameRecordWriter(path) as writer:
+    writer.write_game(GameRecord(8, 0.0, black, white, (19,)))
+  (game,) = read_games(path)
+  assert game.black == "é" * 127
+  assert game.white == "名" * 85
+  assert game.moves == (19,)
+
+def test_iter_games_is_lazy_and_validates():
+  data = encode_game(GameRecord(8, 0.0, "a", "b", (19,)))
+  games = iter_games(io.BytesIO(data + b"garbage!" * 4))
+  assert next(games).moves == (19,)
+  with pytest.raises(ValueError):
+    next(games)
+
+def test_replay_rejects_bad_moves():
+  with pytest.raises(ValueError):
+    GameRecord(8, 0.0, "a", "b", (0,)).replay()
+  with pytest.raises(ValueError):
+    GameRecord(8, 0.0, "a", "b", (PASS,)).replay()
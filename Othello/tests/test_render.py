@@ -0,0 +1,21 @@
+import io
+from Othello.othello import Othello
+from Othello.render import TerminalRenderer
+
+def test_draw_only_redraws_changed_cells():
+  test_board = Othello(6)
+  stream = io.StringIO()
+  renderer = TerminalRenderer(stream)
+  assert renderer.draw(test_board) == 36
+  assert renderer.draw(test_board) == 0
+
+  stream.seek(0)
+  stream.truncate()
+  test_board.make_move('B3', Othello.Color.BLACK)
+  assert renderer.draw(test_board) == 2
+  assert stream.getvalue().count(Othello.Color.BLACK.value) == 2
+  assert "\x1b[4;7H" in stream.getvalue() # B3 sits below the header on the fourth line
+
+  test_board.unmake_move()
+  assert renderer.draw(test_board) == 2
+  assert renderer.draw(Othello(8)) == 64
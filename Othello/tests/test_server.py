@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from time import perf_counter
+from Othello import patterns, server as server_module
+from Othello.server import GameServer, Session, percentile, BLACK, WHITE
+
+class Client:
+  def __init__(self, reader, writer):
+    self.reader = reader
+    self.writer = writer
+
+  @classmethod
+  async def connect(cls, server):
+    return cls(*await asyncio.open_connection(server.host, server.port))
+
+  async def read(self) -> str:
+    return (await self.reader.readuntil(b"\n\n")).decode()
+
+  async def send(self, line: str) -> str:
+    self.writer.write(f"{line}\n".encode())
+    await self.writer.drain()
+    return await self.read()
+
+  def close(self):
+    self.writer.close()
+
+def run_with_server(test, **options):
+  async def runner():
+    executor = options.pop("executor", ThreadPoolExecutor(1))
+    server = GameServer(port=0, executor=executor, seed=0, **options)
+    await server.start()
+    try:
+      await test(server)
+    finally:
+      await server.close()
+      if executor is not None:
+        executor.shutdown()
+  asyncio.run(runner())
+
+def test_game_against_a_bot():
+  async def test(server):
+    client = await Client.connect(server)
+    assert await client.send("new 6 greedy") == "= 1\n\n"
+    assert await client.send("valid") == "= C2 B3 E4 D5\n\n"
+    reply = await client.send("play c2")
+    assert reply.startswith("= ") and len(reply.split()) == 2
+    assert (await client.send("status")).startswith("= black 3 3")
+    board = await client.send("board")
+    assert board.count("\n") == 7 and "X" in board and "O" in board
+    assert (await client.send("play A1")).startswith("? illegal move")
+    assert (await client.send("play")).startswith("? wrong number of arguments")
+    assert (await client.send("fly")).startswith("? unknown command")
+    stats = server.stats()
+    assert stats.sessions_served == 1 and stats.moves == 2 and stats.p50_ms > 0
+    client.close()
+  run_with_server(test)
+
+def test_bots_are_made_for_the_session_size(tmp_path, monkeypatch):
+  monkeypatch.setattr(patterns, "WEIGHTS_DIRECTORY", str(tmp_path))
+  async def test(server):
+    client = await Client.connect(server)
+    assert (await client.send("new 6 pattern")).startswith("? No pattern weights")
+    for size, square in ((6, "c2"), (8, "d3")):
+      assert (await client.send(f"new {size} greedy")).startswith("= ")
+      assert (await client.send(f"play {square}")).startswith("= ")
+    assert {("greedy", 6), ("greedy", 8)} <= set(server_module._bot_players)
+    client.close()
+  run_with_server(test)
+
+class BrokenExecutor(ThreadPoolExecutor):
+  def submit(self, *args, **kwargs):
+    raise BrokenProcessPool("a bot process died")
+
+def test_failing_command_gets_an_error_reply(caplog):
+  async def test(server):
+    client = await Client.connect(server)
+    assert await client.send("new 6 greedy") == "= 1\n\n"
+    assert await client.send("play c2") == "? internal error, closing the connection\n\n"
+    assert await client.reader.read() == b""
+    # Other clients are unaffected
+    other = await Client.connect(server)
+    assert await other.send("new 6") == "= 2\n\n"
+    other.close()
+  with caplog.at_level(logging.ERROR, logger="Othello.server"):
+    run_with_server(test, executor=BrokenExecutor(1))
+  assert "BrokenProcessPool" in caplog.text
+
+def test_two_humans():
+  async def test(server):
+    black = await Client.connect(server)
+    white = await Client.connect(server)
+    session_id = (await black.send("new")).split()[1]
+    assert await white.send(f"join {session_id}") == "= white\n\n"
+    assert await black.read() == "! joined white\n\n"
+    assert (await white.send("play D3")).startswith("? not your turn")
+    assert await black.send("play D3") == "=\n\n"
+    assert await white.read() == "! play black D3\n\n"
+    assert await white.send("play C3") == "=\n\n"
+    assert await black.read() == "! play white C3\n\n"
+    third = await Client.connect(server)
+    assert (await third.send(f"join {session_id}")).startswith("? session")
+    assert await white.send("leave") == "=\n\n"
+    assert await black.read() == "! left white\n\n"
+    for client in (black, white, third):
+      client.close()
+  run_with_server(test)
+
+def test_idle_sessions_and_connections_are_dropped():
+  async def test(server):
+    client = await Client.connect(server)
+    await client.send("new")
+    assert len(server.sessions) == 1
+    assert await client.read() == "! session closed, idle timeout\n\n"
+    assert server.sessions == {}
+    assert await client.read() == "! idle timeout\n\n"
+    assert await client.reader.read() == b""
+  run_with_server(test, idle_timeout=0.2)
+
+def test_bot_moves_do_not_block_other_clients():
+  async def test(server):
+    player = await Client.connect(server)
+    other = await Client.connect(server)
+    await player.send("new 8 alphabeta:0.5")
+    player.writer.write(b"play D3\n")
+    await player.writer.drain()
+    await asyncio.sleep(0.1) # let the bot start thinking
+    start = perf_counter()
+    assert (await other.send("stats")).startswith("= ")
+    assert perf_counter() - start < 0.25
+    assert (await player.read()).startswith("= ")
+    player.close()
+    other.close()
+  run_with_server(test, executor=None)
+
+def test_many_idle_sessions():
+  async def test(server):
+    clients = [await Client.connect(server) for _ in range(200)]
+    for client in clients:
+      await client.send("new")
+    assert server.stats().active_sessions == 200
+    for client in clients:
+      client.close()
+  run_with_server(test)
+
+def test_session_passes_turn():
+  session = Session(1, 6, None)
+  assert session.turn == BLACK
+  assert session.play(BLACK, 2 + 1 * 6) # C2
+  assert session.turn == WHITE
+  assert not session.play(WHITE, 0)
+
+def test_percentile():
+  samples = [float(value) for value in range(1, 101)]
+  assert percentile(samples, 0.5) == 50.0
+  assert percentile(samples, 0.99) == 99.0
+  assert percentile([], 0.5) == 0.0
@@ -0,0 +1,75 @@
+import random
+import pytest
+from Othello.othello import Othello
+from Othello.symmetry import (
+  TRANSFORMS, INVERSE, IDENTITY, ROTATE_90, MIRROR,
+  transform_bitboard, transform_square, untransform_square, canonicalize, _transform_any,
+)
+
+def slow_transform(bitboard, transform, size):
+  result = 0
+  for index in range(size * size):
+    if bitboard >> index & 1:
+      result |= 1 << transform_square(index, transform, size)
+  return result
+
+@pytest.mark.parametrize("size", [6, 8, 10, 26])
+def test_transforms_match_square_maps(size):
+  rng = random.Random(size)
+  for _ in range(20):
+    bitboard = rng.getrandbits(size * size)
+    for transform in TRANSFORMS:
+      expected = slow_transform(bitboard, transform, size)
+      assert transform_bitboard(bitboard, transform, size) == expected
+      assert _transform_any(bitboard, transform, size) == expected
+      assert transform_bitboard(expected, INVERSE[transform], size) == bitboard
+
+def test_square_transforms():
+  test_board = Othello(8)
+  a1, h1, h8 = (test_board.square_index(key) for key in ['A1', 'H1', 'H8'])
+  assert transform_square(a1, IDENTITY, 8) == a1
+  assert transform_square(a1, MIRROR, 8) == h1
+  assert transform_square(a1, ROTATE_90, 8) == h1
+  assert transform_square(h1, ROTATE_90, 8) == h8
+  for transform in TRANSFORMS:
+    for index in range(64):
+      assert untransform_square(transform_square(index, transform, 8), transform, 8) == index
+
+def test_transforms_are_closed_under_composition():
+  bitboard = random.Random(1).getrandbits(64)
+  images = {transform_bitboard(bitboard, transform, 8) for transform in TRANSFORMS}
+  for first in TRANSFORMS:
+    for second in TRANSFORMS:
+      assert transform_bitboard(transform_bitboard(bitboard, first, 8), second, 8) in images
+
+@pytest.mark.parametrize("size", [6, 8, 10])
+def test_first_moves_share_a_canonical_form(size):
+  test_board = Othello(size)
+  forms = set()
+  for move in test_board.all_valid_moves(Othello.Color.BLACK)[1]:
+    delta = test_board.make_move(move, Othello.Color.BLACK)
+    forms.add(canonicalize(*test_board.bitboards(), size)[:2])
+    test_board.unmake_move(delta)
+  assert len(forms) == 1
+
+def test_canonical_moves_map_back():
+  test_board = Othello(8)
+  test_board.make_move('D3', Othello.Color.BLACK)
+  black, white = test_board.bitboards()
+  canonical = canonicalize(black, white, 8)
+  canonical_board = Othello.from_bitboards(canonical.black, canonical.white, 8)
+  original = set(test_board.all_valid_moves(Othello.Color.WHITE)[1])
+  mapped = {
+    test_board.square_name(untransform_square(canonical_board.square_index(move), canonical.transform, 8))
+    for move in canonical_board.all_valid_moves(Othello.Color.WHITE)[1]
+  }
+  assert mapped == original
+
+def test_canonical_form_is_the_smallest():
+  rng = random.Random(3)
+  black = rng.getrandbits(64)
+  white = rng.getrandbits(64) & ~black
+  canonical = canonicalize(black, white, 8)
+  forms = [(transform_bitboard(black, t, 8), transform_bitboard(white, t, 8)) for t in TRANSFORMS]
+  assert (canonical.black, canonical.white) == min(forms)
+  assert forms[canonical.transform] == (canonical.black, canonical.white)
@@ -0,0 +1,39 @@
+import pytest
+from Othello.tournament import GameResult, parse_player_spec, play_game, run_tournament, schedule_games, summarize
+
+def test_parse_player_spec():
+  assert parse_player_spec("alphabeta:0.05") == ("alphabeta", 0.05)
+  assert parse_player_spec("random")[0] == "random"
+  with pytest.raises(ValueError):
+    parse_player_spec("nobody")
+
+def test_play_game_is_reproducible():
+  first = play_game(6, "random", "greedy", seed=3)
+  second = play_game(6, "random", "greedy", seed=3)
+  assert first[:6] == second[:6]
+  assert first.black_discs + first.white_discs <= 36
+  assert first.moves == first.black_discs + first.white_discs - 4
+
+def test_schedule_games_swaps_colors_and_cycles_sizes():
+  tasks = schedule_games(6, "greedy", "random", [6, 8])
+  assert [task.size for task in tasks] == [6, 6, 8, 8, 6, 6]
+  assert [task.black for task in tasks] == ["greedy", "random"] * 3
+  assert len({task.seed for task in tasks}) == 6
+
+def test_run_tournament_in_worker_processes():
+  tasks = schedule_games(4, "greedy", "random", [6])
+  in_process = run_tournament(tasks, workers=1)
+  in_pool = run_tournament(tasks, workers=2)
+  assert [result[:6] for result in in_process] == [result[:6] for result in in_pool]
+
+def test_summarize():
+  results = [
+    GameResult(6, "a", "b", 20, 16, 32, 0.1, (), 0.0),
+    GameResult(6, "b", "a", 20, 16, 32, 0.1, (), 0.0),
+    GameResult(8, "a", "b", 32, 32, 60, 0.1, (), 0.0),
+  ]
+  summary = summarize(results, "a", "b")
+  assert summary["overall"]["wins"] == 1
+  assert summary["overall"]["losses"] == 1
+  assert summary["overall"]["draws"] == 1
+  assert summary["by_size"][6]["disc_differential"] == 0.0
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from Othello import patterns, play_othello
+from Othello.othello import Othello
+from Othello.ai import PatternPlayer, make_player
+from Othello.patterns import PatternSet, PatternWeights, stage_of, weights_path
+from Othello.records import PASS, GameRecordWriter
+from Othello.training import _features, fit_least_squares, main, self_play_game, train
+
+def test_fit_recovers_known_weights():
+  generator = np.random.default_rng(1)
+  features = 50
+  columns = generator.integers(0, features, size=(2000, 4)).astype(np.int32)
+  values = generator.normal(size=columns.shape).astype(np.float32)
+  truth = generator.normal(size=features)
+  targets = (truth[columns] * values).sum(axis=1)
+  weights, iterations = fit_least_squares(columns, values, targets, features, ridge=0.0, iterations=500, tolerance=1e-10)
+  assert np.allclose(weights, truth, atol=1e-6)
+  assert iterations < 500
+  damped, _ = fit_least_squares(columns, values, targets, features, ridge=1000.0)
+  assert np.abs(damped).sum() < np.abs(weights).sum()
+
+def test_self_play_game_is_legal():
+  record = self_play_game(6, "greedy", random_moves=4, seed=3)
+  assert record.size == 6
+  assert record.moves[-1] != PASS or record.moves[-2] != PASS
+  board = record.replay()
+  assert board.count_discs(Othello.Color.BLACK) + board.count_discs(Othello.Color.WHITE) > 4
+  assert self_play_game(6, "greedy", random_moves=4, seed=3).moves == record.moves
+  assert self_play_game(6, "greedy", random_moves=4, seed=4).moves != record.moves
+
+def test_train_from_self_play_and_records(tmp_path):
+  weights, stats = train(6, games=30, iterations=20, seed=2)
+  assert stats.games == 30 and stats.positions > 30 * 20
+  assert 0 < stats.iterations <= 20 and stats.rms_error > 0
+  assert weights.table.shape == (4 * PatternSet.for_size(6).width,) and weights.table.any()
+  assert "positions from 30 games" in str(stats)
+  # The same games read back from a record file give the same weights
+  path = str(tmp_path / "games.bin")
+  with GameRecordWriter(path) as writer:
+    for seed in range(2 * 1000003, 2 * 1000003 + 30):
+      writer.write_game(self_play_game(6, seed=seed))
+    writer.write_game(self_play_game(8, seed=0))
+  from_records, record_stats = train(6, record_paths=[path], iterations=20)
+  assert record_stats.positions == stats.positions
+  assert np.allclose(from_records.table, weights.table, atol=1e-4)
+  with pytest.raises(ValueError):
+    train(10, record_paths=[path])
+
+def test_features_use_the_evaluation_stages():
+  records = [self_play_game(6, seed=seed) for seed in range(3)]
+  rows = _features(6, 3, records)
+  width = PatternSet.for_size(6).width
+  stages = rows.columns[:, -1] // width # Each row's bias column sits in its stage
+  expected = []
+  for record in records:
+    board = Othello(6)
+    color = Othello.Color.BLACK
+    for move in record.moves:
+      if move != PASS:
+        expected.append(stage_of(sum(bitboard.bit_count() for bitboard in board.bitboards()), 6, 3))
+        board.make_move(move, color)
+      color = Othello.Color.WHITE if color == Othello.Color.BLACK else Othello.Color.BLACK
+  assert stages.tolist() == expected
+
+def test_missing_weights_are_reported_before_play(tmp_path, monkeypatch):
+  with pytest.raises(FileNotFoundError):
+    make_player("pattern", 0.1, size=6, weights_directory=str(tmp_path))
+  monkeypatch.setattr(patterns, "WEIGHTS_DIRECTORY", str(tmp_path))
+  with pytest.raises(SystemExit, match="No pattern weights"):
+    play_othello.run_game(["6", "--black", "pattern", "--record", str(tmp_path / "games.bin")])
+  with pytest.raises(SystemExit, match="No pattern weights"):
+    main(["--size", "6", "--games", "1", "--player", "pattern", "--output-dir", str(tmp_path)])
+
+def test_pattern_player(tmp_path):
+  with pytest.raises(FileNotFoundError):
+    PatternPlayer(weights_directory=str(tmp_path)).choose_move(Othello(6), Othello.Color.BLACK)
+  weights, _ = train(6, games=20, iterations=10)
+  weights.save(weights_path(6, str(tmp_path)))
+  player = PatternPlayer(time_limit=0.2, max_depth=3, weights_directory=str(tmp_path))
+  board = Othello(6)
+  color = Othello.Color.BLACK
+  for _ in range(6):
+    before = board.bitboards()
+    move = player.choose_move(board, color)
+    assert board.bitboards() == before
+    assert board.make_move(move, color)
+    assert player.last_stats.depth >= 1
+    color = Othello.Color.WHITE if color == Othello.Color.BLACK else Othello.Color.BLACK
+
+def test_cli(tmp_path, capsys):
+  main(["--size", "6", "--games", "10", "--iterations", "5", "--player", "random", "--output-dir", str(tmp_path)])
+  output = capsys.readouterr().out
+  assert "positions from 10 games" in output
+  assert PatternWeights.load(weights_path(6, str(tmp_path))).size == 6
+  with pytest.raises(SystemExit):
+    main(["--size", "6", "--games", "1", "--player", "nobody", "--output-dir", str(tmp_path)])
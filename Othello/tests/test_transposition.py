@@ -0,0 +1,54 @@
+import pytest
+from Othello.othello import Othello
+from Othello.transposition import EXACT, LOWER, UPPER, NO_MOVE, TranspositionTable
+
+def test_table_size_is_power_of_two():
+  assert TranspositionTable(1000).entries == 512
+  assert TranspositionTable(1024).entries == 1024
+  assert TranspositionTable.from_megabytes(1).entries == 32768
+  with pytest.raises(ValueError):
+    TranspositionTable(0)
+  with pytest.raises(ValueError):
+    TranspositionTable(16, policy="never")
+
+def test_store_and_probe():
+  table = TranspositionTable(16)
+  assert table.probe(12345) is None
+  assert table.store(12345, 4, EXACT, -7, 19)
+  assert table.probe(12345) == (4, EXACT, -7, 19)
+  assert table.probe(12345 + 16) is None # same slot, different position
+  assert len(table) == 1
+
+@pytest.mark.parametrize(
+  "policy, replaced",
+  [
+    ("depth", False),
+    ("always", True),
+  ]
+)
+def test_replacement_policy(policy, replaced):
+  table = TranspositionTable(16, policy)
+  table.store(3, 6, LOWER, 10, 2)
+  assert table.store(3 + 16, 2, UPPER, 5, NO_MOVE) == replaced
+  assert (table.probe(3 + 16) is not None) == replaced
+
+  table.new_search() # entries from older searches can always be replaced
+  assert table.store(3 + 32, 1, EXACT, 0, 0)
+
+def test_zobrist_hash_is_incremental():
+  test_board = Othello(8)
+  start_hash = test_board.zobrist_hash()
+  first = test_board.make_move('D3', Othello.Color.BLACK)
+  second = test_board.make_move('C5', Othello.Color.WHITE)
+  after_moves = test_board.zobrist_hash()
+
+  rebuilt = Othello(8)
+  rebuilt.set_squares(test_board._mask_to_keys(test_board.bitboards()[0]), Othello.Color.BLACK)
+  rebuilt.set_squares(test_board._mask_to_keys(test_board.bitboards()[1]), Othello.Color.WHITE)
+  assert rebuilt.zobrist_hash() == after_moves
+  assert rebuilt.zobrist_hash(Othello.Color.WHITE) != rebuilt.zobrist_hash(Othello.Color.BLACK)
+
+  test_board.unmake_move(second)
+  test_board.unmake_move(first)
+  assert test_board.zobrist_hash() == start_hash
+  assert Othello(8).zobrist_hash() == start_hash
@@ -0,0 +1,207 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter, time
+from typing import NamedTuple, Union
+from Othello.othello import Othello
+from Othello.ai import DEFAULT_TIME_LIMIT, PLAYERS, make_player
+from Othello.records import PASS, GameRecord, GameRecordWriter, finished_moves
+
+BOARD_SIZES = list(range(6, 27, 2))
+DEFAULT_PLAYERS = ("greedy", "random")
+
+class GameResult(NamedTuple):
+  """Outcome of one headless game"""
+  size: int
+  black: str # Player specs, see parse_player_spec
+  white: str
+  black_discs: int
+  white_discs: int
+  moves: int
+  seconds: float
+  move_list: tuple[int, ...] # Every move in order, PASS for skipped turns
+  started: float # Seconds since the epoch
+
+class GameTask(NamedTuple):
+  """Everything a worker process needs to play one game"""
+  size: int
+  black: str
+  white: str
+  seed: int
+
+def parse_player_spec(spec: str) -> tuple[str, float]:
+  """Splits a player spec such as "alphabeta:0.05" into the player name and its time limit per move
+
+  :param str spec: Player name, optionally followed by a colon and a time limit in seconds
+  :return tuple[str, float]: Player name and time limit
+  """
+  name, _, time_limit = spec.partition(":")
+  if name not in PLAYERS:
+    raise ValueError(f"Unknown player: {name}. Must be one of {list(PLAYERS)}")
+  return name, float(time_limit) if time_limit else DEFAULT_TIME_LIMIT
+
+def play_game(size: int, black: str, white: str, seed: Union[int, None]=None) -> GameResult:
+  """Plays one game between two computer players without any rendering or input
+
+  :param int size: Size of the board
+  :param str black: Spec of the black player
+  :param str white: Spec of the white player
+  :param Union[int, None] seed: Seed for players that make random choices
+  :return GameResult: Final disc counts and game length
+  """
+  started = time()
+  start = perf_counter()
+  board = Othello(size)
+  players = {}
+  for color, spec in ((Othello.Color.BLACK, black), (Othello.Color.WHITE, white)):
+    name, time_limit = parse_player_spec(spec)
+    players[color] = make_player(name, time_limit, None if seed is None else seed * 2 + len(players), size)
+
+  turn = Othello.Color.BLACK
+  other = Othello.Color.WHITE
+  move_list: list[int] = []
+  skip_count = 0
+  while skip_count < 2:
+    space = players[turn].choose_move(board, turn)
+    if space is None:
+      skip_count += 1
+      move_list.append(PASS)
+    else:
+      move_list.append(board.make_move(space, turn).square)
+      skip_count = 0
+    turn, other = other, turn
+
+  moves = len(move_list) - move_list.count(PASS)
+  return GameResult(size, black, white, board.count_discs(Othello.Color.BLACK),
+    board.count_discs(Othello.Color.WHITE), moves, perf_counter() - start, tuple(move_list), started)
+
+def _play_task(task: GameTask) -> GameResult:
+  return play_game(task.size, task.black, task.white, task.seed)
+
+def schedule_games(games: int, first: str, second: str, sizes: list[int], seed: int=0) -> list[GameTask]:
+  """Builds the list of games to play, cycling through the sizes and swapping colors every other game
+
+  :param int games: Number of games
+  :param str first: Spec of the first player
+  :param str second: Spec of the second player
+  :param list[int] sizes: Board sizes to cycle through
+  :param int seed: Base seed, each game gets its own seed derived from it
+  :return list[GameTask]: One task per game
+  """
+  tasks = []
+  for i in range(games):
+    size = sizes[(i // 2) % len(sizes)]
+    black, white = (first, second) if i % 2 == 0 else (second, first)
+    tasks.append(GameTask(size, black, white, seed * 1000003 + i))
+  return tasks
+
+def run_tournament(tasks: list[GameTask], workers: Union[int, None]=None) -> list[GameResult]:
+  """Plays every game, spread across a pool of worker processes
+
+  :param list[GameTask] tasks: Games to play
+  :param Union[int, None] workers: Number of processes, defaults to one per CPU core. 1 plays in this process.
+  :return list[GameResult]: Results in the same order as the tasks
+  """
+  if workers == 1:
+    return [_play_task(task) for task in tasks]
+  workers = workers or os.cpu_count() or 1
+  chunksize = max(1, len(tasks) // (workers * 8))
+  with ProcessPoolExecutor(max_workers=workers) as executor:
+    return list(executor.map(_play_task, tasks, chunksize=chunksize))
+
+def summarize(results: list[GameResult], first: str, second: str) -> dict:
+  """Tallies results from the first player's point of view, overall and per board size
+
+  :param list[GameResult] results: Finished games
+  :param str first: Spec of the first player
+  :param str second: Spec of the second player
+  :return dict: Wins, losses, draws and average disc differential, overall and per size
+  """
+  def empty_tally() -> dict:
+    return {"games": 0, "wins": 0, "losses": 0, "draws": 0, "disc_differential": 0.0, "moves": 0}
+
+  overall = empty_tally()
+  by_size: dict[int, dict] = {}
+  for result in results:
+    difference = result.black_discs - result.white_discs
+    if result.black != first:
+      difference = -difference
+    for tally in (overall, by_size.setdefault(result.size, empty_tally())):
+      tally["games"] += 1
+      tally["moves"] += result.moves
+      tally["disc_differential"] += difference
+      if difference > 0:
+        tally["wins"] += 1
+      elif difference < 0:
+        tally["losses"] += 1
+      else:
+        tally["draws"] += 1
+
+  for tally in [overall] + list(by_size.values()):
+    if tally["games"]:
+      tally["disc_differential"] /= tally["games"]
+  return {"first": first, "second": second, "overall": overall, "by_size": dict(sorted(by_size.items()))}
+
+def print_summary(summary: dict, seconds: float) -> None:
+  """Prints a tournament summary table
+
+  :param dict summary: Output of summarize
+  :param float seconds: Wall time the tournament took
+  """
+  overall = summary["overall"]
+  print(f"{summary['first']} vs {summary['second']}: {overall['games']} games in {seconds:.2f}s "
+    f"({overall['games'] / seconds if seconds else 0:.1f} games/s)")
+  print(f"{'size':>4} {'games':>6} {'wins':>6} {'losses':>6} {'draws':>6} {'avg diff':>9}")
+  for size, tally in list(summary["by_size"].items()) + [("all", overall)]:
+    print(f"{size:>4} {tally['games']:>6} {tally['wins']:>6} {tally['losses']:>6} {tally['draws']:>6} "
+      f"{tally['disc_differential']:>+9.2f}")
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+  """Parses the command line arguments for a tournament
+
+  :param list[str] argv: Arguments, not including the script name
+  :return argparse.Namespace: The parsed arguments
+  """
+  parser = argparse.ArgumentParser(description="Play many headless Othello games between two computer players.")
+  parser.add_argument("--games", type=int, default=100, help="Number of games to play")
+  parser.add_argument("--players", nargs=2, default=list(DEFAULT_PLAYERS), metavar=("FIRST", "SECOND"),
+    help=f"Player specs, name[:seconds per move] with name one of {list(PLAYERS)}")
+  parser.add_argument("--sizes", type=int, nargs="+", default=BOARD_SIZES, help="Board sizes to cycle through")
+  parser.add_argument("--workers", type=int, default=None, help="Worker processes, defaults to one per CPU core")
+  parser.add_argument("--seed", type=int, default=0, help="Base seed for players that make random choices")
+  parser.add_argument("--json", help="Also write the summary to this file as JSON")
+  parser.add_argument("--record", help="Append every game to this binary game record file")
+  return parser.parse_args(argv)
+
+def main(argv: Union[list[str], None]=None) -> dict:
+  args = parse_args(sys.argv[1:] if argv is None else argv)
+  for spec in args.players:
+    parse_player_spec(spec) # fail before starting any workers
+  for size in args.sizes:
+    if size < 6 or size > 26 or size % 2:
+      raise SystemExit(f"Invalid size: {size}. Must be an even integer between 6 and 26.")
+
+  first, second = args.players
+  tasks = schedule_games(args.games, first, second, args.sizes, args.seed)
+  start = perf_counter()
+  results = run_tournament(tasks, args.workers)
+  seconds = perf_counter() - start
+
+  if args.record:
+    with GameRecordWriter(args.record) as writer:
+      for result in results:
+        writer.write_game(GameRecord(result.size, result.started, result.black, result.white, finished_moves(result.move_list)))
+
+  summary = summarize(results, first, second)
+  summary["seconds"] = seconds
+  summary["games_per_second"] = len(results) / seconds if seconds else 0.0
+  print_summary(summary, seconds)
+  if args.json:
+    with open(args.json, "w") as f:
+      json.dump(summary, f, indent=2)
+  return summary
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,251 @@
+import argparse
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from time import perf_counter, time
+from typing import Callable, Iterator, NamedTuple, Union
+import numpy as np
+from Othello.othello import Othello, SIZE
+from Othello.ai import make_player
+from Othello.patterns import STAGES, WEIGHTS_DIRECTORY, PatternSet, PatternWeights, stage_table, weights_path
+from Othello.records import PASS, GameRecord, finished_moves, read_games
+from Othello.tournament import parse_player_spec
+
+CHUNK_GAMES = 500 # Games turned into features by one task, so positions stream through in bounded pieces
+RIDGE = 10.0 # Pulls weights seen in few positions towards zero
+ITERATIONS = 200
+TOLERANCE = 1e-4 # Stop once the gradient has shrunk by this factor
+SELF_PLAY_PLAYER = "random"
+RANDOM_MOVES = 8 # Opening moves made at random in self-play, so games between deterministic players differ
+
+class TrainingSet(NamedTuple):
+  """Positions as sparse rows of the flat weight table: one weight per pattern instance, then mobility and bias"""
+  columns: np.ndarray # int32 (positions, instances + 2), index of each weight the position uses
+  values: np.ndarray # float32 (positions, instances + 2), 1 for patterns and bias, the mobility difference for mobility
+  targets: np.ndarray # float32 (positions,), final disc difference for the side to move
+  games: int
+
+class TrainStats(NamedTuple):
+  """What fitting the weights did"""
+  games: int
+  positions: int
+  iterations: int
+  rms_error: float # Root mean square error left on the training positions, in discs
+  seconds: float
+
+  def __str__(self) -> str:
+    return (f"{self.positions:,} positions from {self.games:,} games, {self.iterations} iterations, "
+      f"RMS error {self.rms_error:.2f} discs, {self.seconds:.2f}s")
+
+def _features(size: int, stages: int, records: list[GameRecord]) -> TrainingSet:
+  """Replays games and turns every position where the side to move has a move into a feature row
+
+  :raises ValueError: If a move isn't legal
+  """
+  patterns = PatternSet.for_size(size)
+  squares = size * size
+  cells = bytearray()
+  white_to_move, discs, mobility, results = [], [], [], []
+  for record in records:
+    board = Othello(size, errors="raise")
+    turn, other = Othello.Color.BLACK, Othello.Color.WHITE
+    first = len(discs)
+    for number, move in enumerate(record.moves, start=1):
+      if move != PASS:
+        black, white = board.bitboards()
+        cells += board.to_position().cells
+        white_to_move.append(turn == Othello.Color.WHITE)
+        discs.append((black | white).bit_count())
+        mobility.append(board.valid_moves_mask(turn).bit_count() - board.valid_moves_mask(other).bit_count())
+        if board.make_move(move, turn) is None:
+          raise ValueError(f"Move {number}: {turn.name.title()} can't play on square {move}.")
+      turn, other = other, turn
+    difference = board.count_discs(Othello.Color.BLACK) - board.count_discs(Othello.Color.WHITE)
+    results.extend([difference] * (len(discs) - first))
+
+  instances = len(patterns.instances)
+  white_to_move = np.array(white_to_move, dtype=bool)
+  codes = patterns.batch_codes(np.frombuffer(bytes(cells), dtype=np.uint8).reshape(-1, squares))
+  codes[white_to_move] = patterns.swap[codes[white_to_move]]
+  stage = np.array(stage_table(size, stages), dtype=np.int32)[np.array(discs, dtype=np.intp)]
+  base = (stage * patterns.width).astype(np.int32)
+  columns = np.empty((len(base), instances + 2), dtype=np.int32)
+  columns[:, :instances] = codes + base[:, None]
+  columns[:, instances] = base + patterns.mobility
+  columns[:, instances + 1] = base + patterns.bias
+  values = np.ones(columns.shape, dtype=np.float32)
+  values[:, instances] = mobility
+  results = np.array(results, dtype=np.float32)
+  return TrainingSet(columns, values, np.where(white_to_move, -results, results), len(records))
+
+def self_play_game(size: int, player_spec: str=SELF_PLAY_PLAYER, random_moves: int=RANDOM_MOVES,
+    seed: Union[int, None]=None) -> GameRecord:
+  """Plays one game of a computer player against itself, after a few random opening moves
+
+  :param int size: Size of the board
+  :param str player_spec: Player for both sides, name[:seconds per move]
+  :param int random_moves: Opening moves made at random instead of by the player
+  :param Union[int, None] seed: Seed for the random moves and the player
+  :raises FileNotFoundError: If the player needs weights that haven't been trained for the size
+  :return GameRecord: The game
+  """
+  generator = random.Random(seed)
+  name, time_limit = parse_player_spec(player_spec)
+  player = make_player(name, time_limit, seed, size)
+  board = Othello(size)
+  turn, other = Othello.Color.BLACK, Othello.Color.WHITE
+  moves = []
+  try:
+    while len(moves) < 2 or moves[-1] != PASS or moves[-2] != PASS:
+      mask = board.valid_moves_mask(turn)
+      if not mask:
+        moves.append(PASS)
+      elif len(moves) < random_moves:
+        square = generator.choice([index for index in range(size * size) if mask >> index & 1])
+        moves.append(board.make_move(square, turn).square)
+      else:
+        moves.append(board.make_move(player.choose_move(board, turn), turn).square)
+      turn, other = other, turn
+  finally:
+    if hasattr(player, "close"):
+      player.close()
+  return GameRecord(size, time(), player_spec, player_spec, finished_moves(moves))
+
+def _self_play_features(size: int, stages: int, player_spec: str, random_moves: int, seeds: range) -> TrainingSet:
+  """Plays self-play games in a worker process and returns their feature rows"""
+  return _features(size, stages, [self_play_game(size, player_spec, random_moves, seed) for seed in seeds])
+
+def _tasks(size: int, stages: int, games: int, player_spec: str, random_moves: int, record_paths: list[str],
+    seed: int) -> Iterator[tuple[Callable, tuple]]:
+  """Splits the games into chunks, reading record files lazily"""
+  first = seed * 1000003
+  for start in range(0, games, CHUNK_GAMES):
+    yield _self_play_features, (size, stages, player_spec, random_moves, range(first + start, first + min(games, start + CHUNK_GAMES)))
+  for path in record_paths:
+    records = (record for record in read_games(path) if record.size == size)
+    while chunk := list(islice(records, CHUNK_GAMES)):
+      yield _features, (size, stages, chunk)
+
+def fit_least_squares(columns: np.ndarray, values: np.ndarray, targets: np.ndarray, features: int, ridge: float=RIDGE,
+    iterations: int=ITERATIONS, tolerance: float=TOLERANCE) -> tuple[np.ndarray, int]:
+  """Finds the weights minimizing |Aw - targets|^2 + ridge * |w|^2 by conjugate gradients, where row i of A
+  holds values[i] in columns[i] and zeros elsewhere. A is never built: multiplying by it is a gather and a
+  row sum, and by its transpose a single bincount, so each iteration is a few vectorized passes.
+
+  :param np.ndarray columns: int (rows, k), the weights each row uses
+  :param np.ndarray values: float (rows, k), what each of those weights is multiplied by
+  :param np.ndarray targets: float (rows,), what each row should come to
+  :param int features: Number of weights
+  :param float ridge: Regularization, keeps weights of rarely seen codes small
+  :param int iterations: Most iterations to run
+  :param float tolerance: Stop once the gradient norm has shrunk by this factor
+  :return tuple[np.ndarray, int]: float64 (features,) weights and the iterations run
+  """
+  flat_columns = columns.ravel()
+
+  def forward(weights: np.ndarray) -> np.ndarray:
+    return (weights[columns] * values).sum(axis=1)
+
+  def backward(residual: np.ndarray) -> np.ndarray:
+    return np.bincount(flat_columns, weights=(values * residual[:, None]).ravel(), minlength=features)
+
+  weights = np.zeros(features)
+  residual = targets.astype(np.float64)
+  gradient = backward(residual)
+  direction = gradient.copy()
+  norm = first_norm = gradient @ gradient
+  done = 0
+  while done < iterations and norm > tolerance ** 2 * first_norm:
+    change = forward(direction)
+    step = norm / (change @ change + ridge * (direction @ direction))
+    weights += step * direction
+    residual -= step * change
+    gradient = backward(residual) - ridge * weights
+    new_norm = gradient @ gradient
+    direction = gradient + new_norm / norm * direction
+    norm = new_norm
+    done += 1
+  return weights, done
+
+def train(size: int=SIZE, games: int=0, record_paths: Union[list[str], None]=None, player_spec: str=SELF_PLAY_PLAYER,
+    random_moves: int=RANDOM_MOVES, stages: int=STAGES, ridge: float=RIDGE, iterations: int=ITERATIONS, workers: int=1,
+    seed: int=0) -> tuple[PatternWeights, TrainStats]:
+  """Fits pattern weights to predict the final disc difference of self-play games.
+
+  Games are replayed in chunks, each turned into compact feature rows on its own (in a worker
+  process if there are several), then every row is fitted at once by least squares.
+
+  :param int size: Board size to train for; recorded games on other boards are skipped
+  :param int games: Self-play games to generate
+  :param Union[list[str], None] record_paths: Game record files to train on as well
+  :param str player_spec: Player for both sides of the self-play games, name[:seconds per move]
+  :param int random_moves: Opening moves of each self-play game made at random
+  :param int stages: Number of stages the game is split into, each with its own weights
+  :param float ridge: Regularization, keeps weights of rarely seen codes small
+  :param int iterations: Most least squares iterations to run
+  :param int workers: Processes to replay games in, 0 for one per CPU
+  :param int seed: Seed for the self-play games
+  :raises ValueError: If there are no positions to train on
+  :raises FileNotFoundError: If the self-play player needs weights that haven't been trained for the size
+  :return tuple[PatternWeights, TrainStats]: The weights and how fitting went
+  """
+  start = perf_counter()
+  workers = workers if workers > 0 else os.cpu_count() or 1
+  tasks = _tasks(size, stages, games, player_spec, random_moves, record_paths or [], seed)
+  if workers == 1:
+    parts = [function(*arguments) for function, arguments in tasks]
+  else:
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+      futures = [executor.submit(function, *arguments) for function, arguments in tasks]
+      parts = [future.result() for future in futures]
+  parts = [part for part in parts if len(part.targets)]
+  if not parts:
+    raise ValueError(f"No {size}x{size} positions to train on.")
+  columns = np.concatenate([part.columns for part in parts])
+  values = np.concatenate([part.values for part in parts])
+  targets = np.concatenate([part.targets for part in parts])
+  weights = PatternWeights(size, stages)
+  fitted, done = fit_least_squares(columns, values, targets, len(weights.table), ridge, iterations)
+  weights.table = fitted.astype(np.float32)
+  error = targets - (weights.table[columns] * values).sum(axis=1)
+  rms_error = float(np.sqrt(np.mean(error.astype(np.float64) ** 2)))
+  stats = TrainStats(sum(part.games for part in parts), len(targets), done, rms_error, perf_counter() - start)
+  return weights, stats
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+  """Parses the command line arguments for training pattern weights
+
+  :param list[str] argv: Arguments, not including the script name
+  :return argparse.Namespace: The parsed arguments
+  """
+  parser = argparse.ArgumentParser(description="Fit pattern evaluation weights by least squares over self-play games.")
+  parser.add_argument("--size", type=int, default=SIZE, help="Board size to train for")
+  parser.add_argument("--games", type=int, default=5000, help="Self-play games to generate")
+  parser.add_argument("--records", nargs="*", default=[], help="Game record files to train on as well")
+  parser.add_argument("--player", default=SELF_PLAY_PLAYER,
+    help="Player for both sides of the self-play games, name[:seconds per move]; pattern builds on the last weights trained")
+  parser.add_argument("--random-moves", type=int, default=RANDOM_MOVES, help="Opening moves of each self-play game made at random")
+  parser.add_argument("--stages", type=int, default=STAGES, help="Stretches of the game with their own weights")
+  parser.add_argument("--ridge", type=float, default=RIDGE, help="Regularization, keeps weights of rarely seen codes small")
+  parser.add_argument("--iterations", type=int, default=ITERATIONS, help="Most least squares iterations to run")
+  parser.add_argument("--workers", type=int, default=1, help="Processes to replay games in, 0 for one per CPU")
+  parser.add_argument("--seed", type=int, default=0, help="Seed for the self-play games")
+  parser.add_argument("--output-dir", default=WEIGHTS_DIRECTORY, help="Folder to save the weights in")
+  return parser.parse_args(argv)
+
+def main(argv: Union[list[str], None]=None) -> None:
+  args = parse_args(sys.argv[1:] if argv is None else argv)
+  try:
+    weights, stats = train(args.size, args.games, args.records, args.player, args.random_moves, args.stages, args.ridge,
+      args.iterations, args.workers, args.seed)
+  except (ValueError, FileNotFoundError) as error:
+    raise SystemExit(str(error))
+  print(stats)
+  path = weights_path(args.size, args.output_dir)
+  weights.save(path)
+  print(f"  saved {path}")
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,119 @@
+from array import array
+from typing import NamedTuple, Union
+
+DEFAULT_ENTRIES = 1 << 18
+ENTRY_BYTES = 17 # key (8) + value (4) + move (2) + depth (1) + bound (1) + generation (1)
+
+# Bound types
+EXACT = 0
+LOWER = 1 # The value is at least this, the search failed high
+UPPER = 2 # The value is at most this, the search failed low
+
+NO_MOVE = -1
+
+class TableEntry(NamedTuple):
+  """One stored search result"""
+  depth: int
+  bound: int # EXACT, LOWER or UPPER
+  value: int
+  move: int # Bit position of the best move, NO_MOVE if there was none
+
+class TranspositionTable:
+  """Fixed-size hash table of search results keyed by Zobrist hash.
+
+  Entries live in preallocated flat arrays, so the table never grows past its initial
+  size (about 17 bytes per entry). Each key maps to a single slot. With the "depth"
+  replacement policy a slot is only overwritten by a search at least as deep, unless the
+  stored entry is from an earlier search; with "always" the newest result wins.
+  """
+  POLICIES = ("depth", "always")
+
+  entries: int
+  policy: str
+  probes: int
+  hits: int
+  stores: int
+
+  def __init__(self, entries: int=DEFAULT_ENTRIES, policy: str="depth"):
+    if entries < 1:
+      raise ValueError("The table needs at least one entry.")
+    if policy not in self.POLICIES:
+      raise ValueError(f"Unknown replacement policy: {policy}. Must be one of {self.POLICIES}")
+    # Round down to a power of two so the slot is just the low bits of the key
+    self.entries = 1 << (entries.bit_length() - 1)
+    self.policy = policy
+    self._mask = self.entries - 1
+    self._keys = array("Q", bytes(8 * self.entries))
+    self._values = array("i", bytes(4 * self.entries))
+    self._moves = array("h", [NO_MOVE]) * self.entries
+    self._depths = array("b", [-1]) * self.entries # -1 marks an empty slot
+    self._bounds = array("B", bytes(self.entries))
+    self._generations = array("B", bytes(self.entries))
+    self._generation = 0
+    self.probes = 0
+    self.hits = 0
+    self.stores = 0
+
+  @classmethod
+  def from_megabytes(cls, megabytes: float, policy: str="depth") -> "TranspositionTable":
+    """Creates the largest table that fits in the given amount of memory
+
+    :param float megabytes: Memory budget
+    :param str policy: Replacement policy, "depth" or "always"
+    :return TranspositionTable: The new table
+    """
+    return cls(max(1, int(megabytes * 1024 * 1024) // ENTRY_BYTES), policy)
+
+  def new_search(self) -> None:
+    """Marks the start of a new search, so entries from older searches can be replaced first
+    """
+    self._generation = (self._generation + 1) & 0xFF
+
+  def clear(self) -> None:
+    """Empties the table
+    """
+    for i in range(self.entries):
+      self._depths[i] = -1
+    self.probes = self.hits = self.stores = 0
+
+  def probe(self, key: int) -> Union[TableEntry, None]:
+    """Looks up a position
+
+    :param int key: 64-bit Zobrist hash of the position
+    :return Union[TableEntry, None]: The stored result, or None if the position isn't in the table
+    """
+    self.probes += 1
+    slot = key & self._mask
+    if self._depths[slot] < 0 or self._keys[slot] != key:
+      return None
+    self.hits += 1
+    return TableEntry(self._depths[slot], self._bounds[slot], self._values[slot], self._moves[slot])
+
+  def store(self, key: int, depth: int, bound: int, value: int, move: int=NO_MOVE) -> bool:
+    """Saves a search result, subject to the replacement policy
+
+    :param int key: 64-bit Zobrist hash of the position
+    :param int depth: Remaining depth the position was searched to
+    :param int bound: EXACT, LOWER or UPPER
+    :param int value: Score found by the search
+    :param int move: Bit position of the best move found
+    :return bool: True if the result was stored
+    """
+    slot = key & self._mask
+    stored_depth = self._depths[slot]
+    if (self.policy == "depth" and stored_depth > depth and self._keys[slot] != key
+        and self._generations[slot] == self._generation):
+      return False
+    if move == NO_MOVE and self._keys[slot] == key:
+      move = self._moves[slot] # keep the old best move for ordering
+    self._keys[slot] = key
+    self._values[slot] = value
+    self._moves[slot] = move
+    self._depths[slot] = min(depth, 127)
+    self._bounds[slot] = bound
+    self._generations[slot] = self._generation
+    self.stores += 1
+    return True
+
+  def __len__(self) -> int:
+    return sum(1 for depth in self._depths if depth >= 0)
@@ -1,6 +1,62 @@
+from time import perf_counter
+_started = perf_counter() # Before anything else is imported, so the launcher's own imports are counted
+
+import argparse
+import importlib
 import sys
-from typing import Any
-from prettytable import PrettyTable
-from Othello.othello import Othello
+from typing import NamedTuple, Union
+
+class Command(NamedTuple):
+  """A subcommand and where its code lives"""
+  module: str # Only imported when the subcommand runs, so the launcher never loads what it doesn't use
+  function: str # Entry point, called with the remaining arguments
+  help: str
+
+COMMANDS = {
+  "othello": Command("Othello.play_othello", "run_game", "Play Othello in the terminal"),
+  "tournament": Command("Othello.tournament", "main", "Play headless games between two computer players"),
+  "benchmark": Command("Othello.benchmark", "main", "Time the Othello engine and compare against a baseline"),
+  "perft": Command("Othello.perft", "main", "Count the positions reachable from the start of an Othello game"),
+  "book": Command("Othello.book", "main", "Build an Othello opening book from self-play"),
+  "engine": Command("Othello.engine", "main", "Run an Othello engine over a text protocol on stdin and stdout"),
+  "server": Command("Othello.server", "main", "Host many Othello games over a TCP socket"),
+  "positions": Command("Othello.database", "main", "Build or query a database of positions from recorded games"),
+  "train": Command("Othello.training", "main", "Fit pattern evaluation weights from self-play games"),
+  "mastermind": Command("Mastermind.solver", "main", "Break Mastermind codes with a solver"),
+  "mastermind-bulk": Command("Mastermind.bulk", "main", "Solve every Mastermind secret and save the decision trees"),
+}
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+  """Parses the launcher's own arguments, leaving everything after the subcommand to it
+
+  :param list[str] argv: Arguments, not including the script name
+  :return argparse.Namespace: The parsed arguments
+  """
+  commands = "\n".join(f"  {name:<17}{command.help}" for name, command in COMMANDS.items())
+  parser = argparse.ArgumentParser(description="Run one of the games or tools in this repository.",
+    epilog=f"commands:\n{commands}\n\nRun a subcommand with --help to see its own options.",
+    formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--import-time", action="store_true", help="Print how long the launcher and the subcommand took to import")
+  parser.add_argument("command", choices=list(COMMANDS), metavar="command", help="What to run, see below")
+  parser.add_argument("arguments", nargs=argparse.REMAINDER, help="Arguments for the subcommand")
+  return parser.parse_args(argv)
+
+def main(argv: Union[list[str], None]=None) -> int:
+  """Runs a subcommand
+
+  :param Union[list[str], None] argv: Arguments, not including the script name, sys.argv if None
+  :return int: Exit status, the subcommand's own if it returns one, such as benchmark after a regression
+  """
+  args = parse_args(sys.argv[1:] if argv is None else argv)
+  command = COMMANDS[args.command]
+  start = perf_counter()
+  module = importlib.import_module(command.module)
+  if args.import_time:
+    print(f"launcher ready in {(start - _started) * 1000:.1f} ms, "
+      f"{command.module} imported in {(perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+  result = getattr(module, command.function)(args.arguments)
+  # Other return values are results for callers of the Python API, not statuses
+  return result if isinstance(result, int) else 0
 
-# Decide later what this program should do
+if __name__ == "__main__":
+  sys.exit(main())